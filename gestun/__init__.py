@@ -0,0 +1,44 @@
+"""Inti kalkulasi transaksi gestun — murni Python, tanpa Streamlit / pandas.
+
+Dipakai oleh UI Streamlit (``transaksi-gestun.py``), skrip batch, dan worker.
+"""
+from .biaya import (
+    EXTRA_FEE_BERSIH,
+    hitung_express,
+    hitung_konven,
+    hitung_marketplace,
+    hitung_normal,
+    hitung_rate_untung,
+)
+from .rupiah import fmt_rp, format_ribuan, format_rupiah, format_rupiah_rp, parse_rupiah
+from .split import (
+    SAFETY_GAP,
+    plan_cache_clear,
+    plan_cache_info,
+    split_transaction_cached,
+    split_transaction_exact,
+)
+from .waktu import WIB, estimasi_selesai, hari_ini, sekarang
+
+__all__ = [
+    "EXTRA_FEE_BERSIH",
+    "SAFETY_GAP",
+    "WIB",
+    "estimasi_selesai",
+    "fmt_rp",
+    "format_ribuan",
+    "format_rupiah",
+    "format_rupiah_rp",
+    "hari_ini",
+    "hitung_express",
+    "hitung_konven",
+    "hitung_marketplace",
+    "hitung_normal",
+    "hitung_rate_untung",
+    "parse_rupiah",
+    "plan_cache_clear",
+    "plan_cache_info",
+    "sekarang",
+    "split_transaction_cached",
+    "split_transaction_exact",
+]
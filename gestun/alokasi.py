@@ -0,0 +1,158 @@
+"""Alokasi global banyak nasabah ke mesin EDC dengan kapasitas harian bersama.
+
+Berbeda dengan :func:`~gestun.split.split_transaction_exact` yang menganggap
+setiap mesin masih kosong, alokator ini memproses seluruh antrian nasabah
+sekaligus terhadap sisa limit harian tiap mesin:
+
+- Mesin dipilih lewat priority queue (heap) — utilisasi harian terendah lebih
+  dulu, sehingga beban tersebar merata antar mesin.
+- Tiap nasabah memakai gesek sesedikit mungkin (mesin berbeda dulu, baru
+  putaran kedua, dst. hingga *max_swipes*), urutan round-robin.
+- Nominal per gesek ≤ limit − SAFETY_GAP, ≤ sisa limit harian, non-bulat.
+- Total per nasabah tepat; nasabah yang tidak muat ditolak per nasabah
+  tanpa mengubah kapasitas mesin.
+
+Kompleksitas O(C · k log M) untuk C nasabah, M mesin, k gesek per nasabah.
+"""
+from __future__ import annotations
+
+import heapq
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .rupiah import format_rupiah_rp
+from .split import RNG, SAFETY_GAP, _is_non_round, _water_fill
+
+
+def _jitter(amounts: List[int], caps: List[int], rng: random.Random) -> None:
+    """Variasi ±5% antar gesek bertetangga (jumlah tetap, tidak melewati cap)."""
+    for j in range(len(amounts) - 1):
+        v     = max(1, int(min(amounts[j], amounts[j + 1]) * 0.05))
+        delta = rng.randint(-v, v)
+        # amounts[j] += delta, amounts[j + 1] -= delta — dibatasi cap & minimal 1
+        delta = min(delta, caps[j] - amounts[j], amounts[j + 1] - 1)
+        delta = max(delta, 1 - amounts[j], amounts[j + 1] - caps[j + 1])
+        amounts[j]     += delta
+        amounts[j + 1] -= delta
+
+
+def _make_non_round(amounts: List[int], caps: List[int], rng: random.Random) -> None:
+    """Geser 237–937 antar gesek agar tidak ada nominal kelipatan ribuan."""
+    n = len(amounts)
+    for j in range(n):
+        if _is_non_round(amounts[j]):
+            continue
+        d = rng.randint(237, 937)
+        for k in (*range(j + 1, n), *range(j)):
+            if amounts[j] + d <= caps[j] and amounts[k] - d >= 1 and _is_non_round(amounts[k] - d):
+                amounts[j] += d
+                amounts[k] -= d
+                break
+            if amounts[j] - d >= 1 and amounts[k] + d <= caps[k] and _is_non_round(amounts[k] + d):
+                amounts[j] -= d
+                amounts[k] += d
+                break
+
+
+def allocate_customers(
+    customers: Sequence[Tuple[str, int]],
+    machines: Sequence[Tuple[str, int, int]],
+    max_swipes: int = 2,
+    used: Optional[Dict[str, int]] = None,
+    seed: Optional[int] = None,
+    rng: Optional[random.Random] = None,
+) -> Dict[str, List[Dict]]:
+    """Alokasikan antrian *customers* ``[(ref, total), …]`` ke *machines*
+    ``[(nama, limit_per_swipe, limit_harian), …]``. *used* = pemakaian harian
+    yang sudah tercatat per mesin (opsional).
+
+    Kembalikan ``{"customers": [...], "machines": [...]}``:
+    - customers: ``{"ref", "total", "plan": [{"machine", "amount"}], "error"}``
+      sesuai urutan antrian;
+    - machines: ``{"machine", "limit_harian", "terpakai", "sisa", "utilisasi"}``.
+    """
+    if rng is None:
+        rng = RNG if seed is None else random.Random(seed)
+    used = used or {}
+
+    names     = [name for name, _, _ in machines]
+    swipe_cap = [limit - SAFETY_GAP for _, limit, _ in machines]
+    daily     = [harian for _, _, harian in machines]
+    terpakai  = [int(used.get(name, 0)) for name in names]
+
+    def _key(i: int) -> Tuple[float, int, int]:
+        # Utilisasi terendah dulu; seri → sisa terbesar, lalu urutan input
+        return (terpakai[i] / daily[i] if daily[i] else 1.0, -(daily[i] - terpakai[i]), i)
+
+    heap = [_key(i) for i in range(len(machines)) if daily[i] - terpakai[i] > 0 and swipe_cap[i] > 0]
+    heapq.heapify(heap)
+
+    hasil: List[Dict] = []
+    for ref, total in customers:
+        total = int(total)
+        row   = {"ref": ref, "total": total, "plan": [], "error": ""}
+        hasil.append(row)
+        if total <= 0:
+            row["error"] = "Total tidak valid."
+            continue
+
+        # ── Pilih mesin: utilisasi terendah dulu, tambah putaran bila kurang ──
+        taken: List[Tuple[Tuple[float, int, int], int]] = []
+        slots: List[Tuple[int, int]] = []          # (indeks mesin, cap slot)
+        sisa_slot: Dict[int, int] = {}
+        kapasitas = 0
+        while kapasitas < total and heap:
+            entry = heapq.heappop(heap)
+            i     = entry[2]
+            taken.append((entry, i))
+            sisa_slot[i] = daily[i] - terpakai[i]
+            cap = min(swipe_cap[i], sisa_slot[i])
+            sisa_slot[i] -= cap
+            slots.append((i, cap))
+            kapasitas += cap
+        for _ in range(1, max_swipes):
+            if kapasitas >= total:
+                break
+            for _, i in taken:
+                cap = min(swipe_cap[i], sisa_slot[i])
+                if cap <= 0:
+                    continue
+                sisa_slot[i] -= cap
+                slots.append((i, cap))
+                kapasitas += cap
+                if kapasitas >= total:
+                    break
+
+        if kapasitas < total:
+            for entry, _ in taken:
+                heapq.heappush(heap, entry)
+            row["error"] = (
+                f"Kapasitas tersisa tidak cukup untuk {format_rupiah_rp(total)} "
+                f"(maks {format_rupiah_rp(kapasitas)} dengan {max_swipes} gesek per mesin)."
+            )
+            continue
+
+        # ── Nominal: water-filling + variasi ±5% + non-bulat ──────────────────
+        caps    = [cap for _, cap in slots]
+        amounts = _water_fill(total, [(names[i], cap) for i, cap in slots])
+        _jitter(amounts, caps, rng)
+        _make_non_round(amounts, caps, rng)
+
+        for (i, _), amt in zip(slots, amounts):
+            row["plan"].append({"machine": names[i], "amount": amt})
+            terpakai[i] += amt
+        for _, i in taken:
+            if daily[i] - terpakai[i] > 0:
+                heapq.heappush(heap, _key(i))
+
+    ringkasan = [
+        {
+            "machine":      names[i],
+            "limit_harian": daily[i],
+            "terpakai":     terpakai[i],
+            "sisa":         daily[i] - terpakai[i],
+            "utilisasi":    terpakai[i] / daily[i] if daily[i] else 0.0,
+        }
+        for i in range(len(machines))
+    ]
+    return {"customers": hasil, "machines": ringkasan}
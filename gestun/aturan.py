@@ -0,0 +1,221 @@
+"""Mesin aturan biaya: satu evaluator terkompilasi untuk Konven, Express, Normal, Marketplace.
+
+Setiap menu hanya berbeda di beberapa detail yang dideklarasikan di
+:data:`ATURAN_BIAYA`:
+
+- ``pembulatan_fee`` — fee persentase dibulatkan (``"round"``, half-to-even
+  seperti ``round`` Python) atau dibiarkan pecahan (``None``).
+- ``gross_up`` — pembulatan nominal gesek metode Bersih: ``"trunc"`` (``int``)
+  atau ``"ceil"`` (``math.ceil``).
+- ``ekstra_bersih`` — tambahan Rupiah pada nominal gesek metode Bersih, untuk
+  rate persentase dan rate flat/nominal.
+- ``potong`` — urutan potongan metode Kotor: ``"bertahap"`` (``n − fee − biaya``)
+  atau ``"gabung"`` (``n − (fee + biaya)``); dibedakan agar hasil float sama
+  persis dengan rumus lama tiap menu.
+
+:func:`compile_rules` mengubah satu set aturan menjadi :class:`FeeEngine` yang
+closure-nya dirakit sekali per kombinasi arah/jenis rate (tanpa cabang aturan
+per kuotasi). Engine yang sama bisa menghitung satu kuotasi
+(:meth:`FeeEngine.evaluator` / :meth:`FeeEngine.quote`) atau banyak
+sekaligus dengan NumPy (:meth:`FeeEngine.quote_batch`) — operasi float64-nya
+identik sehingga hasil batch sama persis dengan skalar.
+
+Input kuotasi:
+
+- ``nominal`` — nominal gesek (Kotor) atau nominal diterima (Bersih),
+- ``kotor`` — arah perhitungan,
+- ``persen`` — rate persentase (``rates``, desimal) atau flat (``flat``, Rp),
+- ``rates`` — satu atau beberapa komponen rate desimal (Marketplace: merchant
+  dan gestun), dihitung terpisah lalu dijumlah,
+- ``biaya`` — total biaya layanan + biaya tambahan (Rp).
+"""
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+ATURAN_BIAYA: Dict[str, Dict[str, Any]] = {
+    "Konven": {
+        "pembulatan_fee": "round", "gross_up": "trunc", "potong": "bertahap",
+        "ekstra_bersih": {"persen": 1, "flat": 1},
+    },
+    "Express": {
+        "pembulatan_fee": "round", "gross_up": "ceil", "potong": "bertahap",
+        "ekstra_bersih": {"persen": 0, "flat": 0},
+    },
+    "Normal": {
+        "pembulatan_fee": "round", "gross_up": "ceil", "potong": "bertahap",
+        "ekstra_bersih": {"persen": 0, "flat": 1},
+    },
+    "Marketplace": {
+        "pembulatan_fee": None, "gross_up": "ceil", "potong": "gabung",
+        "ekstra_bersih": {"persen": 0, "flat": 0},
+    },
+}
+
+_PEMBULATAN: Tuple[Any, ...]     = ("round", None)   # "round" = half-to-even
+_GROSS_UP:   Dict[str, Callable] = {"trunc": int, "ceil": math.ceil}
+_POTONG:     Dict[str, Callable] = {
+    "bertahap": lambda n, fee, biaya: n - fee - biaya,
+    "gabung":   lambda n, fee, biaya: n - (fee + biaya),
+}   # hanya dipakai batch NumPy; jalur skalar memakai closure khusus
+# Padanan NumPy (NumPy hanya di-import saat batch dipakai)
+_GROSS_UP_NP = {"trunc": "trunc", "ceil": "ceil"}
+
+Quote     = Dict[str, Any]
+Evaluator = Callable[..., Tuple[Any, Any, Any, Any, Tuple[Any, ...]]]
+
+KOLOM_QUOTE = ("gesek", "terima", "fee", "potongan", "fee_komponen")
+
+
+def _kompilasi(aturan: Dict[str, Any], kotor: bool, persen: bool, komponen: int) -> Evaluator:
+    """Rakit satu closure evaluator; semua aturan dibaca di sini, bukan per kuotasi."""
+    bulat  = aturan["pembulatan_fee"] == "round"
+    naik   = _GROSS_UP[aturan["gross_up"]]
+    gabung = aturan["potong"] == "gabung"
+    ekstra = aturan["ekstra_bersih"]["persen" if persen else "flat"]
+
+    if kotor and persen and komponen == 1:
+        def ev(n, biaya, r):
+            fee = round(n * r) if bulat else n * r
+            terima = n - (fee + biaya) if gabung else n - fee - biaya
+            return (n, terima, fee, fee + biaya, (fee,))
+    elif kotor and persen and komponen == 2:
+        def ev(n, biaya, r1, r2):
+            f1, f2 = (round(n * r1), round(n * r2)) if bulat else (n * r1, n * r2)
+            fee    = f1 + f2
+            terima = n - (fee + biaya) if gabung else n - fee - biaya
+            return (n, terima, fee, fee + biaya, (f1, f2))
+    elif kotor and persen:
+        def ev(n, biaya, *rates):
+            fees   = tuple([round(n * r) if bulat else n * r for r in rates])
+            fee    = sum(fees)
+            terima = n - (fee + biaya) if gabung else n - fee - biaya
+            return (n, terima, fee, fee + biaya, fees)
+    elif kotor:
+        def ev(n, biaya, flat):
+            terima = n - (flat + biaya) if gabung else n - flat - biaya
+            return (n, terima, flat, flat + biaya, (flat,))
+    elif persen:
+        def ev(n, biaya, *rates):
+            total = rates[0] if komponen == 1 else sum(rates)
+            gesek = naik((n + biaya) / (1.0 - total)) + ekstra
+            fee   = gesek - n - biaya
+            return (gesek, n, fee, gesek - n, (fee,))
+    else:
+        def ev(n, biaya, flat):
+            gesek = n + biaya + flat + ekstra
+            fee   = gesek - n - biaya
+            return (gesek, n, fee, gesek - n, (fee,))
+    return ev
+
+
+class FeeEngine:
+    """Evaluator hasil :func:`compile_rules` untuk satu set aturan.
+
+    :meth:`evaluator` mengembalikan fungsi terkompilasi
+    ``f(nominal, biaya, *nilai) -> (gesek, terima, fee, potongan, fee_komponen)``
+    dengan ``nilai`` = komponen rate desimal (persen) atau satu nilai flat (Rp).
+    Pemanggil yang sering (``gestun.biaya``) mengikat fungsi ini sekali saat
+    import sehingga tiap kuotasi hanya satu panggilan tanpa cabang aturan.
+    """
+
+    def __init__(self, nama: str, aturan: Dict[str, Any]) -> None:
+        self.nama   = nama
+        self.aturan = aturan
+        self._cache: Dict[Tuple[bool, bool, int], Evaluator] = {}
+
+    def evaluator(self, kotor: bool, persen: bool, komponen: int = 1) -> Evaluator:
+        """Fungsi kuotasi terkompilasi untuk arah *kotor*, jenis rate *persen*
+        dan jumlah *komponen* rate (hanya relevan untuk rate persen).
+        """
+        kunci = (kotor, persen, komponen if persen else 1)
+        ev = self._cache.get(kunci)
+        if ev is None:
+            ev = self._cache[kunci] = _kompilasi(self.aturan, *kunci)
+        return ev
+
+    def quote(
+        self,
+        nominal: float,
+        kotor: bool = True,
+        persen: bool = True,
+        rates: Sequence[float] = (0.0,),
+        flat: float = 0.0,
+        biaya: float = 0,
+    ) -> Quote:
+        """Satu kuotasi: ``{"gesek", "terima", "fee", "potongan", "fee_komponen"}``."""
+        nilai = tuple(rates) if persen else (flat,)
+        hasil = self.evaluator(kotor, persen, len(nilai))(nominal, biaya, *nilai)
+        return dict(zip(KOLOM_QUOTE, hasil))
+
+    def quote_batch(
+        self,
+        nominal,
+        kotor: bool = True,
+        persen: bool = True,
+        rates: Sequence = (0.0,),
+        flat=0.0,
+        biaya=0,
+    ) -> Dict[str, Any]:
+        """Versi NumPy dari :meth:`quote`; semua argumen numerik boleh array
+        (di-broadcast). Kembalikan array ``gesek``, ``terima``, ``fee``,
+        ``potongan``. Seperti jalur skalar, fee yang dibulatkan dan nominal
+        gross-up bertipe int64; input bulat tetap dihitung sebagai integer.
+        """
+        import numpy as np
+
+        n     = np.asarray(nominal)
+        biaya = np.asarray(biaya)
+        if kotor:
+            if persen:
+                bulat = self.aturan["pembulatan_fee"] is not None
+                fee   = None
+                for r in rates:
+                    f   = n * np.asarray(r, dtype=np.float64)
+                    f   = np.rint(f).astype(np.int64) if bulat else f
+                    fee = f if fee is None else fee + f
+            else:
+                fee = np.asarray(flat)
+            potongan = fee + biaya
+            terima   = _POTONG[self.aturan["potong"]](n, fee, biaya)
+            return {
+                "gesek":    np.broadcast_to(n, terima.shape),
+                "terima":   terima,
+                "fee":      np.broadcast_to(fee, terima.shape),
+                "potongan": potongan,
+            }
+
+        ekstra = self.aturan["ekstra_bersih"]
+        if persen:
+            naik  = getattr(np, _GROSS_UP_NP[self.aturan["gross_up"]])
+            total = sum(np.asarray(r, dtype=np.float64) for r in rates)
+            gesek = naik((n + biaya) / (1.0 - total)).astype(np.int64) + ekstra["persen"]
+        else:
+            gesek = n + biaya + np.asarray(flat) + ekstra["flat"]
+        return {
+            "gesek":    gesek,
+            "terima":   np.broadcast_to(n, gesek.shape),
+            "fee":      gesek - n - biaya,
+            "potongan": gesek - n,
+        }
+
+
+def compile_rules(nama: str, aturan: Dict[str, Any]) -> FeeEngine:
+    """Kompilasi satu set aturan deklaratif menjadi :class:`FeeEngine`."""
+    tidak_dikenal = {
+        "pembulatan_fee": aturan["pembulatan_fee"] not in _PEMBULATAN,
+        "gross_up":       aturan["gross_up"] not in _GROSS_UP,
+        "potong":         aturan["potong"] not in _POTONG,
+    }
+    salah = [k for k, v in tidak_dikenal.items() if v]
+    if salah:
+        raise ValueError(f"Aturan '{nama}' tidak valid: {', '.join(salah)}")
+    return FeeEngine(nama, aturan)
+
+
+@lru_cache(maxsize=None)
+def engine(nama: str) -> FeeEngine:
+    """Engine terkompilasi (di-cache) untuk menu *nama* di :data:`ATURAN_BIAYA`."""
+    return compile_rules(nama, ATURAN_BIAYA[nama])
@@ -0,0 +1,217 @@
+"""Audit Monte Carlo distribusi nominal hasil ``split_transaction_exact``.
+
+Variasi ±5%, ``_rand_adjust`` dan komponen non-bulat 237–937 dimaksudkan agar
+pola gesek tidak mudah dikenali. Modul ini mensimulasikan jutaan pembagian
+atas grid (set mesin × tingkat pengisian × max_swipes) secara paralel lalu
+merangkum:
+
+- histogram nominal relatif terhadap cap slot (limit − SAFETY_GAP),
+- distribusi tiga digit terakhir (porsi 000, porsi di 237–937, chi-square),
+- skew porsi per mesin terhadap porsi proporsional kapasitasnya,
+- frekuensi jalur koreksi selisih, termasuk fallback ``parts[-1] += diff``.
+
+Hasil identik untuk seed yang sama berapa pun jumlah worker-nya (setiap
+potongan kerja punya seed sendiri yang diturunkan dari seed utama).
+
+    python -m gestun.audit --simulasi 2000000 --seed 7 --json audit.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .split import SAFETY_GAP, split_transaction_exact
+
+BINS_RASIO  = 20
+CHUNK       = 20_000           # simulasi per potongan kerja
+DIGIT_LOW   = 237
+DIGIT_HIGH  = 937
+
+# ─── Grid realistis ──────────────────────────────────────────────────────────
+SET_MESIN: Dict[str, List[Tuple[str, int]]] = {
+    "3x50jt":       [("EDC 1", 50_000_000), ("EDC 2", 50_000_000), ("EDC 3", 50_000_000)],
+    "BRI-BNI-BCA":  [("BRI", 50_000_000), ("BNI", 40_000_000), ("BCA", 30_000_000)],
+    "5-campur":     [("M1", 100_000_000), ("M2", 75_000_000), ("M3", 50_000_000),
+                     ("M4", 30_000_000), ("M5", 20_000_000)],
+    "10x25jt":      [(f"EDC {i + 1}", 25_000_000) for i in range(10)],
+}
+PENGISIAN  = (0.2, 0.4, 0.6, 0.8, 0.95)
+MAX_SWIPES = (2, 3)
+
+
+def grid() -> List[Tuple[str, float, int]]:
+    return [(nama, isi, s) for nama in SET_MESIN for isi in PENGISIAN for s in MAX_SWIPES]
+
+
+def _simulasi(task: Tuple[int, int, int, int]) -> Dict:
+    """Worker: jalankan *n* simulasi untuk satu sel grid dengan seed turunan."""
+    seed, sel, potongan, n = task
+    nama, isi, max_swipes  = grid()[sel]
+    machines = SET_MESIN[nama]
+    caps     = {m: limit - SAFETY_GAP for m, limit in machines}
+    kapasitas = sum(caps.values()) * max_swipes
+    rng      = random.Random(f"{seed}:{sel}:{potongan}")
+
+    rasio = [0] * BINS_RASIO
+    digit = [0] * 1_000
+    share_sum = {m: 0.0 for m in caps}
+    share_sq  = {m: 0.0 for m in caps}
+    jalur: Dict[str, int] = {}
+    gagal = gesek = 0
+
+    for _ in range(n):
+        # Total realistis: kelipatan juta di sekitar tingkat pengisian sel (±5%)
+        total = int(kapasitas * isi * rng.uniform(0.95, 1.05)) // 1_000_000 * 1_000_000
+        total = max(1_000_000, min(total, kapasitas))
+        try:
+            plan = split_transaction_exact(total, machines, max_swipes, rng=rng, stats=jalur)
+        except RuntimeError:
+            gagal += 1
+            continue
+        per_mesin = dict.fromkeys(caps, 0)
+        for p in plan:
+            amt = p["amount"]
+            rasio[min(BINS_RASIO - 1, amt * BINS_RASIO // caps[p["machine"]])] += 1
+            digit[amt % 1_000] += 1
+            per_mesin[p["machine"]] += amt
+        gesek += len(plan)
+        for m, jumlah in per_mesin.items():
+            share = jumlah / total
+            share_sum[m] += share
+            share_sq[m]  += share * share
+
+    return {
+        "sel": sel, "n": n, "gagal": gagal, "gesek": gesek, "rasio": rasio, "digit": digit,
+        "share_sum": share_sum, "share_sq": share_sq, "jalur": jalur,
+    }
+
+
+def _gabung(a: Optional[Dict], b: Dict) -> Dict:
+    if a is None:
+        return {**b, "jalur": dict(b["jalur"])}
+    a["n"]     += b["n"]
+    a["gagal"] += b["gagal"]
+    a["gesek"] += b["gesek"]
+    a["rasio"]  = [x + y for x, y in zip(a["rasio"], b["rasio"])]
+    a["digit"]  = [x + y for x, y in zip(a["digit"], b["digit"])]
+    for m in a["share_sum"]:
+        a["share_sum"][m] += b["share_sum"][m]
+        a["share_sq"][m]  += b["share_sq"][m]
+    for k, v in b["jalur"].items():
+        a["jalur"][k] = a["jalur"].get(k, 0) + v
+    return a
+
+
+def ringkas(sel: int, agg: Dict) -> Dict:
+    """Statistik akhir satu sel grid dari agregat mentah."""
+    nama, isi, max_swipes = grid()[sel]
+    machines = SET_MESIN[nama]
+    n_ok     = max(1, agg["n"] - agg["gagal"])
+    gesek    = max(1, agg["gesek"])
+    cap_tot  = sum(limit - SAFETY_GAP for _, limit in machines)
+
+    rentang  = agg["digit"][DIGIT_LOW:DIGIT_HIGH + 1]
+    di_rentang = sum(rentang)
+    harapan  = di_rentang / len(rentang) if di_rentang else 0
+    chi2     = sum((o - harapan) ** 2 / harapan for o in rentang) if harapan else 0.0
+
+    skew = {}
+    for m, limit in machines:
+        mean = agg["share_sum"][m] / n_ok
+        var  = max(0.0, agg["share_sq"][m] / n_ok - mean * mean)
+        skew[m] = {
+            "porsi_rata2":   round(mean, 4),
+            "porsi_ideal":   round((limit - SAFETY_GAP) / cap_tot, 4),
+            "std":           round(var ** 0.5, 4),
+        }
+
+    return {
+        "set_mesin":      nama,
+        "pengisian":      isi,
+        "max_swipes":     max_swipes,
+        "simulasi":       agg["n"],
+        "gagal":          agg["gagal"],
+        "gesek":          agg["gesek"],
+        "histogram_rasio_cap": agg["rasio"],
+        "porsi_000":      agg["digit"][0] / gesek,
+        "porsi_237_937":  di_rentang / gesek,
+        "chi2_per_dof":   chi2 / (len(rentang) - 1),
+        "top_digit":      sorted(range(1_000), key=lambda d: -agg["digit"][d])[:5],
+        "skew_mesin":     skew,
+        "jalur_koreksi":  {k: v / n_ok for k, v in sorted(agg["jalur"].items())},
+        "fallback_paksa": agg["jalur"].get("koreksi_paksa", 0) / n_ok,
+    }
+
+
+def run_audit(simulasi: int, seed: int = 0, workers: Optional[int] = None) -> List[Dict]:
+    """Bagi *simulasi* rata ke semua sel grid, jalankan paralel, kembalikan ringkasan per sel."""
+    sel_grid = grid()
+    per_sel  = max(1, simulasi // len(sel_grid))
+    tasks    = [
+        (seed, sel, potongan, min(CHUNK, per_sel - potongan * CHUNK))
+        for sel in range(len(sel_grid))
+        for potongan in range(-(-per_sel // CHUNK))
+    ]
+    workers = workers or os.cpu_count() or 1
+
+    agg: Dict[int, Optional[Dict]] = dict.fromkeys(range(len(sel_grid)))
+    if workers <= 1:
+        hasil = map(_simulasi, tasks)
+        for r in hasil:
+            agg[r["sel"]] = _gabung(agg[r["sel"]], r)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for r in pool.map(_simulasi, tasks):
+                agg[r["sel"]] = _gabung(agg[r["sel"]], r)
+    return [ringkas(sel, a) for sel, a in agg.items() if a is not None]
+
+
+def _bar(counts: List[int], width: int = 30) -> List[str]:
+    top = max(counts) or 1
+    return [
+        f"  {i * 100 // len(counts):>3}–{(i + 1) * 100 // len(counts):<3}% {'█' * (c * width // top):<{width}} {c}"
+        for i, c in enumerate(counts)
+    ]
+
+
+def laporan(hasil: List[Dict]) -> str:
+    baris = [
+        f"{'set mesin':<12} {'isi':>4} {'swp':>3} {'simulasi':>9} {'000':>7} {'237–937':>8} "
+        f"{'χ²/dof':>7} {'paksa':>8} {'skew maks':>9}"
+    ]
+    rasio_total = [0] * BINS_RASIO
+    for h in hasil:
+        skew_maks = max(abs(s["porsi_rata2"] - s["porsi_ideal"]) for s in h["skew_mesin"].values())
+        baris.append(
+            f"{h['set_mesin']:<12} {h['pengisian']:>4} {h['max_swipes']:>3} {h['simulasi']:>9} "
+            f"{h['porsi_000']:>7.2%} {h['porsi_237_937']:>8.2%} {h['chi2_per_dof']:>7.2f} "
+            f"{h['fallback_paksa']:>8.4%} {skew_maks:>9.4f}"
+        )
+        rasio_total = [x + y for x, y in zip(rasio_total, h["histogram_rasio_cap"])]
+    baris += ["", "Histogram nominal / cap slot (semua sel):", *_bar(rasio_total)]
+    return "\n".join(baris)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Audit Monte Carlo distribusi nominal split EDC.")
+    parser.add_argument("--simulasi", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("--json", help="simpan ringkasan lengkap ke file JSON")
+    args = parser.parse_args(argv)
+
+    hasil = run_audit(args.simulasi, args.seed, args.workers)
+    print(laporan(hasil))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"seed": args.seed, "simulasi": args.simulasi, "sel": hasil}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
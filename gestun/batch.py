@@ -0,0 +1,186 @@
+"""Pembagian EDC massal: satu CSV berisi banyak total → satu CSV rencana gabungan.
+
+Kolom CSV masukan (header tidak peka huruf besar/kecil):
+
+- ``total``      — wajib, nominal transaksi ("250000000" / "Rp 250.000.000").
+- ``ref``        — opsional, penanda baris (no. transaksi / nama nasabah).
+- ``mesin``      — opsional, set mesin khusus baris ini: ``"EDC 1=50000000; EDC 2=30000000"``.
+- ``max_swipes`` — opsional, maks gesek per mesin untuk baris ini.
+
+Baris yang gagal (total tidak valid, kapasitas kurang → RuntimeError) dicatat
+per baris dengan status GAGAL dan tidak menghentikan batch.
+
+    python -m gestun.batch totals.csv -m "EDC 1=50000000;EDC 2=30000000" -o plan.csv
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .rupiah import parse_rupiah
+from .split import split_transaction_exact
+
+PLAN_HEADER    = ["baris", "ref", "gesek_ke", "machine", "amount", "status", "keterangan"]
+PARALLEL_MIN   = 64      # di bawah ini overhead proses lebih mahal dari hitungannya
+DEFAULT_CHUNKS = 4       # chunk per worker agar beban tetap merata
+
+
+def parse_machines(spec: str) -> List[Tuple[str, int]]:
+    """``"EDC 1=50000000; EDC 2=30.000.000"`` → ``[("EDC 1", 50000000), ("EDC 2", 30000000)]``."""
+    machines: List[Tuple[str, int]] = []
+    for item in spec.split(";"):
+        if not item.strip():
+            continue
+        name, sep, limit = item.rpartition("=")
+        if not sep or not name.strip() or parse_rupiah(limit) <= 0:
+            raise ValueError(f"Format mesin tidak valid: '{item.strip()}' (contoh: EDC 1=50000000)")
+        machines.append((name.strip(), parse_rupiah(limit)))
+    return machines
+
+
+def read_batch_csv(
+    lines: Iterable[str],
+    default_machines: List[Tuple[str, int]],
+    default_max_swipes: int = 2,
+) -> Iterator[Dict]:
+    """Baca baris CSV menjadi job ``{"baris", "ref", "total", "machines", "max_swipes", "error"}``.
+    Baris yang tidak valid tetap dikembalikan dengan ``error`` terisi.
+    """
+    reader = csv.DictReader(lines)
+    if reader.fieldnames is None or "total" not in [f.strip().lower() for f in reader.fieldnames]:
+        raise ValueError("CSV harus memiliki kolom 'total'.")
+
+    for no, raw in enumerate(reader, start=1):
+        row = {(k or "").strip().lower(): (v or "").strip() for k, v in raw.items()}
+        job = {
+            "baris":      no,
+            "ref":        row.get("ref", ""),
+            "total":      parse_rupiah(row.get("total", "")),
+            "machines":   default_machines,
+            "max_swipes": default_max_swipes,
+            "error":      "",
+        }
+        try:
+            if job["total"] <= 0:
+                raise ValueError(f"Total tidak valid: '{row.get('total', '')}'")
+            if row.get("mesin"):
+                job["machines"] = parse_machines(row["mesin"])
+            if row.get("max_swipes"):
+                job["max_swipes"] = int(row["max_swipes"])
+            if not job["machines"]:
+                raise ValueError("Tidak ada mesin untuk baris ini.")
+        except ValueError as e:
+            job["error"] = str(e)
+        yield job
+
+
+def _split_job(job: Dict) -> Dict:
+    """Worker (top-level agar bisa di-pickle): hitung satu baris, tangkap error per baris."""
+    result = {"baris": job["baris"], "ref": job["ref"], "total": job["total"], "plan": [], "error": job["error"]}
+    if result["error"]:
+        return result
+    try:
+        result["plan"] = split_transaction_exact(
+            job["total"], job["machines"], job["max_swipes"], seed=job.get("seed")
+        )
+    except (RuntimeError, ValueError) as e:
+        # Pesan kapasitas multi-baris — cukup baris pertama untuk laporan
+        result["error"] = str(e).splitlines()[0]
+    return result
+
+
+def run_batch(
+    jobs: Iterable[Dict],
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> Iterator[Dict]:
+    """Jalankan :func:`split_transaction_exact` untuk setiap job, paralel lintas core.
+    Hasil dikembalikan berurutan sesuai baris. *seed* (opsional) membuat
+    seluruh batch reproducible: baris ke-n memakai seed ``seed + n``.
+
+    Worker dibuat dengan ``spawn``, bukan ``fork`` (fork dari proses ber-thread
+    bisa deadlock). Spawn mengimpor ulang ``__main__`` di tiap worker; di dalam
+    server Streamlit itu skrip app sendiri, jadi UI memanggil ``workers=1``.
+    """
+    if seed is not None:
+        jobs = ({**job, "seed": seed + job["baris"]} for job in jobs)
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:            # bertahap: satu baris di memori
+        yield from map(_split_job, jobs)
+        return
+    jobs = list(jobs)
+    if len(jobs) < PARALLEL_MIN:
+        yield from map(_split_job, jobs)
+        return
+
+    chunksize = max(1, len(jobs) // (workers * DEFAULT_CHUNKS))
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        yield from pool.map(_split_job, jobs, chunksize=chunksize)
+
+
+def iter_plan_csv(results: Iterable[Dict]) -> Iterator[str]:
+    """Stream hasil batch sebagai baris-baris CSV (header dulu)."""
+    buf    = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+
+    def _flush() -> str:
+        text = buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+        return text
+
+    writer.writerow(PLAN_HEADER)
+    yield _flush()
+    for res in results:
+        if res["error"]:
+            writer.writerow([res["baris"], res["ref"], "", "", "", "GAGAL", res["error"]])
+        else:
+            for ke, part in enumerate(res["plan"], start=1):
+                writer.writerow([res["baris"], res["ref"], ke, part["machine"], part["amount"], "OK", ""])
+        yield _flush()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pembagian EDC massal dari CSV total.")
+    parser.add_argument("input", help="CSV masukan ('-' untuk stdin)")
+    parser.add_argument("-m", "--mesin", default="", help='mesin default, mis. "EDC 1=50000000;EDC 2=30000000"')
+    parser.add_argument("-s", "--max-swipes", type=int, default=2)
+    parser.add_argument("-o", "--output", default="-", help="CSV keluaran ('-' untuk stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    machines = parse_machines(args.mesin) if args.mesin else []
+    src = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8-sig")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    gagal = 0
+    try:
+        def _hitung_gagal(results: Iterable[Dict]) -> Iterator[Dict]:
+            nonlocal gagal
+            for res in results:
+                gagal += bool(res["error"])
+                yield res
+
+        jobs = read_batch_csv(src, machines, args.max_swipes)
+        for chunk in iter_plan_csv(_hitung_gagal(run_batch(jobs, args.workers, args.seed))):
+            dst.write(chunk)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+    print(f"Selesai, {gagal} baris gagal.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
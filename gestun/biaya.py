@@ -0,0 +1,107 @@
+"""Rumus biaya untuk menu Konven, Input Data (Express / Normal) dan Marketplace.
+
+Semua rumus adalah pemanggil tipis :mod:`gestun.aturan` (mesin aturan biaya).
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+from .aturan import ATURAN_BIAYA, engine
+
+EXTRA_FEE_BERSIH = ATURAN_BIAYA["Konven"]["ekstra_bersih"]["persen"]
+
+# Evaluator terkompilasi diikat sekali: kunci (kotor, persen)
+_ARAH = ((True, True), (True, False), (False, True), (False, False))
+_KONVEN  = {k: engine("Konven").evaluator(*k) for k in _ARAH}
+_EXPRESS = {k: engine("Express").evaluator(*k) for k in _ARAH}
+_NORMAL  = {k: engine("Normal").evaluator(*k) for k in _ARAH}
+_MARKETPLACE_KOTOR = engine("Marketplace").evaluator(True, True, komponen=2)
+
+# ─── Konven ───────────────────────────────────────────────────────────────────
+
+def hitung_konven(
+    nominal: int,
+    biaya_total: int,
+    rate_decimal: Optional[float] = None,
+    nominal_rate: int = 0,
+) -> Dict[str, int]:
+    """Hasil Gesek Kotor (k_terima) & Gesek Bersih (b_transaksi) menu Konven.
+    *rate_decimal* = None berarti rate jual nominal (*nominal_rate* Rp).
+    """
+    persen = rate_decimal is not None
+    nilai  = rate_decimal if persen else nominal_rate
+    _, k_terima, k_fee, pot_kotor, _ = _KONVEN[True, persen](nominal, biaya_total, nilai)
+    b_transaksi, _, _, pot_bersih, _ = _KONVEN[False, persen](nominal, biaya_total, nilai)
+    return {
+        "k_fee":                k_fee,
+        "k_terima":             k_terima,
+        "b_transaksi":          b_transaksi,
+        "total_potongan_kotor": pot_kotor,
+        "total_biaya_bersih":   pot_bersih,
+    }
+
+# ─── Input Data: Express & Normal ─────────────────────────────────────────────
+
+def hitung_express(
+    input_nominal: float,
+    total_biaya: float,
+    kotor: bool = True,
+    fee_decimal: float = 0.0,
+    fee_flat: float = 0.0,
+    persen: bool = True,
+) -> Dict[str, float]:
+    """Jumlah gesek (jt_final) & transfer (trf_final) mode Express.
+    Kotor: *input_nominal* = jumlah gesek. Bersih: *input_nominal* = jumlah transfer.
+    """
+    q = _EXPRESS[kotor, persen](input_nominal, total_biaya, fee_decimal if persen else fee_flat)
+    return {"jt_final": q[0], "trf_final": q[1]}
+
+def hitung_normal(
+    input_nominal: float,
+    total_biaya: float,
+    kotor: bool = True,
+    rate_decimal: float = 0.0,
+    rt_nom: float = 0.0,
+    persen: bool = True,
+) -> Dict[str, float]:
+    """Jumlah gesek (jt_final) & transfer (trf_final) mode Normal 3 Jam.
+    Sama seperti Express, kecuali Bersih + rate nominal menambah Rp 1.
+    """
+    q = _NORMAL[kotor, persen](input_nominal, total_biaya, rate_decimal if persen else rt_nom)
+    return {"jt_final": q[0], "trf_final": q[1]}
+
+def hitung_rate_untung(
+    jt_final: float,
+    mdr_percent: float,
+    rt_val: float = 0.0,
+    rt_nom: float = 0.0,
+    persen: bool = True,
+) -> float:
+    """Margin "Rate Untung": poin persen (rate persentase) atau Rupiah (rate nominal)."""
+    if persen:
+        return rt_val - mdr_percent
+    return rt_nom - jt_final * (mdr_percent / 100.0)
+
+# ─── Marketplace ──────────────────────────────────────────────────────────────
+
+def hitung_marketplace(
+    nominal_checkout: int,
+    fee_merchant: Optional[float],
+    fee_gestun: Optional[float],
+    total_biaya_tambahan: int = 0,
+) -> Dict[str, float]:
+    """Estimasi dana diterima dari checkout marketplace. Fee None = "Tidak Ada"."""
+    _, diterima, _, total, (fee_merchant_rp, fee_gestun_rp) = _MARKETPLACE_KOTOR(
+        nominal_checkout,
+        total_biaya_tambahan,
+        0.0 if fee_merchant is None else fee_merchant / 100,
+        0.0 if fee_gestun is None else fee_gestun / 100,
+    )
+    if fee_merchant is None and fee_gestun is None:   # tanpa fee persen: tetap int
+        total, diterima = int(total), int(diterima)
+    return {
+        "fee_merchant_rp":  0 if fee_merchant is None else fee_merchant_rp,
+        "fee_gestun_rp":    0 if fee_gestun is None else fee_gestun_rp,
+        "total_biaya":      total,
+        "nominal_diterima": diterima,
+    }
@@ -0,0 +1,28 @@
+"""Koneksi SQLite bersama (mode WAL) untuk penyimpanan lokal aplikasi."""
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+from typing import Union
+
+DATA_DIR     = Path(os.environ.get("GESTUN_DATA_DIR", "data"))
+BUSY_TIMEOUT = 5_000     # ms — tunggu writer lain, jangan langsung "database is locked"
+
+
+def connect(path: Union[str, Path], check_same_thread: bool = False) -> sqlite3.Connection:
+    """Buka koneksi SQLite dengan WAL: pembaca tidak diblokir penulis.
+    ``isolation_level=None`` — transaksi dikontrol eksplisit (BEGIN IMMEDIATE).
+    Default boleh dipakai lintas thread; pemanggil wajib menjaga dengan lock.
+    """
+    path = Path(path)
+    if str(path) != ":memory:":
+        path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(
+        str(path), timeout=BUSY_TIMEOUT / 1_000, isolation_level=None,
+        check_same_thread=check_same_thread,
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT}")
+    return conn
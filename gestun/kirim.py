@@ -0,0 +1,328 @@
+"""Antrean kirim pesan WhatsApp (asyncio) dengan pengirim yang bisa diganti.
+
+:class:`DispatchQueue` menjalankan event loop asyncio sendiri di thread daemon,
+sehingga :meth:`DispatchQueue.submit` dari rerun Streamlit langsung kembali
+(hanya menaruh id di antrean) dan pengiriman tidak pernah menahan UI.
+
+- **Konkurensi terbatas** — ``konkurensi`` worker; paling banyak sebanyak itu
+  batch yang sedang dikirim bersamaan.
+- **Batch** — worker mengumpulkan hingga ``batch`` pesan atau menunggu paling
+  lama ``jeda_batch`` detik, lalu memanggil :meth:`Sender.send_batch` sekali.
+- **Coba ulang** — pesan gagal dijadwalkan ulang dengan backoff eksponensial
+  + jitter (``backoff × 2^(n−1)``, maks ``backoff_maks``) hingga ``maks_coba``.
+- **Status per pesan** — ``antri`` → ``dikirim`` → ``terkirim`` / ``coba_ulang``
+  / ``gagal``, dibaca lewat :meth:`DispatchQueue.status` / :meth:`daftar`.
+- **Batas memori** — riwayat dipangkas hanya dari pesan yang sudah selesai;
+  pesan yang belum selesai tidak pernah dibuang. Jika ``ANTRIAN_MAKS`` pesan
+  belum selesai, :meth:`DispatchQueue.submit` menunggu ruang (back-pressure)
+  lalu ``RuntimeError`` jika tetap penuh. Rerun Streamlit memanggilnya dengan
+  ``tunggu=0``: langsung ditolak, tidak pernah menahan rerun.
+
+Pengirim HTTP (:class:`HttpSender`) mem-POST JSON
+``{"pesan": [{"id", "tujuan", "teks"}, …]}`` dan mengharapkan
+``{"hasil": [{"id", "ok", "error"}, …]}``. Stub lokal untuk uji coba::
+
+    python -m gestun.kirim stub --port 8765 --gagal 0.2
+    GESTUN_WA_URL=http://127.0.0.1:8765/kirim GESTUN_WA_TUJUAN=grup-transaksi streamlit run transaksi-gestun.py
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict, deque
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from .waktu import sekarang
+
+RIWAYAT_MAKS = 5_000     # status pesan selesai yang disimpan per proses (terlama dibuang)
+ANTRIAN_MAKS = 20_000    # pesan belum selesai; submit menunggu jika penuh
+TUNGGU_RUANG = 60.0      # detik submit menunggu ruang sebelum RuntimeError
+SELESAI      = ("terkirim", "gagal")
+
+
+# ─── Pengirim ─────────────────────────────────────────────────────────────────
+
+class Sender:
+    """Antarmuka pengirim. Subclass cukup mengimplementasikan :meth:`send_batch`."""
+
+    async def send_batch(self, batch: List[Dict]) -> List[Optional[str]]:
+        """Kirim *batch* ``[{"id", "tujuan", "teks"}]``; kembalikan hasil per pesan
+        (urutan sama): None = terkirim, teks = alasan gagal (akan dicoba ulang).
+        """
+        raise NotImplementedError
+
+
+class HttpSender(Sender):
+    """POST JSON satu batch ke gateway WhatsApp (atau stub lokal)."""
+
+    def __init__(self, url: str, timeout: float = 10.0, token: Optional[str] = None) -> None:
+        self.url     = url
+        self.timeout = timeout
+        self.token   = token
+
+    def _post(self, batch: List[Dict]) -> List[Optional[str]]:
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        req = urllib.request.Request(
+            self.url, data=json.dumps({"pesan": batch}).encode("utf-8"), headers=headers, method="POST"
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                hasil = {h["id"]: h for h in json.loads(resp.read()).get("hasil", [])}
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            return [f"{type(e).__name__}: {e}"] * len(batch)
+        return [
+            None if hasil.get(p["id"], {}).get("ok") else hasil.get(p["id"], {}).get("error") or "tidak dikonfirmasi"
+            for p in batch
+        ]
+
+    async def send_batch(self, batch: List[Dict]) -> List[Optional[str]]:
+        # urllib blocking → thread pool, event loop tetap bebas
+        return await asyncio.to_thread(self._post, batch)
+
+
+# ─── Antrean ──────────────────────────────────────────────────────────────────
+
+class DispatchQueue:
+    """Antrean kirim asinkron; aman dipanggil dari thread mana pun."""
+
+    def __init__(
+        self,
+        sender: Sender,
+        tujuan: str = "",
+        konkurensi: int = 4,
+        batch: int = 20,
+        jeda_batch: float = 0.2,
+        maks_coba: int = 5,
+        backoff: float = 1.0,
+        backoff_maks: float = 60.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.sender       = sender
+        self.tujuan       = tujuan
+        self.konkurensi   = konkurensi
+        self.batch        = batch
+        self.jeda_batch   = jeda_batch
+        self.maks_coba    = maks_coba
+        self.backoff      = backoff
+        self.backoff_maks = backoff_maks
+        self._rng    = random.Random(seed)
+        self._lock   = threading.Lock()
+        self._ruang  = threading.Condition(self._lock)
+        self._status: "OrderedDict[str, Dict]" = OrderedDict()
+        self._selesai: "deque[str]" = deque()   # id selesai, urut waktu selesai
+        self._loop   = asyncio.new_event_loop()
+        self._siap   = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="gestun-kirim", daemon=True)
+        self._thread.start()
+        self._siap.wait()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._workers = [self._loop.create_task(self._worker()) for _ in range(self.konkurensi)]
+        self._siap.set()
+        self._loop.run_forever()
+
+    # ── API (thread pemanggil) ──────────────────────────────────────────────
+    def submit(self, teks: str, tujuan: Optional[str] = None, ref: str = "",
+               tunggu: float = TUNGGU_RUANG) -> str:
+        """Masukkan pesan ke antrean; kembalikan id-nya. Tidak menunggu jaringan,
+        kecuali antrean penuh (``ANTRIAN_MAKS`` belum selesai): menunggu ruang
+        hingga *tunggu* detik, lalu ``RuntimeError`` — pesan tidak pernah dibuang.
+        """
+        pid = uuid4().hex[:12]
+        with self._ruang:
+            if not self._ruang.wait_for(lambda: self._belum_selesai() < ANTRIAN_MAKS, tunggu):
+                raise RuntimeError(
+                    f"Antrean kirim WhatsApp penuh ({ANTRIAN_MAKS} pesan belum selesai); coba lagi nanti."
+                )
+            self._status[pid] = {
+                "id": pid, "ref": ref, "tujuan": tujuan or self.tujuan, "teks": teks,
+                "status": "antri", "percobaan": 0, "error": "",
+                "dibuat": sekarang().isoformat(timespec="seconds"), "diperbarui": time.time(),
+            }
+            self._pangkas()
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, pid)
+        return pid
+
+    def _belum_selesai(self) -> int:
+        return len(self._status) - len(self._selesai)
+
+    def _pangkas(self) -> None:
+        """Buang riwayat terlama yang sudah selesai (dipanggil dengan lock)."""
+        while len(self._status) > RIWAYAT_MAKS and self._selesai:
+            self._status.pop(self._selesai.popleft(), None)
+
+    def status(self, pid: str) -> Optional[Dict]:
+        with self._lock:
+            s = self._status.get(pid)
+            return None if s is None else {k: v for k, v in s.items() if k != "teks"}
+
+    def daftar(self, limit: int = 50) -> List[Dict]:
+        """Status pesan terbaru dulu (tanpa teks)."""
+        with self._lock:
+            terbaru = list(self._status.values())[-limit:][::-1]
+            return [{k: v for k, v in s.items() if k != "teks"} for s in terbaru]
+
+    def ringkas(self) -> Dict[str, int]:
+        """Jumlah pesan per status."""
+        hasil: Dict[str, int] = {}
+        with self._lock:
+            for s in self._status.values():
+                hasil[s["status"]] = hasil.get(s["status"], 0) + 1
+        return hasil
+
+    def tunggu(self, timeout: float = 30.0) -> bool:
+        """Tunggu sampai semua pesan selesai (terkirim/gagal) — untuk CLI & uji."""
+        batas = time.monotonic() + timeout
+        while time.monotonic() < batas:
+            with self._lock:
+                if all(s["status"] in SELESAI for s in self._status.values()):
+                    return True
+            time.sleep(0.05)
+        return False
+
+    def tutup(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    # ── Event loop (thread kirim) ───────────────────────────────────────────
+    async def _worker(self) -> None:
+        while True:
+            ids = [await self._queue.get()]
+            batas = self._loop.time() + self.jeda_batch
+            while len(ids) < self.batch:
+                sisa = batas - self._loop.time()
+                if sisa <= 0:
+                    break
+                try:
+                    ids.append(await asyncio.wait_for(self._queue.get(), sisa))
+                except asyncio.TimeoutError:
+                    break
+            await self._kirim(ids)
+
+    def _ubah(self, pid: str, **nilai) -> Optional[Dict]:
+        with self._ruang:
+            s = self._status.get(pid)
+            if s is not None:
+                s.update(nilai, diperbarui=time.time())
+                if s["status"] in SELESAI:
+                    self._selesai.append(pid)
+                    self._pangkas()
+                    self._ruang.notify_all()
+            return s
+
+    async def _kirim(self, ids: List[str]) -> None:
+        batch: List[Dict] = []
+        with self._lock:
+            for pid in ids:
+                s = self._status.get(pid)
+                if s is None:          # tidak terjadi: yang belum selesai tak pernah dibuang
+                    continue
+                s.update(status="dikirim", percobaan=s["percobaan"] + 1, diperbarui=time.time())
+                batch.append({"id": pid, "tujuan": s["tujuan"], "teks": s["teks"]})
+        if not batch:
+            return
+        try:
+            hasil = await self.sender.send_batch(batch)
+        except Exception as e:      # pengirim rusak tidak boleh mematikan worker
+            hasil = [f"{type(e).__name__}: {e}"] * len(batch)
+
+        for p, error in zip(batch, hasil):
+            pid = p["id"]
+            if error is None:
+                self._ubah(pid, status="terkirim", error="", teks="")
+                continue
+            with self._lock:
+                percobaan = self._status[pid]["percobaan"] if pid in self._status else self.maks_coba
+            if percobaan >= self.maks_coba:
+                self._ubah(pid, status="gagal", error=error, teks="")
+                continue
+            jeda = min(self.backoff_maks, self.backoff * 2 ** (percobaan - 1)) * (0.5 + self._rng.random() / 2)
+            self._ubah(pid, status="coba_ulang", error=error)
+            self._loop.call_later(jeda, self._queue.put_nowait, pid)
+
+
+@lru_cache(maxsize=None)
+def get_dispatcher() -> Optional[DispatchQueue]:
+    """Antrean bersama per proses dari env ``GESTUN_WA_URL`` (+ ``GESTUN_WA_TUJUAN``,
+    ``GESTUN_WA_TOKEN``); None jika pengiriman tidak dikonfigurasi.
+    """
+    url = os.environ.get("GESTUN_WA_URL")
+    if not url:
+        return None
+    return DispatchQueue(
+        HttpSender(url, token=os.environ.get("GESTUN_WA_TOKEN")),
+        tujuan=os.environ.get("GESTUN_WA_TUJUAN", ""),
+    )
+
+
+# ─── Stub HTTP lokal ──────────────────────────────────────────────────────────
+
+def make_stub_server(port: int = 8765, gagal: float = 0.0, seed: Optional[int] = None,
+                     verbose: bool = True) -> ThreadingHTTPServer:
+    """Server gateway palsu: terima ``POST /kirim``, gagalkan sebagian pesan
+    secara acak (peluang *gagal*) untuk menguji coba ulang.
+    """
+    rng   = random.Random(seed)
+    kunci = threading.Lock()
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            panjang = int(self.headers.get("Content-Length", 0))
+            pesan   = json.loads(self.rfile.read(panjang) or b"{}").get("pesan", [])
+            hasil   = []
+            for p in pesan:
+                with kunci:
+                    ok = rng.random() >= gagal
+                hasil.append({"id": p.get("id"), "ok": ok, "error": "" if ok else "stub: gagal acak"})
+                if ok and verbose:
+                    print(f"→ {p.get('tujuan', '')}: {p.get('teks', '').splitlines()[0] if p.get('teks') else ''}")
+            body = json.dumps({"hasil": hasil}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:   # senyap; ringkasan dicetak di do_POST
+            pass
+
+    return ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stub gateway WhatsApp lokal untuk uji antrean kirim.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    stub = sub.add_parser("stub", help="jalankan stub HTTP")
+    stub.add_argument("--port", type=int, default=8765)
+    stub.add_argument("--gagal", type=float, default=0.0, help="peluang pesan gagal (0–1)")
+    stub.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = make_stub_server(args.port, args.gagal, args.seed)
+    print(f"Stub WhatsApp di http://127.0.0.1:{args.port}/kirim (gagal {args.gagal:.0%}) — Ctrl+C untuk berhenti")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
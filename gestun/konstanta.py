@@ -0,0 +1,106 @@
+"""Tabel konstanta bersama: layanan, preset rate dan biaya tambahan."""
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from .rupiah import fmt_rp
+
+# ─── Konven ───────────────────────────────────────────────────────────────────
+SVCS_KONVEN: List[Dict] = [
+    {"label_ui": "Normal (3 Jam)",                          "cost": 0,      "normalized": "Normal"},
+    {"label_ui": f"Express Non Member — {fmt_rp(18_000)}", "cost": 18_000, "normalized": "Express Non Member"},
+    {"label_ui": f"Express Member — {fmt_rp(15_000)}",     "cost": 15_000, "normalized": "Express Member"},
+]
+
+PRESET_RATE_KONVEN: List[float] = [
+    2.0, 2.3, 2.4, 2.5, 2.6, 3.3, 3.5, 4.0, 4.7, 5.0, 7.0, 8.0, 14.0,
+]
+
+# Tabel turunan untuk UI — dibangun sekali per proses, bukan tiap rerun
+SVC_KONVEN_BY_LABEL: Dict[str, Dict] = {s["label_ui"]: s for s in SVCS_KONVEN}
+LABEL_RATE_KONVEN:   List[str]       = [f"{r:.1f}%" for r in PRESET_RATE_KONVEN]
+
+BIAYA_TAMBAHAN_LIST: Dict[str, int] = {
+    "Biaya Transaksi di Mesin EDC":                         2_000,
+    "Biaya QRIS By Whatsapp":                               3_000,
+    "Biaya Layanan Online Invoice CC Pusat (Non Blibli)":   3_000,
+    "Biaya Administrasi Nasabah Baru":                     10_000,
+    "Biaya Transfer Beda Bank":                            10_000,
+    "Biaya Layanan Link Toko Tokopedia Non Member":        15_000,
+    "Biaya Layanan Link Toko Tokopedia Member":            10_000,
+    "Biaya Layanan Link Toko Shopee Non Member":           10_000,
+    "Biaya Layanan Link Toko Shopee Member":               10_000,
+    "Biaya Layanan Express Online Invoice":                25_000,
+    "Biaya Layanan Express Tokopedia":                     30_000,
+    "Biaya Layanan Express Shopee":                        30_000,
+}
+
+# ─── Input Data ───────────────────────────────────────────────────────────────
+SVCS_INPUT: List[Dict] = [
+    {"label_ui": "Normal 3 Jam",                            "cost": 0.0},
+    {"label_ui": f"Express Member — {fmt_rp(15_000)}",     "cost": 15_000.0},
+    {"label_ui": f"Express Non Member — {fmt_rp(18_000)}", "cost": 18_000.0},
+]
+SVC_INPUT_BY_LABEL: Dict[str, Dict] = {s["label_ui"]: s for s in SVCS_INPUT}
+BIAYA_NASABAH_BARU = 10_000.0
+
+# SLA dana masuk per mode (menit) — sumber tunggal estimasi "selesai pukul" di
+# pesan WhatsApp (gestun.pesan.DURASI) dan jatuh tempo papan SLA (gestun.sla)
+SLA_MENIT: Dict[str, int] = {"Express": 20, "Normal": 180}
+SLA_AMBANG_MENIT = 10      # sisa ≤ ambang → ditandai "hampir" terlambat
+
+# ─── Media Pencairan (Input Data → Normal) ────────────────────────────────────
+# Tanpa nilai bawaan: mdr (%) dan maks (Rp per transaksi, None = tanpa batas)
+# mengikuti kontrak tiap merchant, diisi pengguna dan disimpan bersama
+# (gestun.pemakaian.UsageStore.set_media). Media tanpa MDR tidak dinilai rute.
+
+_MEDIA_PER_JENIS: Dict[str, List[str]] = {
+    "EDC": [
+        "Mesin EDC - BRI Real Estate Gemilang",
+        "Mesin EDC - BNI Blurry Fashion Store",
+        "Mesin EDC - BCA Cozy Fashion",
+    ],
+    "QRIS Statis": [
+        "QRIS Statis - BNI Indah Mebeul",
+        "QRIS Statis - BNI Bahagia Roastery",
+        "QRIS Statis - BNI Toko Jaya Grosir",
+        "QRIS Statis - BNI Sinar Elektronik Store",
+        "QRIS Statis - BNI Bajuri Bike Center",
+        "QRIS Statis - BNI Cel Fashion",
+        "QRIS Statis - BNI Nada Collection Clothing",
+        "QRIS Statis - BNI Nugraha Clothes",
+        "QRIS Statis - BNI Syifa Boutique",
+        "QRIS Statis - BNI Wild And Fashion",
+        "QRIS Statis - BNI Urban Outfit Fashion",
+        "QRIS Statis - BNI Onpoint Wear",
+    ],
+    "QRIS Dinamis": [
+        "QRIS Dinamis - Giga Cell",
+        "QRIS Dinamis - WR Sembako Annisa",
+        "QRIS Dinamis - RM Parfume Rahayu",
+    ],
+    "Invoice": [
+        "Paper Id X Blibli - Kreasi Mode",
+        "Paper Id X Blibli - Happy Mode",
+        "Quickbill WL - Phone Foyer",
+        "Quickbill - Phone Foyer",
+        "Paper Id - Kreasi Mode",
+        "Paper Id - Happy Mode",
+        "Evermoss - Luxe Fashion",
+    ],
+}
+
+MEDIA_PENCAIRAN: List[Dict] = [
+    {"media": label, "jenis": jenis, "mdr": None, "maks": None, "aktif": True}
+    for jenis, labels in _MEDIA_PER_JENIS.items()
+    for label in labels
+]
+NAMA_MEDIA: List[str] = [m["media"] for m in MEDIA_PENCAIRAN]
+
+# ─── Marketplace ──────────────────────────────────────────────────────────────
+# None = "Tidak Ada" di UI
+FEE_MERCHANT_MARKETPLACE: List[Optional[int]] = [None, *range(1, 17)]
+FEE_GESTUN_MARKETPLACE:   List[Optional[int]] = [None, *range(8, 17)]
+MARKETPLACE: List[str] = ["Tokopedia", "Shopee"]
+OPSI_FEE_MERCHANT = ["Tidak Ada" if f is None else f for f in FEE_MERCHANT_MARKETPLACE]
+OPSI_FEE_GESTUN   = ["Tidak Ada" if f is None else f for f in FEE_GESTUN_MARKETPLACE]
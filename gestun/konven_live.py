@@ -0,0 +1,54 @@
+"""Aset & parameter kuotasi Konven di browser (komponen Streamlit v2).
+
+``web/konven_live.js`` memformat nominal dan menghitung kartu Gesek Kotor /
+Gesek Bersih di browser pada setiap ketikan, lalu mengirim nilai akhir ke
+server sekali saat ketikan berhenti. Modul ini hanya menyiapkan aset dan
+parameter (rate, biaya, aturan ``ATURAN_BIAYA["Konven"]``) — registrasi
+komponen ada di ``transaksi-gestun.py`` — sehingga tetap bebas Streamlit.
+
+Paritas rumus & format JS terhadap :func:`~gestun.biaya.hitung_konven` dicek
+dengan ``python tools/parity_konven_js.py`` (butuh Node.js).
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .aturan import ATURAN_BIAYA
+
+WEB        = Path(__file__).with_name("web")
+TUNDA_MS   = 600       # jeda tanpa ketikan sebelum nilai dikirim ke server
+MAKS_DIGIT = 13        # nominal < 10 triliun → gesek (≤ 100× pada rate 99%) < 2**53, eksak di JS
+
+
+@lru_cache(maxsize=None)
+def aset_konven() -> Dict[str, str]:
+    """``{"js", "css"}`` untuk ``st.components.v2.component``."""
+    return {
+        "js":  (WEB / "konven_live.js").read_text(encoding="utf-8"),
+        "css": (WEB / "konven_live.css").read_text(encoding="utf-8"),
+    }
+
+
+def param_konven(
+    nominal: str,
+    biaya_total: int,
+    rate_decimal: Optional[float] = None,
+    nominal_rate: int = 0,
+    label: str = "",
+    placeholder: str = "",
+) -> Dict[str, Any]:
+    """Data komponen; argumen rate sama seperti :func:`~gestun.biaya.hitung_konven`."""
+    return {
+        "nominal":     nominal,
+        "persen":      rate_decimal is not None,
+        "rate":        rate_decimal or 0.0,
+        "flat":        nominal_rate,
+        "biaya":       biaya_total,
+        "aturan":      ATURAN_BIAYA["Konven"],
+        "tunda_ms":    TUNDA_MS,
+        "maks_digit":  MAKS_DIGIT,
+        "label":       label,
+        "placeholder": placeholder,
+    }
@@ -0,0 +1,272 @@
+"""Buku transaksi (ledger) Input Data: setiap WhatsApp Express/Normal yang
+di-generate dicatat permanen di SQLite (WAL), dipakai bersama lintas sesi &
+proses.
+
+- **Append-only** — trigger menolak UPDATE/DELETE; koreksi dicatat sebagai
+  transaksi baru.
+- **Nomor otomatis** — ``no`` berurutan per tanggal (WIB), diambil di dalam
+  ``BEGIN IMMEDIATE`` sehingga dua sesi yang menyimpan bersamaan tidak pernah
+  mendapat nomor sama (dijamin juga oleh indeks unik ``(tanggal, no)``).
+- **Tulis batch** — :meth:`Ledger.append_many` menyimpan banyak transaksi dalam
+  satu transaksi SQLite (satu fsync). Satu WhatsApp tetap satu transaksi pendek
+  karena nomornya harus langsung tampil di teks.
+- **Indeks** pada tanggal, petugas, shift dan media (masing-masing + tanggal)
+  agar pencarian tetap cepat setelah berbulan-bulan data.
+- **Rekap inkremental** — tabel ``rekap_harian`` (tanggal × petugas × shift ×
+  media × mode) di-UPSERT dalam transaksi yang sama dengan INSERT, sehingga
+  :meth:`Ledger.rekap` membaca O(grup), bukan memindai semua transaksi.
+
+Pendapatan fee = ``jt_final − trf_final − total_biaya``; untung =
+pendapatan fee − MDR (``jt_final × mdr / 100``, MDR kosong = 0).
+"""
+from __future__ import annotations
+
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+from .db import DATA_DIR, connect
+from .waktu import hari_ini, sekarang
+
+DEFAULT_DB_PATH = DATA_DIR / "ledger_transaksi.db"
+
+# Kolom yang diisi pemanggil (selain tanggal/no/dibuat yang diisi ledger)
+KOLOM_LEDGER = (
+    "mode", "metode_transaksi", "layanan", "metode_gesek",
+    "nama", "kategori", "kelas", "media", "produk", "rate_jual",
+    "jt_final", "trf_final", "total_biaya",
+    "biaya_layanan", "biaya_baru", "biaya_transfer", "biaya_edc", "biaya_qris",
+    "mdr", "rate_untung", "petugas", "shift",
+)
+_NUMERIK = {
+    "jt_final", "trf_final", "total_biaya", "biaya_layanan", "biaya_baru",
+    "biaya_transfer", "biaya_edc", "biaya_qris", "mdr", "rate_untung",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transaksi (
+    id               INTEGER PRIMARY KEY,
+    tanggal          TEXT    NOT NULL,
+    no               INTEGER NOT NULL,
+    dibuat           TEXT    NOT NULL,
+    mode             TEXT    NOT NULL,
+    metode_transaksi TEXT    NOT NULL DEFAULT '',
+    layanan          TEXT    NOT NULL DEFAULT '',
+    metode_gesek     TEXT    NOT NULL DEFAULT '',
+    nama             TEXT    NOT NULL DEFAULT '',
+    kategori         TEXT    NOT NULL DEFAULT '',
+    kelas            TEXT    NOT NULL DEFAULT '',
+    media            TEXT    NOT NULL DEFAULT '',
+    produk           TEXT    NOT NULL DEFAULT '',
+    rate_jual        TEXT    NOT NULL DEFAULT '',
+    jt_final         REAL    NOT NULL,
+    trf_final        REAL    NOT NULL,
+    total_biaya      REAL    NOT NULL DEFAULT 0,
+    biaya_layanan    REAL    NOT NULL DEFAULT 0,
+    biaya_baru       REAL    NOT NULL DEFAULT 0,
+    biaya_transfer   REAL    NOT NULL DEFAULT 0,
+    biaya_edc        REAL    NOT NULL DEFAULT 0,
+    biaya_qris       REAL    NOT NULL DEFAULT 0,
+    mdr              REAL,
+    rate_untung      REAL,
+    petugas          TEXT    NOT NULL DEFAULT '',
+    shift            TEXT    NOT NULL DEFAULT ''
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_transaksi_tanggal_no ON transaksi (tanggal, no);
+CREATE INDEX IF NOT EXISTS idx_transaksi_petugas ON transaksi (petugas, tanggal);
+CREATE INDEX IF NOT EXISTS idx_transaksi_shift   ON transaksi (shift, tanggal);
+CREATE INDEX IF NOT EXISTS idx_transaksi_media   ON transaksi (media, tanggal);
+CREATE TRIGGER IF NOT EXISTS transaksi_tanpa_update BEFORE UPDATE ON transaksi
+BEGIN SELECT RAISE(ABORT, 'ledger transaksi append-only'); END;
+CREATE TRIGGER IF NOT EXISTS transaksi_tanpa_delete BEFORE DELETE ON transaksi
+BEGIN SELECT RAISE(ABORT, 'ledger transaksi append-only'); END;
+CREATE TABLE IF NOT EXISTS rekap_harian (
+    tanggal        TEXT    NOT NULL,
+    petugas        TEXT    NOT NULL,
+    shift          TEXT    NOT NULL,
+    media          TEXT    NOT NULL,
+    mode           TEXT    NOT NULL,
+    jumlah         INTEGER NOT NULL,
+    total_gesek    REAL    NOT NULL,
+    total_transfer REAL    NOT NULL,
+    total_fee      REAL    NOT NULL,
+    total_untung   REAL    NOT NULL,
+    PRIMARY KEY (tanggal, petugas, shift, media, mode)
+) WITHOUT ROWID;
+"""
+
+DIMENSI_REKAP = ("petugas", "shift", "media", "mode")
+NILAI_REKAP   = ("jumlah", "total_gesek", "total_transfer", "total_fee", "total_untung")
+BELUM_DIISI   = "(belum diisi)"   # label grup rekap untuk dimensi kosong
+
+_UPSERT_REKAP = (
+    f"INSERT INTO rekap_harian (tanggal, {', '.join(DIMENSI_REKAP)}, {', '.join(NILAI_REKAP)}) "
+    f"VALUES ({', '.join('?' * (1 + len(DIMENSI_REKAP) + len(NILAI_REKAP)))}) "
+    "ON CONFLICT (tanggal, petugas, shift, media, mode) DO UPDATE SET "
+    + ", ".join(f"{k} = {k} + excluded.{k}" for k in NILAI_REKAP)
+)
+# Bangun ulang dari transaksi (sekali, untuk ledger yang dibuat sebelum ada rekap)
+_REBUILD_REKAP = f"""
+INSERT INTO rekap_harian (tanggal, {', '.join(DIMENSI_REKAP)}, {', '.join(NILAI_REKAP)})
+SELECT tanggal, {', '.join(DIMENSI_REKAP)}, COUNT(*), SUM(jt_final), SUM(trf_final),
+       SUM(jt_final - trf_final - total_biaya),
+       SUM(jt_final - trf_final - total_biaya - jt_final * COALESCE(mdr, 0) / 100.0)
+FROM transaksi GROUP BY tanggal, {', '.join(DIMENSI_REKAP)}
+"""
+
+
+def _baris(record: Dict) -> tuple:
+    """Nilai kolom :data:`KOLOM_LEDGER` dari *record*; kolom hilang → default."""
+    return tuple(
+        record.get(k) if k in ("mdr", "rate_untung")
+        else float(record.get(k) or 0) if k in _NUMERIK
+        else str(record.get(k) or "")
+        for k in KOLOM_LEDGER
+    )
+
+
+def _rekap(tanggal: str, records: Sequence[Dict]) -> List[tuple]:
+    """Agregat *records* per grup rekap → baris UPSERT ``rekap_harian``."""
+    grup: Dict[tuple, List[float]] = {}
+    for r in records:
+        jt, trf = float(r.get("jt_final") or 0), float(r.get("trf_final") or 0)
+        fee     = jt - trf - float(r.get("total_biaya") or 0)
+        untung  = fee - jt * float(r.get("mdr") or 0) / 100.0
+        acc     = grup.setdefault(tuple(str(r.get(k) or "") for k in DIMENSI_REKAP), [0, 0.0, 0.0, 0.0, 0.0])
+        acc[0] += 1
+        acc[1] += jt
+        acc[2] += trf
+        acc[3] += fee
+        acc[4] += untung
+    return [(tanggal, *kunci, *acc) for kunci, acc in grup.items()]
+
+
+class Ledger:
+    """Ledger transaksi append-only, aman untuk banyak sesi/proses."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_DB_PATH) -> None:
+        self.path  = Path(path)
+        # Satu koneksi per proses, dijaga lock (seperti UsageStore)
+        self._conn = connect(self.path)
+        self._lock = threading.RLock()
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                kosong = self._conn.execute("SELECT 1 FROM rekap_harian LIMIT 1").fetchone() is None
+                if kosong:
+                    self._conn.execute(_REBUILD_REKAP)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # ── Tulis ───────────────────────────────────────────────────────────────
+    def append_many(self, records: Sequence[Dict], tanggal: Optional[str] = None) -> List[int]:
+        """Catat *records* (beserta rekapnya) dalam satu transaksi; kembalikan
+        nomor yang diberikan (berurutan, per *tanggal*, default hari ini WIB).
+        """
+        if not records:
+            return []
+        tanggal = tanggal or hari_ini()
+        dibuat  = sekarang().isoformat(timespec="seconds")
+        kolom   = ("tanggal", "no", "dibuat", *KOLOM_LEDGER)
+        sql     = f"INSERT INTO transaksi ({', '.join(kolom)}) VALUES ({', '.join('?' * len(kolom))})"
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                akhir = self._conn.execute(
+                    "SELECT COALESCE(MAX(no), 0) FROM transaksi WHERE tanggal = ?", (tanggal,)
+                ).fetchone()[0]
+                nomor = list(range(akhir + 1, akhir + 1 + len(records)))
+                self._conn.executemany(
+                    sql, [(tanggal, no, dibuat, *_baris(r)) for no, r in zip(nomor, records)]
+                )
+                self._conn.executemany(_UPSERT_REKAP, _rekap(tanggal, records))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return nomor
+
+    def append(self, record: Dict, tanggal: Optional[str] = None) -> int:
+        """Catat satu transaksi; kembalikan nomor transaksinya."""
+        return self.append_many([record], tanggal)[0]
+
+    # ── Baca ────────────────────────────────────────────────────────────────
+    def berikutnya(self, tanggal: Optional[str] = None) -> int:
+        """Perkiraan nomor berikutnya (tidak dipesan — nomor final dari :meth:`append`)."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(MAX(no), 0) + 1 FROM transaksi WHERE tanggal = ?",
+                (tanggal or hari_ini(),),
+            ).fetchone()[0]
+
+    def cari(
+        self,
+        tanggal: Optional[str] = None,
+        sampai: Optional[str] = None,
+        petugas: Optional[str] = None,
+        shift: Optional[str] = None,
+        media: Optional[str] = None,
+        limit: int = 500,
+    ) -> List[Dict]:
+        """Transaksi terbaru dulu, difilter tanggal (atau rentang *tanggal*..*sampai*),
+        petugas, shift dan/atau media.
+        """
+        syarat: List[str] = []
+        nilai:  List = []
+        if tanggal:
+            syarat.append("tanggal BETWEEN ? AND ?")
+            nilai  += [tanggal, sampai or tanggal]
+        for kolom, v in (("petugas", petugas), ("shift", shift), ("media", media)):
+            if v:
+                syarat.append(f"{kolom} = ?")
+                nilai.append(v)
+        where = f"WHERE {' AND '.join(syarat)}" if syarat else ""
+        with self._lock:
+            cur = self._conn.execute(
+                f"SELECT * FROM transaksi {where} ORDER BY tanggal DESC, no DESC LIMIT ?",
+                (*nilai, int(limit)),
+            )
+            kolom = [d[0] for d in cur.description]
+            return [dict(zip(kolom, row)) for row in cur]
+
+    def rekap(
+        self,
+        tanggal: Optional[str] = None,
+        sampai: Optional[str] = None,
+        per: Sequence[str] = DIMENSI_REKAP,
+    ) -> List[Dict]:
+        """Total per grup *per* (subset :data:`DIMENSI_REKAP`) untuk tanggal
+        *tanggal*..*sampai* (default hari ini) — dibaca dari ``rekap_harian``.
+        Tiap baris: kolom grup + ``jumlah``, ``total_gesek``, ``total_transfer``,
+        ``total_fee``, ``total_untung``.
+
+        Dimensi kosong (mis. Express yang dicatat sebelum petugas/shift ikut
+        disimpan, atau baris massal tanpa kolom itu) menjadi grup
+        :data:`BELUM_DIISI` di urutan terakhir — tidak digabung ke petugas mana pun.
+        """
+        per = [k for k in DIMENSI_REKAP if k in per]
+        tanggal = tanggal or hari_ini()
+        pilih   = ", ".join([*per, *(f"SUM({k}) AS {k}" for k in NILAI_REKAP)])
+        urut    = ", ".join(f"{k} = '', {k}" for k in per)
+        group   = f"GROUP BY {', '.join(per)} ORDER BY {urut}" if per else ""
+        with self._lock:
+            cur = self._conn.execute(
+                f"SELECT {pilih} FROM rekap_harian WHERE tanggal BETWEEN ? AND ? {group}",
+                (tanggal, sampai or tanggal),
+            )
+            kolom = [d[0] for d in cur.description]
+            hasil = [dict(zip(kolom, row)) for row in cur if row[len(per)] is not None]
+        for r in hasil:
+            for k in per:
+                r[k] = r[k] or BELUM_DIISI
+        return hasil
+
+
+@lru_cache(maxsize=None)
+def get_ledger(path: Union[str, Path] = DEFAULT_DB_PATH) -> Ledger:
+    """Satu :class:`Ledger` per proses per file (dipakai bersama semua sesi)."""
+    return Ledger(path)
@@ -0,0 +1,123 @@
+"""Solver balik Marketplace: target dana diterima → nominal checkout.
+
+Rumus maju (:func:`~gestun.biaya.hitung_marketplace`)::
+
+    diterima = n − (n × fee_merchant + n × fee_gestun + biaya)
+
+Checkout minimum untuk target ``T`` adalah gross-up metode Bersih aturan
+``"Marketplace"`` (:mod:`gestun.aturan`): ``ceil((T + biaya) / (1 − fee))``.
+Karena fee maju dihitung per komponen dalam float, hasil gross-up dicek ulang
+dengan rumus maju dan digeser ±1 Rupiah bila perlu — sehingga ``checkout``
+selalu nominal bulat terkecil dengan ``diterima ≥ T``.
+
+Semua target × marketplace × fee merchant × fee gestun dihitung dalam satu
+operasi NumPy berbentuk ``(target, marketplace, fee_merchant, fee_gestun)``.
+
+Kolom CSV target (header tidak peka huruf besar/kecil):
+
+- ``target`` — wajib, dana yang ingin diterima ("5000000" / "Rp 5.000.000").
+- ``ref``    — opsional, penanda baris (nama nasabah / no. order).
+"""
+from __future__ import annotations
+
+import csv
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from .aturan import engine
+from .konstanta import FEE_GESTUN_MARKETPLACE, FEE_MERCHANT_MARKETPLACE
+from .rupiah_vektor import parse_rupiah_kolom
+
+
+def read_target_csv(lines: Iterable[str]) -> List[Dict]:
+    """Baca CSV target menjadi ``[{"baris", "ref", "target", "error"}]``.
+    Baris tidak valid tetap dikembalikan dengan ``error`` terisi; kolom target
+    di-parse sekaligus (:func:`~gestun.rupiah_vektor.parse_rupiah_kolom`).
+    """
+    reader = csv.DictReader(lines)
+    if reader.fieldnames is None or "target" not in [f.strip().lower() for f in reader.fieldnames]:
+        raise ValueError("CSV harus memiliki kolom 'target'.")
+
+    mentah = [
+        {(k or "").strip().lower(): (v or "").strip() for k, v in raw.items()} for raw in reader
+    ]
+    targets = parse_rupiah_kolom([row.get("target", "") for row in mentah])
+    return [
+        {
+            "baris":  no,
+            "ref":    row.get("ref", ""),
+            "target": int(target),
+            "error":  "" if target > 0 else f"Target tidak valid: '{row.get('target', '')}'",
+        }
+        for no, (row, target) in enumerate(zip(mentah, targets.tolist()), start=1)
+    ]
+
+
+def _rate(opsi: Sequence[Optional[float]]) -> np.ndarray:
+    """Opsi fee persen (None = tidak ada) → array rate desimal."""
+    return np.array([0.0 if f is None else f / 100 for f in opsi], dtype=np.float64)
+
+
+def solve_checkout(
+    targets: Sequence[int],
+    biaya: Dict[str, int],
+    fee_merchant: Sequence[Optional[float]] = FEE_MERCHANT_MARKETPLACE,
+    fee_gestun: Sequence[Optional[float]] = FEE_GESTUN_MARKETPLACE,
+) -> Dict:
+    """Checkout minimum untuk setiap target dan kombinasi fee.
+
+    *biaya* = total biaya tambahan per marketplace, mis.
+    ``{"Tokopedia": 10_000, "Shopee": 0}``. Kembalikan ``{"target",
+    "marketplace", "fee_merchant", "fee_gestun", "checkout", "diterima",
+    "total_biaya"}``; tiga terakhir array berbentuk ``(T, M, F, G)``.
+    """
+    t  = np.asarray(targets, dtype=np.int64).reshape(-1, 1, 1, 1)
+    b  = np.asarray(list(biaya.values()), dtype=np.int64).reshape(1, -1, 1, 1)
+    fm = _rate(fee_merchant).reshape(1, 1, -1, 1)
+    fg = _rate(fee_gestun).reshape(1, 1, 1, -1)
+
+    mp = engine("Marketplace")
+
+    def diterima(n: np.ndarray) -> np.ndarray:
+        return mp.quote_batch(n, kotor=True, rates=(fm, fg), biaya=b)["terima"]
+
+    checkout = mp.quote_batch(t, kotor=False, rates=(fm, fg), biaya=b)["gesek"]
+    # Koreksi satu langkah terhadap rumus maju (selisih pembulatan float ≤ 1 Rp)
+    checkout = np.where(diterima(checkout) < t, checkout + 1, checkout)
+    checkout = np.where(diterima(checkout - 1) >= t, checkout - 1, checkout)
+
+    akhir = mp.quote_batch(checkout, kotor=True, rates=(fm, fg), biaya=b)
+    return {
+        "target":       t.reshape(-1),
+        "marketplace":  list(biaya),
+        "fee_merchant": list(fee_merchant),
+        "fee_gestun":   list(fee_gestun),
+        "checkout":     checkout,
+        "diterima":     akhir["terima"],
+        "total_biaya":  akhir["potongan"],
+    }
+
+
+def iter_rows(hasil: Dict, refs: Optional[Sequence[str]] = None) -> Iterator[Dict]:
+    """Ratakan hasil :func:`solve_checkout` menjadi baris tabel perbandingan
+    (satu baris per target × marketplace × fee merchant × fee gestun).
+    """
+    refs = refs if refs is not None else [""] * len(hasil["target"])
+    for i, target in enumerate(hasil["target"].tolist()):
+        for j, mp in enumerate(hasil["marketplace"]):
+            checkout = hasil["checkout"][i, j].tolist()
+            diterima = hasil["diterima"][i, j].tolist()
+            biaya    = hasil["total_biaya"][i, j].tolist()
+            for k, fm in enumerate(hasil["fee_merchant"]):
+                for g, fg in enumerate(hasil["fee_gestun"]):
+                    yield {
+                        "ref":          refs[i],
+                        "target":       target,
+                        "marketplace":  mp,
+                        "fee_merchant": fm,
+                        "fee_gestun":   fg,
+                        "checkout":     checkout[k][g],
+                        "diterima":     diterima[k][g],
+                        "total_biaya":  biaya[k][g],
+                    }
@@ -0,0 +1,56 @@
+"""Matriks kuotasi Konven tervektorisasi (NumPy).
+
+Menghitung Gesek Kotor (``k_terima``) dan Gesek Bersih (``b_transaksi``)
+untuk seluruh grid nominal × rate × layanan dalam satu panggilan lewat
+:meth:`~gestun.aturan.FeeEngine.quote_batch` aturan ``"Konven"``. Operasi
+float64 identik dengan :func:`~gestun.biaya.hitung_konven` (``np.rint`` =
+``round`` Python: half-to-even; ``np.trunc`` = ``int``), sehingga hasilnya
+sama persis dengan rumus skalar.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .aturan import engine
+from .konstanta import PRESET_RATE_KONVEN, SVCS_KONVEN
+
+
+def konven_matrix(
+    nominals: Sequence[int],
+    rates_percent: Optional[Sequence[float]] = None,
+    service_costs: Optional[Sequence[int]] = None,
+    biaya_tambahan: int = 0,
+) -> Dict[str, np.ndarray]:
+    """Grid kuotasi Konven berbentuk ``(nominal, rate, layanan)``.
+
+    *rates_percent* default semua :data:`PRESET_RATE_KONVEN`, *service_costs*
+    default biaya setiap :data:`SVCS_KONVEN`; *biaya_tambahan* = total biaya
+    tambahan yang dipilih. Kembalikan array int64 ``k_fee``, ``k_terima``,
+    ``b_transaksi``, ``total_potongan_kotor`` dan ``total_biaya_bersih``.
+    """
+    if rates_percent is None:
+        rates_percent = PRESET_RATE_KONVEN
+    if service_costs is None:
+        service_costs = [s["cost"] for s in SVCS_KONVEN]
+
+    nominal = np.asarray(nominals, dtype=np.int64)[:, None, None]
+    rate    = (np.asarray(rates_percent, dtype=np.float64) / 100.0)[None, :, None]
+    biaya   = (np.asarray(service_costs, dtype=np.int64) + int(biaya_tambahan))[None, None, :]
+
+    konven = engine("Konven")
+    kotor  = konven.quote_batch(nominal, kotor=True, rates=(rate,), biaya=biaya)
+    bersih = konven.quote_batch(nominal, kotor=False, rates=(rate,), biaya=biaya)
+
+    k_fee       = kotor["fee"]
+    k_terima    = kotor["terima"]
+    b_transaksi = bersih["gesek"]
+
+    return {
+        "k_fee":                k_fee,
+        "k_terima":             k_terima,
+        "b_transaksi":          b_transaksi,
+        "total_potongan_kotor": kotor["potongan"],
+        "total_biaya_bersih":   bersih["potongan"],
+    }
@@ -0,0 +1,230 @@
+"""Metrik runtime (counter & histogram) dalam format teks Prometheus.
+
+Murni Python dan cukup ringan untuk selalu aktif di produksi: satu
+``inc``/``observe`` = satu lock + ``bisect`` pada daftar bucket tetap. Semua
+metrik hidup di memori proses (bersama semua sesi Streamlit) dan diekspos
+lewat :func:`get_server` di ``http://127.0.0.1:9464/metrics``
+(``GESTUN_METRICS_PORT``, ``0`` = mati; ``GESTUN_METRICS_HOST``).
+
+Metrik bawaan:
+
+- ``gestun_reruns_total{menu, jenis}`` + ``gestun_rerun_duration_seconds{menu}``
+- ``gestun_quote_duration_seconds{menu}`` — kuotasi di UI (Konven, Express, …)
+- ``gestun_split_duration_seconds`` — tiap ``split_transaction_exact``
+  (``_count`` = jumlah panggilan)
+- ``gestun_capacity_rejections_total{sumber}`` — ``RuntimeError`` kapasitas
+  (split, optimasi, limit harian)
+- ``gestun_parse_rupiah_failures_total{alasan}`` — ``parse_rupiah`` → 0
+- ``gestun_whatsapp_generated_total{mode, sumber}``
+
+Worker proses lain (``gestun.batch``) punya metrik sendiri yang tidak ikut
+terekspos.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PORT_DEFAULT = 9464
+
+# Bucket detik: rerun UI (ms–detik) dan kalkulasi kuotasi/split (µs–ratusan ms)
+BUCKET_UI:     Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKET_HITUNG: Tuple[float, ...] = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 0.1)
+
+_REGISTRY: List["_Metrik"] = []
+
+
+def _esc(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label(nama: Sequence[str], nilai: Sequence[str], ekstra: str = "") -> str:
+    isi = [f'{n}="{_esc(v)}"' for n, v in zip(nama, nilai)]
+    if ekstra:
+        isi.append(ekstra)
+    return "{" + ",".join(isi) + "}" if isi else ""
+
+
+class _Metrik:
+    tipe = ""
+
+    def __init__(self, nama: str, bantuan: str, label: Sequence[str] = ()) -> None:
+        self.nama    = nama
+        self.bantuan = bantuan
+        self.label   = tuple(label)
+        self._lock   = threading.Lock()
+        self._nilai: Dict[Tuple[str, ...], object] = {}
+        _REGISTRY.append(self)
+
+    def _kunci(self, label: Sequence[str]) -> Tuple[str, ...]:
+        if len(label) != len(self.label):
+            raise ValueError(f"{self.nama}: butuh label {self.label}, dapat {tuple(label)}")
+        return tuple(label)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.nama} {self.bantuan}", f"# TYPE {self.nama} {self.tipe}"]
+
+
+class Counter(_Metrik):
+    """Counter monotonik per kombinasi label."""
+
+    tipe = "counter"
+
+    def inc(self, *label: str, n: float = 1) -> None:
+        k = self._kunci(label)
+        with self._lock:
+            self._nilai[k] = self._nilai.get(k, 0) + n
+
+    def nilai(self, *label: str) -> float:
+        return self._nilai.get(tuple(label), 0)
+
+    def render(self) -> List[str]:
+        baris = super().render()
+        with self._lock:
+            isi = sorted(self._nilai.items())
+        if not isi and not self.label:
+            isi = [((), 0)]
+        baris += [f"{self.nama}{_label(self.label, k)} {v}" for k, v in isi]
+        return baris
+
+
+class Histogram(_Metrik):
+    """Histogram bucket tetap (detik); disimpan non-kumulatif, dirender kumulatif."""
+
+    tipe = "histogram"
+
+    def __init__(
+        self, nama: str, bantuan: str, label: Sequence[str] = (), bucket: Sequence[float] = BUCKET_UI
+    ) -> None:
+        super().__init__(nama, bantuan, label)
+        self.bucket = tuple(sorted(bucket))
+
+    def observe(self, detik: float, *label: str) -> None:
+        k = self._kunci(label)
+        i = bisect_left(self.bucket, detik)
+        with self._lock:
+            s = self._nilai.get(k)
+            if s is None:
+                s = self._nilai[k] = [[0] * (len(self.bucket) + 1), 0.0]
+            s[0][i] += 1
+            s[1]    += detik
+
+    @contextmanager
+    def time(self, *label: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, *label)
+
+    def diamati(self, *label: str):
+        """Dekorator: amati durasi setiap panggilan fungsi."""
+        def dekor(fn):
+            @wraps(fn)
+            def jalan(*args, **kwargs):
+                t0 = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - t0, *label)
+            return jalan
+        return dekor
+
+    def jumlah(self, *label: str) -> int:
+        s = self._nilai.get(tuple(label))
+        return sum(s[0]) if s else 0
+
+    def render(self) -> List[str]:
+        baris = super().render()
+        with self._lock:
+            isi = sorted((k, (list(s[0]), s[1])) for k, s in self._nilai.items())
+        if not isi and not self.label:
+            isi = [((), ([0] * (len(self.bucket) + 1), 0.0))]
+        for k, (hitung, total) in isi:
+            kum = 0
+            for batas, c in zip((*self.bucket, "+Inf"), hitung):
+                kum += c
+                le  = batas if batas == "+Inf" else repr(float(batas))
+                lbl = _label(self.label, k, f'le="{le}"')
+                baris.append(f"{self.nama}_bucket{lbl} {kum}")
+            baris.append(f"{self.nama}_sum{_label(self.label, k)} {total!r}")
+            baris.append(f"{self.nama}_count{_label(self.label, k)} {kum}")
+        return baris
+
+
+def render() -> str:
+    """Semua metrik dalam format teks Prometheus (exposition 0.0.4)."""
+    return "\n".join(b for m in _REGISTRY for b in m.render()) + "\n"
+
+
+# ─── Metrik bawaan ────────────────────────────────────────────────────────────
+RERUN = Counter(
+    "gestun_reruns_total", "Eksekusi menu UI (rerun penuh atau fragment).", ("menu", "jenis")
+)
+RERUN_DETIK = Histogram(
+    "gestun_rerun_duration_seconds", "Durasi eksekusi menu UI.", ("menu",)
+)
+QUOTE_DETIK = Histogram(
+    "gestun_quote_duration_seconds", "Durasi kuotasi biaya di UI.", ("menu",), bucket=BUCKET_HITUNG
+)
+SPLIT_DETIK = Histogram(
+    "gestun_split_duration_seconds", "Durasi split_transaction_exact.", bucket=BUCKET_HITUNG
+)
+KAPASITAS_DITOLAK = Counter(
+    "gestun_capacity_rejections_total", "RuntimeError karena kapasitas/limit mesin.", ("sumber",)
+)
+PARSE_GAGAL = Counter(
+    "gestun_parse_rupiah_failures_total", "parse_rupiah yang mengembalikan 0.", ("alasan",)
+)
+WHATSAPP = Counter(
+    "gestun_whatsapp_generated_total", "Pesan WhatsApp yang di-generate.", ("mode", "sumber")
+)
+
+
+# ─── Endpoint HTTP ────────────────────────────────────────────────────────────
+
+def start_server(port: int = PORT_DEFAULT, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+    """Jalankan endpoint ``/metrics`` di thread daemon; kembalikan server-nya."""
+    # Di-import di sini: http.server mahal dan inti cukup mencatat metrik
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="gestun-metrik", daemon=True).start()
+    return server
+
+
+@lru_cache(maxsize=None)
+def get_server() -> Optional["ThreadingHTTPServer"]:
+    """Endpoint metrik bersama (sekali per proses). None jika dimatikan atau port terpakai."""
+    port = int(os.environ.get("GESTUN_METRICS_PORT", PORT_DEFAULT) or 0)
+    if not port:
+        return None
+    try:
+        return start_server(port, os.environ.get("GESTUN_METRICS_HOST", "127.0.0.1"))
+    except OSError:
+        return None
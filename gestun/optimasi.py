@@ -0,0 +1,169 @@
+"""Perencana split EDC berbiaya MDR minimum dengan batas gesek per mesin.
+
+Setiap mesin punya limit per gesek, jumlah gesek maksimum sendiri, dan rate
+MDR (BRI, BNI, BCA berbeda). Tujuan leksikografis:
+
+1. jumlah gesek sesedikit mungkin (K minimum), lalu
+2. total biaya MDR serendah mungkin untuk K tersebut.
+
+Dengan jumlah gesek per mesin ``n_j`` tetap, biaya minimum didapat dengan
+mengisi mesin ber-MDR termurah lebih dulu. Solver-nya DP eksak atas mesin
+terurut MDR dengan state ``(gesek terpakai, nominal terisi)`` yang dipangkas ke
+frontier Pareto (terisi lebih besar & biaya lebih kecil mendominasi) plus
+pemangkasan kapasitas (sisa slot terbesar harus masih bisa menutup total).
+Biaya dihitung dalam basis poin sehingga perbandingan eksak (tanpa float).
+"""
+from __future__ import annotations
+
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .alokasi import _make_non_round
+from .metrik import KAPASITAS_DITOLAK
+from .rupiah import format_rupiah_rp
+from .split import RNG, SAFETY_GAP, _water_fill
+
+# (nama, limit per gesek, maks gesek, MDR %)
+MesinMDR = Tuple[str, int, int, float]
+
+
+def _bp(mdr_percent: float) -> int:
+    """MDR persen → basis poin (0,7% → 70)."""
+    return int(round(mdr_percent * 100))
+
+
+def _biaya(plan: List[Dict], bp: Dict[str, int]) -> float:
+    """Total biaya MDR (Rp) sebuah rencana."""
+    return sum(p["amount"] * bp[p["machine"]] for p in plan) / 10_000
+
+
+def _round_robin(per_mesin: List[Tuple[str, List[int]]]) -> List[Dict]:
+    """Susun gesek per mesin menjadi urutan A → B → C → A → B → …"""
+    plan: List[Dict] = []
+    putaran = max((len(a) for _, a in per_mesin), default=0)
+    for r in range(putaran):
+        for name, amounts in per_mesin:
+            if r < len(amounts):
+                plan.append({"machine": name, "amount": amounts[r]})
+    return plan
+
+
+def greedy_round_robin(total: int, machines: Sequence[MesinMDR]) -> List[Dict]:
+    """Pembanding: putaran round-robin minimum + water-filling (tanpa melihat MDR),
+    seperti :func:`~gestun.split.split_transaction_exact` tanpa variasi acak.
+    """
+    caps    = [(name, limit - SAFETY_GAP, maks) for name, limit, maks, _ in machines]
+    caps.sort(key=lambda x: -x[1])
+    putaran = max((maks for _, _, maks in caps), default=0)
+    for r in range(1, putaran + 1):
+        slots = [(name, cap) for i in range(r) for name, cap, maks in caps if i < maks]
+        if sum(cap for _, cap in slots) >= total:
+            break
+    targets = _water_fill(total, slots)
+    return [{"machine": name, "amount": amt} for (name, _), amt in zip(slots, targets) if amt > 0]
+
+
+def optimize_split(
+    total: int,
+    machines: Sequence[MesinMDR],
+    seed: Optional[int] = None,
+    rng: Optional[random.Random] = None,
+) -> Dict:
+    """Rencana dengan gesek paling sedikit lalu biaya MDR terendah (DP eksak).
+
+    Kembalikan ``{"plan", "jumlah_gesek", "biaya_mdr", "greedy": {...},
+    "selisih_gesek", "selisih_biaya"}``. RuntimeError jika kapasitas kurang.
+    """
+    if rng is None:
+        rng = RNG if seed is None else random.Random(seed)
+
+    mesin = [
+        (name, limit - SAFETY_GAP, int(maks), _bp(mdr))
+        for name, limit, maks, mdr in machines
+        if limit > SAFETY_GAP and maks > 0
+    ]
+    bp      = {name: _bp(mdr) for name, _, _, mdr in machines}
+    cap_map = {name: cap for name, cap, _, _ in mesin}
+
+    # ── K minimum: slot terbesar lebih dulu ─────────────────────────────────
+    slot_caps = sorted((cap for _, cap, maks, _ in mesin for _ in range(maks)), reverse=True)
+    if sum(slot_caps) < total:
+        KAPASITAS_DITOLAK.inc("optimasi")
+        raise RuntimeError(
+            f"Total transaksi {format_rupiah_rp(total)} melebihi kapasitas semua mesin "
+            f"({format_rupiah_rp(sum(slot_caps))})."
+        )
+    K, terisi = 0, 0
+    while terisi < total:
+        terisi += slot_caps[K]
+        K      += 1
+
+    # ── DP atas mesin terurut MDR (termurah dulu, seri → cap terbesar) ──────
+    mesin.sort(key=lambda m: (m[3], -m[1]))
+    n_mesin = len(mesin)
+    # sisa_terbaik[j][s] = kapasitas maks s slot dari mesin j.. (untuk pemangkasan)
+    sisa_terbaik: List[List[int]] = []
+    for j in range(n_mesin + 1):
+        caps = sorted((cap for _, cap, maks, _ in mesin[j:] for _ in range(maks)), reverse=True)
+        pref = [0]
+        for c in caps[:K]:
+            pref.append(pref[-1] + c)
+        pref += [pref[-1]] * (K + 1 - len(pref))
+        sisa_terbaik.append(pref)
+
+    # state per k: list (terisi, biaya_bp, pilihan n per mesin)
+    frontier: Dict[int, List[Tuple[int, int, Tuple[int, ...]]]] = {0: [(0, 0, ())]}
+    for j, (_, cap, maks, b) in enumerate(mesin):
+        baru: Dict[int, List[Tuple[int, int, Tuple[int, ...]]]] = {}
+        for k, states in frontier.items():
+            for f, cost, pilihan in states:
+                for n in range(0, min(maks, K - k) + 1):
+                    if n and f >= total:
+                        break                      # gesek tambahan bernominal 0
+                    f2 = min(total, f + n * cap)
+                    k2 = k + n
+                    if f2 + sisa_terbaik[j + 1][K - k2] < total:
+                        continue                   # tak mungkin menutup total
+                    baru.setdefault(k2, []).append((f2, cost + (f2 - f) * b, pilihan + (n,)))
+        # Pangkas ke frontier Pareto per k: terisi ↑, biaya ↓
+        frontier = {}
+        for k, states in baru.items():
+            states.sort(key=lambda s: (-s[0], s[1]))
+            kept, best = [], None
+            for s in states:
+                if best is None or s[1] < best:
+                    kept.append(s)
+                    best = s[1]
+            frontier[k] = kept
+
+    akhir = [s for s in frontier.get(K, []) if s[0] == total]
+    _, _, pilihan = min(akhir, key=lambda s: s[1])
+
+    # ── Nominal per gesek: isi termurah dulu, bagi rata dalam satu mesin ────
+    per_mesin: List[Tuple[str, List[int]]] = []
+    sisa = total
+    for (name, cap, _, _), n in zip(mesin, pilihan):
+        if not n:
+            continue
+        jatah = min(sisa, n * cap)
+        sisa -= jatah
+        per_mesin.append((name, _water_fill(jatah, [(name, cap)] * n)))
+    per_mesin.sort(key=lambda x: -cap_map[x[0]])      # urutan limit terbesar, seperti split biasa
+    plan = _round_robin(per_mesin)
+
+    amounts = [p["amount"] for p in plan]
+    _make_non_round(amounts, [cap_map[p["machine"]] for p in plan], rng)
+    for p, amt in zip(plan, amounts):
+        p["amount"] = amt
+
+    greedy       = greedy_round_robin(total, machines)
+    biaya_opt    = _biaya(plan, bp)
+    biaya_greedy = _biaya(greedy, bp)
+    return {
+        "plan":          plan,
+        "jumlah_gesek":  len(plan),
+        "biaya_mdr":     biaya_opt,
+        "greedy":        {"plan": greedy, "jumlah_gesek": len(greedy), "biaya_mdr": biaya_greedy},
+        "selisih_gesek": len(greedy) - len(plan),
+        "selisih_biaya": biaya_greedy - biaya_opt,
+    }
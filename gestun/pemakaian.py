@@ -0,0 +1,218 @@
+"""Pencatat pemakaian harian mesin EDC, dipakai bersama lintas sesi & proses.
+
+Disimpan di SQLite (WAL) sehingga beberapa worker Streamlit berbagi data yang
+sama. Setiap gesek yang di-commit masuk log ``gesek`` dan sekaligus menaikkan
+agregat ``pemakaian_harian`` (UPSERT dalam satu transaksi pendek).
+
+Pembacaan sisa limit O(1): setiap proses menyimpan snapshot agregat hari ini
+di dict dan hanya memuat ulang saat ``PRAGMA data_version`` berubah (ada
+commit dari koneksi lain).
+"""
+from __future__ import annotations
+
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .db import DATA_DIR, connect
+from .konstanta import MEDIA_PENCAIRAN
+from .metrik import KAPASITAS_DITOLAK
+from .rupiah import format_rupiah_rp
+from .split import SAFETY_GAP
+from .waktu import hari_ini, sekarang
+
+DEFAULT_DB_PATH = DATA_DIR / "pemakaian_mesin.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS gesek (
+    id       INTEGER PRIMARY KEY,
+    tanggal  TEXT    NOT NULL,
+    machine  TEXT    NOT NULL,
+    amount   INTEGER NOT NULL,
+    ref      TEXT    NOT NULL DEFAULT '',
+    dibuat   TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_gesek_tanggal_machine ON gesek (tanggal, machine);
+CREATE TABLE IF NOT EXISTS pemakaian_harian (
+    tanggal      TEXT    NOT NULL,
+    machine      TEXT    NOT NULL,
+    terpakai     INTEGER NOT NULL,
+    jumlah_gesek INTEGER NOT NULL,
+    PRIMARY KEY (tanggal, machine)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS limit_mesin (
+    machine      TEXT PRIMARY KEY,
+    limit_harian INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS media_pencairan (
+    media TEXT    PRIMARY KEY,
+    mdr   REAL,
+    maks  INTEGER,
+    aktif INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class UsageStore:
+    """Pemakaian harian per mesin + limit harian, aman untuk banyak sesi/proses."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_DB_PATH) -> None:
+        self.path  = Path(path)
+        # Satu koneksi per proses, dijaga lock (transaksi pendek → sesi lain tidak tertahan)
+        self._conn = connect(self.path)
+        self._lock = threading.RLock()
+        # Snapshot proses: (tanggal, data_version) → {machine: terpakai}, {machine: limit}
+        self._snap_key: Optional[Tuple[str, int]] = None
+        self._terpakai: Dict[str, int] = {}
+        self._limit:    Dict[str, int] = {}
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+
+    def _refresh(self, tanggal: str) -> None:
+        with self._lock:
+            # data_version berubah hanya jika koneksi LAIN commit; commit sendiri
+            # me-reset _snap_key secara eksplisit.
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if (tanggal, version) == self._snap_key:
+                return
+            self._terpakai = dict(self._conn.execute(
+                "SELECT machine, terpakai FROM pemakaian_harian WHERE tanggal = ?", (tanggal,)
+            ))
+            self._limit    = dict(self._conn.execute("SELECT machine, limit_harian FROM limit_mesin"))
+            self._snap_key = (tanggal, version)
+
+    def _write(self, statements) -> None:
+        """Jalankan *statements(conn)* dalam BEGIN IMMEDIATE … COMMIT."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                statements(self._conn)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            finally:
+                self._snap_key = None
+
+    # ── Baca ────────────────────────────────────────────────────────────────
+    def terpakai(self, machine: str, tanggal: Optional[str] = None) -> int:
+        self._refresh(tanggal or hari_ini())
+        return self._terpakai.get(machine, 0)
+
+    def limit_harian(self, machine: str) -> Optional[int]:
+        self._refresh(hari_ini())
+        return self._limit.get(machine)
+
+    def sisa(self, machine: str, tanggal: Optional[str] = None) -> Optional[int]:
+        """Sisa limit harian (O(1) dari snapshot), atau None jika mesin tanpa limit harian."""
+        self._refresh(tanggal or hari_ini())
+        limit = self._limit.get(machine)
+        return None if limit is None else limit - self._terpakai.get(machine, 0)
+
+    def snapshot(self, tanggal: Optional[str] = None) -> Dict[str, int]:
+        """Salinan ``{machine: terpakai}`` untuk *tanggal* (default hari ini)."""
+        self._refresh(tanggal or hari_ini())
+        return dict(self._terpakai)
+
+    def media(self, dasar: Sequence[Dict] = MEDIA_PENCAIRAN) -> List[Dict]:
+        """Tabel media *dasar* dengan MDR / maks / aktif yang tersimpan (None jika belum diisi)."""
+        with self._lock:
+            simpan = {
+                media: {"mdr": mdr, "maks": maks, "aktif": bool(aktif)}
+                for media, mdr, maks, aktif in self._conn.execute(
+                    "SELECT media, mdr, maks, aktif FROM media_pencairan"
+                )
+            }
+        return [{**m, **simpan.get(m["media"], {})} for m in dasar]
+
+    # ── Tulis ───────────────────────────────────────────────────────────────
+    def set_limit_harian(self, limits: Iterable[Tuple[str, int]]) -> None:
+        rows = [(m, int(v)) for m, v in limits]
+        self._write(lambda conn: conn.executemany(
+            "INSERT INTO limit_mesin (machine, limit_harian) VALUES (?, ?) "
+            "ON CONFLICT (machine) DO UPDATE SET limit_harian = excluded.limit_harian",
+            rows,
+        ))
+
+    def set_media(self, rows: Iterable[Dict]) -> None:
+        """Simpan MDR (%) / maks / aktif per media ``{"media", "mdr", "maks", "aktif"}``."""
+        data = [
+            (r["media"], None if r.get("mdr") is None else float(r["mdr"]),
+             None if r.get("maks") is None else int(r["maks"]), int(bool(r.get("aktif", True))))
+            for r in rows
+        ]
+        self._write(lambda conn: conn.executemany(
+            "INSERT INTO media_pencairan (media, mdr, maks, aktif) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (media) DO UPDATE SET "
+            "mdr = excluded.mdr, maks = excluded.maks, aktif = excluded.aktif",
+            data,
+        ))
+
+    def record_swipes(
+        self,
+        plan: List[Dict],
+        ref: str = "",
+        tanggal: Optional[str] = None,
+        strict: bool = True,
+    ) -> None:
+        """Catat gesek *plan* ``[{"machine", "amount"}, …]`` secara atomik.
+        *strict*: tolak (RuntimeError) jika ada mesin yang melewati limit hariannya —
+        dicek di dalam transaksi sehingga commit bersamaan tidak bisa overbook.
+        """
+        tanggal = tanggal or hari_ini()
+        dibuat  = sekarang().isoformat(timespec="seconds")
+        per_mesin: Dict[str, List[int]] = {}
+        for p in plan:
+            per_mesin.setdefault(p["machine"], []).append(int(p["amount"]))
+
+        def _statements(conn) -> None:
+            if strict:
+                for machine, amounts in per_mesin.items():
+                    row = conn.execute(
+                        "SELECT l.limit_harian, COALESCE(h.terpakai, 0) FROM limit_mesin l "
+                        "LEFT JOIN pemakaian_harian h ON h.machine = l.machine AND h.tanggal = ? "
+                        "WHERE l.machine = ?",
+                        (tanggal, machine),
+                    ).fetchone()
+                    if row and row[1] + sum(amounts) > row[0]:
+                        KAPASITAS_DITOLAK.inc("limit_harian")
+                        raise RuntimeError(
+                            f"{machine}: sisa limit harian {format_rupiah_rp(row[0] - row[1])}, "
+                            f"rencana membutuhkan {format_rupiah_rp(sum(amounts))}."
+                        )
+            conn.executemany(
+                "INSERT INTO gesek (tanggal, machine, amount, ref, dibuat) VALUES (?, ?, ?, ?, ?)",
+                [(tanggal, p["machine"], int(p["amount"]), ref, dibuat) for p in plan],
+            )
+            conn.executemany(
+                "INSERT INTO pemakaian_harian (tanggal, machine, terpakai, jumlah_gesek) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (tanggal, machine) DO UPDATE SET "
+                "terpakai = terpakai + excluded.terpakai, jumlah_gesek = jumlah_gesek + excluded.jumlah_gesek",
+                [(tanggal, m, sum(a), len(a)) for m, a in per_mesin.items()],
+            )
+
+        self._write(_statements)
+
+    # ── Integrasi dengan split ─────────────────────────────────────────────
+    def limit_efektif(
+        self, machines: List[Tuple[str, int]], max_swipes: int = 2
+    ) -> List[Tuple[str, int]]:
+        """Limit per gesek yang memperhitungkan sisa harian: ``max_swipes`` gesek
+        penuh pada limit efektif tidak akan melewati sisa limit harian mesin.
+        Mesin yang sudah habis dikeluarkan; mesin tanpa limit harian tidak berubah.
+        """
+        hasil: List[Tuple[str, int]] = []
+        for name, limit in machines:
+            sisa = self.sisa(name)
+            if sisa is not None:
+                limit = min(limit, sisa // max(1, max_swipes) + SAFETY_GAP)
+            if limit > SAFETY_GAP:
+                hasil.append((name, limit))
+        return hasil
+
+
+@lru_cache(maxsize=None)
+def get_store(path: Union[str, Path] = DEFAULT_DB_PATH) -> UsageStore:
+    """Satu :class:`UsageStore` per proses per file (dipakai bersama semua sesi)."""
+    return UsageStore(path)
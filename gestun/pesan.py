@@ -0,0 +1,345 @@
+"""Template pesan WhatsApp Input Data (Express & Normal) dan generator massal.
+
+Template dipakai bersama oleh form Streamlit dan mode massal sehingga teksnya
+selalu identik. Mode massal membaca CSV / XLSX baris demi baris, memvalidasi,
+menghitung dengan rumus yang sama (:func:`~gestun.biaya.hitung_express` /
+:func:`~gestun.biaya.hitung_normal`), mencatat ke ledger per chunk
+(:meth:`~gestun.ledger.Ledger.append_many` — satu transaksi SQLite per chunk)
+lalu menulis pesan ke file .txt / .zip secara bertahap. Memori tetap datar:
+paling banyak satu chunk baris yang ditahan.
+
+Kolom file (header tidak peka huruf besar/kecil):
+
+- ``mode``             — wajib, ``Express`` / ``Normal``.
+- ``nominal``          — wajib, jumlah gesek (Kotor) atau jumlah transfer (Bersih).
+- ``rate``             — ``"3.5%"`` (persentase, < 100%) atau ``"50000"`` / ``"Rp 50.000"``
+  (flat, minimal Rp 1.000). Angka desimal tanpa ``%`` (``"3.5"``) ditolak.
+- ``metode``           — ``Kotor`` (default) / ``Bersih``.
+- ``nama``, ``kategori`` (``Langganan`` / ``Baru``), ``kelas``, ``metode_transaksi``
+  (``Konven`` / ``Online``).
+- ``layanan``          — Express: ``Member`` / ``Non Member`` (default).
+- ``biaya_transfer``, ``biaya_edc``, ``biaya_qris`` — Rupiah, default 0.
+- ``media``, ``produk``, ``mdr`` (%), ``petugas``, ``shift`` — mode Normal.
+
+    python -m gestun.pesan transaksi.csv -o pesan.zip
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import re
+import sys
+import zipfile
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import IO, Dict, Iterable, Iterator, List, Optional
+
+from .biaya import hitung_express, hitung_normal, hitung_rate_untung
+from .konstanta import BIAYA_NASABAH_BARU, SLA_MENIT, SVCS_INPUT
+from .metrik import WHATSAPP
+from .rupiah import format_rupiah, parse_rupiah
+from .waktu import sekarang
+
+CHUNK         = 500      # baris per chunk (satu transaksi ledger per chunk)
+DURASI        = {mode: timedelta(minutes=m) for mode, m in SLA_MENIT.items()}
+KATEGORI      = ("Langganan", "Baru")
+METODE_TRX    = ("Konven", "Online")
+SVC_EXPRESS   = {"member": SVCS_INPUT[1], "non member": SVCS_INPUT[2]}
+SVC_NORMAL    = SVCS_INPUT[0]
+_RE_PERSEN    = re.compile(r"^\s*(\d+(?:[.,]\d+)?)\s*%\s*$")
+_RE_DESIMAL   = re.compile(r"^\s*\d+[.,]\d{1,2}\s*$")   # "3.5" → persen tanpa "%"?
+RATE_FLAT_MIN = 1_000    # rate flat di bawah ini hampir pasti persen yang lupa "%"
+KOLOM_WAJIB   = ("mode", "nominal")
+KOLOM_LEBIH   = "_lebih"   # sel di luar header (CSV restkey) → baris ditolak
+
+
+# ─── Template ─────────────────────────────────────────────────────────────────
+
+def teks_express(no: int, rec: Dict, waktu_selesai: str) -> str:
+    """Pesan WhatsApp Express untuk *rec* (record ledger) bernomor *no*."""
+    return (
+        f"*TRANSAKSI NO. {no} ({rec['metode_transaksi'].upper()})*\n"
+        f"*EXPRESS*\n\n"
+        f"• Nama Nasabah: *{rec['nama']}*\n"
+        f"• Kategori Nasabah: *{rec['kategori']}*\n"
+        f"• Kelas Nasabah: *{rec['kelas']}*\n"
+        f"• Rate Jual: *{rec['rate_jual']}*\n"
+        f"• Jumlah Transfer: *{format_rupiah(rec['trf_final'])}*\n"
+        f"_______________________________\n"
+        f"Estimasi Selesai: {waktu_selesai}"
+    )
+
+def teks_normal(no: int, rec: Dict, waktu_selesai: str, rate_untung: str) -> str:
+    """Pesan WhatsApp Normal 3 Jam; *rate_untung* = teks Rate Untung siap tampil."""
+    return (
+        f"*TRANSAKSI NO. {no} ({rec['metode_transaksi'].upper()})*\n"
+        f"_______________________________\n"
+        f"• Nama Nasabah: {rec['nama']}\n"
+        f"• Kategori Nasabah: {rec['kategori']} ({rec['kelas']})\n"
+        f"• Jenis Media Pencairan: {rec['media']}\n"
+        f"• Produk: {rec['produk']}\n"
+        f"• Rate Jual: {rec['rate_jual']}\n"
+        f"• Rate Untung: {rate_untung}\n"
+        f"• Nominal Transaksi: *{format_rupiah(rec['jt_final'])}*\n"
+        f"• Biaya Nasabah Baru: Rp. {int(rec['biaya_baru']):,}\n"
+        f"• Biaya Transfer Selain BCA: Rp. {int(rec['biaya_transfer']):,}\n"
+        f"• Biaya Transaksi di Mesin EDC: Rp. {int(rec['biaya_edc']):,}\n"
+        f"• Biaya Layanan QRIS By WhatsApp: Rp. {int(rec['biaya_qris']):,}\n"
+        f"_______________________________\n"
+        f"Jumlah Transfer: *{format_rupiah(rec['trf_final'])}*\n"
+        f"🕓 Estimasi Selesai: {waktu_selesai}\n\n"
+        f"Petugas: {rec['petugas']} ({rec['shift']})"
+    )
+
+def rate_untung_tampil(nilai: float, persen: bool) -> str:
+    return f"{nilai:.2f}%" if persen else format_rupiah(nilai)
+
+
+# ─── Baca file ────────────────────────────────────────────────────────────────
+
+def _cek_header(header: Iterable[str]) -> None:
+    kurang = [k for k in KOLOM_WAJIB if k not in header]
+    if kurang:
+        raise ValueError(f"File harus memiliki kolom: {', '.join(kurang)}.")
+
+def read_rows(fileobj: IO[bytes], nama_file: str) -> Iterator[Dict[str, str]]:
+    """Baris CSV / XLSX sebagai dict ``{header_kecil: teks}``, dibaca bertahap."""
+    if nama_file.lower().endswith((".xlsx", ".xlsm")):
+        try:
+            from openpyxl import load_workbook
+        except ImportError as e:   # dependensi opsional, hanya untuk XLSX
+            raise ValueError("Membaca XLSX membutuhkan paket 'openpyxl' (pip install openpyxl).") from e
+        wb   = load_workbook(fileobj, read_only=True, data_only=True)
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(h or "").strip().lower() for h in next(rows, ())]
+        try:
+            _cek_header(header)
+            for values in rows:
+                if any(v is not None and str(v).strip() for v in values):
+                    yield {h: "" if v is None else str(v).strip() for h, v in zip(header, values)}
+        finally:
+            wb.close()
+        return
+
+    teks   = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(teks, restkey=KOLOM_LEBIH)
+    _cek_header([(f or "").strip().lower() for f in reader.fieldnames or ()])
+    for raw in reader:
+        lebih = raw.pop(KOLOM_LEBIH, None)
+        row   = {(k or "").strip().lower(): (v or "").strip() for k, v in raw.items()}
+        if lebih is not None:
+            row[KOLOM_LEBIH] = str(len(lebih))
+        yield row
+
+
+# ─── Validasi & hitung ────────────────────────────────────────────────────────
+
+def _pilih(row: Dict[str, str], kolom: str, opsi: Iterable[str], default: str) -> str:
+    nilai = row.get(kolom) or default
+    for o in opsi:
+        if nilai.lower() == o.lower():
+            return o
+    raise ValueError(f"{kolom} tidak valid: '{nilai}' (pilihan: {', '.join(opsi)})")
+
+def _rupiah(row: Dict[str, str], kolom: str) -> float:
+    return float(parse_rupiah(row.get(kolom, "")))
+
+def parse_row(row: Dict[str, str]) -> Dict:
+    """Validasi + hitung satu baris → record ledger (plus ``_persen``: jenis rate).
+    ValueError berisi alasan jika baris tidak valid.
+    """
+    if row.get(KOLOM_LEBIH):
+        raise ValueError(f"jumlah kolom melebihi header ({row[KOLOM_LEBIH]} sel lebih; cek koma di akhir baris)")
+    mode    = _pilih(row, "mode", ("Express", "Normal"), "")
+    kotor   = _pilih(row, "metode", ("Kotor", "Bersih"), "Kotor") == "Kotor"
+    nominal = _rupiah(row, "nominal")
+    if nominal <= 0:
+        raise ValueError(f"nominal tidak valid: '{row.get('nominal', '')}'")
+
+    rate_txt = row.get("rate", "")
+    m        = _RE_PERSEN.match(rate_txt)
+    persen   = m is not None or not rate_txt
+    rate_pct = float(m.group(1).replace(",", ".")) if m else 0.0
+    flat     = 0.0 if persen else _rupiah(row, "rate")
+    if not persen and (flat < RATE_FLAT_MIN or _RE_DESIMAL.match(rate_txt)):
+        raise ValueError(
+            f"rate tidak valid: '{rate_txt}' (contoh: 3.5% atau 50000; "
+            f"rate flat minimal {format_rupiah(RATE_FLAT_MIN)})"
+        )
+    if rate_pct >= 100:   # Bersih: gesek = (nominal + biaya) / (1 - rate) → tak terhingga
+        raise ValueError(f"rate tidak valid: '{rate_txt}' (harus di bawah 100%)")
+
+    kategori = _pilih(row, "kategori", KATEGORI, "Langganan")
+    rec = {
+        "mode":             mode,
+        "metode_transaksi": _pilih(row, "metode_transaksi", METODE_TRX, "Konven"),
+        "metode_gesek":     "Kotor" if kotor else "Bersih",
+        "nama":             row.get("nama", ""),
+        "kategori":         kategori,
+        "kelas":            row.get("kelas") or "Non Member",
+        "rate_jual":        f"{rate_pct:.2f}%" if persen else format_rupiah(flat),
+        "biaya_baru":       BIAYA_NASABAH_BARU if kategori == "Baru" else 0.0,
+        "biaya_transfer":   _rupiah(row, "biaya_transfer"),
+        "biaya_edc":        _rupiah(row, "biaya_edc"),
+        "biaya_qris":       _rupiah(row, "biaya_qris"),
+        "petugas":          row.get("petugas", ""),
+        "shift":            row.get("shift", ""),
+        "_persen":          persen,
+    }
+    biaya = rec["biaya_transfer"] + rec["biaya_edc"] + rec["biaya_qris"] + rec["biaya_baru"]
+
+    if mode == "Express":
+        svc = SVC_EXPRESS[_pilih(row, "layanan", ("Member", "Non Member"), "Non Member").lower()]
+        rec.update(layanan=svc["label_ui"], biaya_layanan=svc["cost"], total_biaya=biaya + svc["cost"])
+        hasil = hitung_express(
+            nominal, rec["total_biaya"], kotor=kotor,
+            fee_decimal=rate_pct / 100.0, fee_flat=flat, persen=persen,
+        )
+    else:
+        mdr = float((row.get("mdr") or "0").replace(",", ".").rstrip("%") or 0)
+        rec.update(
+            layanan=SVC_NORMAL["label_ui"], biaya_layanan=SVC_NORMAL["cost"], total_biaya=biaya,
+            media=row.get("media", ""), produk=row.get("produk", ""), mdr=mdr,
+        )
+        hasil = hitung_normal(
+            nominal, biaya, kotor=kotor,
+            rate_decimal=rate_pct / 100.0, rt_nom=flat, persen=persen,
+        )
+        rec["rate_untung"] = hitung_rate_untung(
+            hasil["jt_final"], mdr, rt_val=rate_pct, rt_nom=flat, persen=persen
+        )
+    if hasil["jt_final"] <= 0 or hasil["trf_final"] <= 0:
+        raise ValueError(
+            f"biaya melebihi nominal: gesek {format_rupiah(hasil['jt_final'])}, "
+            f"transfer {format_rupiah(hasil['trf_final'])}"
+        )
+    rec["jt_final"], rec["trf_final"] = hasil["jt_final"], hasil["trf_final"]
+    return rec
+
+
+# ─── Generator massal ─────────────────────────────────────────────────────────
+
+def iter_messages(
+    rows: Iterable[Dict[str, str]],
+    ledger=None,
+    chunk: int = CHUNK,
+    waktu: Optional[datetime] = None,
+) -> Iterator[Dict]:
+    """Hasil per baris ``{"baris", "no", "mode", "nama", "nominal", "teks", "error"}``,
+    berurutan (``nominal`` = transfer ke nasabah).
+
+    Baris valid dicatat ke *ledger* per chunk (nomor dari ledger); tanpa ledger
+    nomor = urutan baris valid. Baris tidak valid: ``teks`` kosong, ``error`` terisi.
+    """
+    waktu = waktu or sekarang()
+    rows  = iter(rows)
+    baris = 0
+    urut  = 0
+    while True:
+        blok = list(islice(rows, chunk))
+        if not blok:
+            return
+        hasil: List[Dict] = []
+        valid: List[Dict] = []
+        for row in blok:
+            baris += 1
+            try:
+                rec = parse_row(row)
+            except (ValueError, ArithmeticError) as e:   # satu baris buruk tidak menghentikan file
+                hasil.append({
+                    "baris": baris, "no": None, "mode": row.get("mode", ""), "nama": row.get("nama", ""),
+                    "nominal": 0.0, "teks": "", "error": str(e),
+                })
+                continue
+            hasil.append({"baris": baris, "rec": rec})
+            valid.append(rec)
+
+        if ledger is not None:
+            nomor = iter(ledger.append_many(valid))
+        else:
+            nomor = iter(range(urut + 1, urut + 1 + len(valid)))
+            urut += len(valid)
+
+        for h in hasil:
+            rec = h.pop("rec", None)
+            if rec is None:
+                yield h
+                continue
+            no      = next(nomor)
+            selesai = (waktu + DURASI[rec["mode"]]).strftime("%H:%M WIB")
+            teks    = (
+                teks_express(no, rec, selesai) if rec["mode"] == "Express"
+                else teks_normal(no, rec, selesai, rate_untung_tampil(rec["rate_untung"], rec["_persen"]))
+            )
+            WHATSAPP.inc(rec["mode"], "massal")
+            yield {
+                "baris": h["baris"], "no": no, "mode": rec["mode"], "nama": rec["nama"],
+                "nominal": rec["trf_final"], "teks": teks, "error": "",
+            }
+
+
+def _nama_file(h: Dict) -> str:
+    nama = re.sub(r"[^0-9A-Za-z]+", "_", h["nama"]).strip("_") or "nasabah"
+    return f"{h['no']:05d}_{nama[:40]}.txt"
+
+def write_messages(hasil: Iterable[Dict], out: IO[bytes], fmt: str = "zip") -> Dict[str, int]:
+    """Tulis pesan bertahap ke *out*: ``"zip"`` (satu .txt per pesan + GAGAL.txt)
+    atau ``"txt"`` (satu file, dipisah garis). Kembalikan ``{"berhasil", "gagal"}``.
+    """
+    jumlah = {"berhasil": 0, "gagal": 0}
+    gagal: List[str] = []
+    if fmt == "zip":
+        with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for h in hasil:
+                if h["error"]:
+                    jumlah["gagal"] += 1
+                    gagal.append(f"Baris {h['baris']}: {h['error']}")
+                    continue
+                jumlah["berhasil"] += 1
+                zf.writestr(_nama_file(h), h["teks"])
+            if gagal:
+                zf.writestr("GAGAL.txt", "\n".join(gagal) + "\n")
+        return jumlah
+
+    teks = io.TextIOWrapper(out, encoding="utf-8", newline="\n", write_through=True)
+    for h in hasil:
+        if h["error"]:
+            jumlah["gagal"] += 1
+            gagal.append(f"Baris {h['baris']}: {h['error']}")
+            continue
+        jumlah["berhasil"] += 1
+        teks.write(f"===== Baris {h['baris']} =====\n{h['teks']}\n\n")
+    if gagal:
+        teks.write("===== GAGAL =====\n" + "\n".join(gagal) + "\n")
+    teks.detach()
+    return jumlah
+
+
+# ─── CLI ──────────────────────────────────────────────────────────────────────
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate pesan WhatsApp massal dari CSV/XLSX.")
+    parser.add_argument("file", help="file CSV / XLSX transaksi")
+    parser.add_argument("-o", "--output", required=True, help="file keluaran .zip atau .txt")
+    parser.add_argument("--tanpa-ledger", action="store_true", help="jangan catat ke ledger transaksi")
+    args = parser.parse_args(argv)
+
+    ledger = None
+    if not args.tanpa_ledger:
+        from .ledger import get_ledger
+        ledger = get_ledger()
+
+    fmt = "txt" if args.output.lower().endswith(".txt") else "zip"
+    try:
+        with open(args.file, "rb") as f, open(args.output, "wb") as out:
+            jumlah = write_messages(iter_messages(read_rows(f, args.file), ledger), out, fmt)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"{jumlah['berhasil']} pesan → {args.output} ({jumlah['gagal']} baris gagal)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Profil waktu per rerun untuk mode debug UI.
+
+Satu :class:`Profil` aktif per thread (satu sesi Streamlit = satu thread
+script runner). Selama aktif, :func:`ukur` / :func:`diukur` menjumlahkan durasi
+tiap bagian (menu, ``split_transaction_exact``, render DataFrame, …); di luar
+mode debug keduanya hanya memeriksa satu atribut thread-local.
+
+cProfile opsional: jika diminta, seluruh rerun dijalankan di bawah
+``cProfile.Profile`` dan :meth:`Profil.hasil` menyertakan top-N fungsi
+berdasarkan waktu kumulatif.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Iterator, List, Optional
+
+from .waktu import sekarang
+
+_lokal = threading.local()
+
+
+class Profil:
+    """Akumulator durasi per bagian untuk satu rerun."""
+
+    def __init__(self, label: str, cprofile: bool = False) -> None:
+        self.label  = label
+        self.mulai  = sekarang()
+        self.bagian: Dict[str, List[float]] = {}     # nama → [jumlah, total ms, maks ms]
+        self._t0    = time.perf_counter()
+        self._cp    = None
+        if cprofile:
+            import cProfile
+            self._cp = cProfile.Profile()
+
+    def tambah(self, nama: str, ms: float) -> None:
+        b = self.bagian.get(nama)
+        if b is None:
+            self.bagian[nama] = [1, ms, ms]
+        else:
+            b[0] += 1
+            b[1] += ms
+            b[2]  = max(b[2], ms)
+
+    def hasil(self, top: int = 25) -> Dict:
+        """``{"label", "mulai", "total_ms", "bagian", "cprofile"}``; bagian urut total turun."""
+        total = (time.perf_counter() - self._t0) * 1_000
+        bagian = [
+            {"bagian": n, "jumlah": int(b[0]), "total_ms": b[1], "maks_ms": b[2]}
+            for n, b in sorted(self.bagian.items(), key=lambda kv: -kv[1][1])
+        ]
+        return {
+            "label": self.label, "mulai": self.mulai, "total_ms": total,
+            "bagian": bagian, "cprofile": _top_cprofile(self._cp, top) if self._cp else None,
+        }
+
+
+def _top_cprofile(cp, top: int) -> List[Dict]:
+    import pstats
+
+    st = pstats.Stats(cp)
+    baris = []
+    for (berkas, baris_no, fungsi), (cc, nc, tt, ct, _) in st.stats.items():  # type: ignore[attr-defined]
+        baris.append({
+            "fungsi": f"{fungsi} ({berkas.rsplit('/', 1)[-1]}:{baris_no})",
+            "panggilan": nc, "tottime_ms": tt * 1_000, "cumtime_ms": ct * 1_000,
+        })
+    baris.sort(key=lambda b: -b["cumtime_ms"])
+    return baris[:top]
+
+
+def mulai(label: str, cprofile: bool = False) -> Profil:
+    """Aktifkan profil baru untuk thread ini (menggantikan yang lama)."""
+    p = Profil(label, cprofile)
+    _lokal.profil = p
+    if p._cp is not None:
+        try:
+            p._cp.enable()
+        except ValueError:      # profiler lain sudah aktif di thread ini
+            p._cp = None
+    return p
+
+
+def selesai(top: int = 25) -> Optional[Dict]:
+    """Tutup profil aktif thread ini dan kembalikan hasilnya (None jika tidak ada)."""
+    p = getattr(_lokal, "profil", None)
+    if p is None:
+        return None
+    _lokal.profil = None
+    if p._cp is not None:
+        p._cp.disable()
+    return p.hasil(top)
+
+
+def aktif() -> Optional[Profil]:
+    return getattr(_lokal, "profil", None)
+
+
+@contextmanager
+def ukur(nama: str) -> Iterator[None]:
+    """Catat durasi blok ke profil aktif (tanpa efek jika tidak ada)."""
+    p = getattr(_lokal, "profil", None)
+    if p is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        p.tambah(nama, (time.perf_counter() - t0) * 1_000)
+
+
+def diukur(nama: str):
+    """Dekorator: catat durasi setiap panggilan ke profil aktif."""
+    def dekor(fn):
+        @wraps(fn)
+        def jalan(*args, **kwargs):
+            p = getattr(_lokal, "profil", None)
+            if p is None:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                p.tambah(nama, (time.perf_counter() - t0) * 1_000)
+        return jalan
+    return dekor
@@ -0,0 +1,31 @@
+"""Format & parse nominal Rupiah (tanpa dependensi UI)."""
+from __future__ import annotations
+
+from .metrik import PARSE_GAGAL
+
+
+def format_rupiah(angka: float) -> str:
+    """'Rp 1.000.000' — pemisah titik, spasi setelah Rp."""
+    return f"Rp {int(round(angka)):,}".replace(",", ".")
+
+def fmt_rp(val: float) -> str:
+    """'Rp. 1.000.000' — titik setelah Rp (untuk label UI)."""
+    return f"Rp. {int(val):,}".replace(",", ".")
+
+def format_rupiah_rp(val: int) -> str:
+    """'Rp1,000,000' — format koma US (khusus tabel EDC split)."""
+    return f"Rp{val:,}"
+
+def format_ribuan(txt: str) -> str:
+    """Ambil digit dari *txt* lalu format dengan pemisah titik ('1.000.000'), atau '' jika kosong."""
+    digits = "".join(c for c in txt if c.isdigit())
+    return "{:,}".format(int(digits)).replace(",", ".") if digits else ""
+
+def parse_rupiah(value: str) -> int:
+    """Ubah string Rupiah / angka mentah menjadi integer, atau 0 jika gagal."""
+    try:
+        return int(value.replace("Rp", "").replace(".", "").replace(",", "").strip())
+    except (ValueError, AttributeError):
+        kosong = value is None or not str(value).replace("Rp", "").strip()
+        PARSE_GAGAL.inc("kosong" if kosong else "tidak_valid")
+        return 0
@@ -0,0 +1,242 @@
+"""Format & parse Rupiah tervektorisasi untuk kolom besar (NumPy / pandas).
+
+Padanan kolom dari fungsi skalar :mod:`gestun.rupiah`, hasil identik per
+elemen:
+
+- :func:`format_rupiah_kolom` ↔ ``format_rupiah`` — ``Rp 1.234.568`` (dibulatkan)
+- :func:`fmt_rp_kolom` ↔ ``fmt_rp`` — ``Rp. 1.234.567`` (dipotong)
+- :func:`format_rupiah_rp_kolom` ↔ ``format_rupiah_rp`` — ``Rp1,234,567``
+- :func:`parse_rupiah_kolom` ↔ ``parse_rupiah`` — ``"Rp 1.000"`` → ``1000``
+
+Format: nilai → int64 (``np.rint`` = ``round`` Python, ``np.trunc`` = ``int``),
+baris dikelompokkan per jumlah digit & tanda sehingga tata letaknya sama, lalu
+prefiks, pemisah dan tiap tiga digit (tabel 000–999) ditulis ke buffer byte
+dengan operasi kolom. Series hasil dibangun langsung dari buffer Arrow (dtype
+``str`` pandas) tanpa membuat objek string Python per baris.
+
+Parse: baris berbentuk ``[spasi][Rp][spasi]digit/titik/koma[spasi]`` diurai
+per blok sebagai matriks kode ASCII (Series ``str`` Arrow dibaca langsung dari
+buffernya); baris lain (tanda minus, teks, ``None``, NaN, …) jatuh ke
+:func:`~gestun.rupiah.parse_rupiah` sehingga semantik & metrik ``PARSE_GAGAL``
+tetap sama.
+
+Input boleh ``pd.Series`` (hasil Series dengan index & nama yang sama), array
+NumPy atau sequence biasa (hasil ``np.ndarray``). pandas tidak di-import di
+sini; pyarrow dipakai jika tersedia.
+"""
+from __future__ import annotations
+
+import sys
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .rupiah import fmt_rp, format_rupiah, format_rupiah_rp, parse_rupiah
+
+# gaya → (prefiks, pemisah ribuan, pembulatan)
+GAYA: Dict[str, Tuple[str, str, str]] = {
+    "rupiah": ("Rp ",  ".", "rint"),    # format_rupiah
+    "rp":     ("Rp. ", ".", "trunc"),   # fmt_rp
+    "us":     ("Rp",   ",", ""),        # format_rupiah_rp
+}
+
+_MAKS_DIGIT  = 19               # |int64| ≤ 9.223.372.036.854.775.808
+_LEBAR_PARSE = 32               # baris lebih panjang → jalur skalar
+_BLOK        = 1 << 16          # baris per blok parse (matriks tetap di cache)
+_NOL, _SPASI = ord("0"), ord(" ")
+_PANGKAT     = 10 ** np.arange(_MAKS_DIGIT, dtype=np.int64)
+
+
+def _series(nilai):
+    pd = sys.modules.get("pandas")
+    return nilai if pd is not None and isinstance(nilai, pd.Series) else None
+
+
+def _bungkus(hasil: np.ndarray, asal):
+    s = _series(asal)
+    if s is None:
+        return hasil
+    return type(s)(hasil, index=s.index, name=s.name, dtype=object if hasil.dtype == object else None)
+
+
+# ─── Format ───────────────────────────────────────────────────────────────────
+
+_SKALAR = {"rupiah": format_rupiah, "rp": fmt_rp, "us": format_rupiah_rp}
+_TIGA   = np.array([list(f"{i:03d}".encode()) for i in range(1000)], dtype=np.uint8)
+
+
+def _ke_int64(a: np.ndarray, gaya: str) -> Optional[np.ndarray]:
+    """Nilai → int64 sesuai pembulatan *gaya*; None jika harus lewat jalur skalar."""
+    if a.dtype.kind in "bi" or (a.dtype.kind == "u" and (a.size == 0 or a.max() < 2**63)):
+        return a.astype(np.int64, copy=False)
+    if a.dtype.kind != "f" or gaya == "us":     # float di format_rupiah_rp tetap menulis desimal
+        return None
+    a = np.rint(a) if GAYA[gaya][2] == "rint" else np.trunc(a)
+    if not (np.abs(a) < 2.0**63).all():         # NaN/inf/raksasa: biarkan skalar (galat sama)
+        return None
+    return a.astype(np.int64)
+
+
+def _teks(buf: np.ndarray, panjang: np.ndarray, asal):
+    """Buffer byte rata kiri → Series ``str`` (lewat buffer Arrow) atau array ``U``."""
+    s = _series(asal)
+    if s is not None:
+        pd = sys.modules["pandas"]
+        try:
+            import pyarrow as pa
+            dtype = pd.StringDtype("pyarrow", na_value=np.nan)
+        except (ImportError, TypeError):
+            pass
+        else:
+            offset = np.zeros(len(panjang) + 1, dtype=np.int64)
+            np.cumsum(panjang, out=offset[1:])
+            arr = pa.Array.from_buffers(
+                pa.large_string(), len(panjang), [None, pa.py_buffer(offset), pa.py_buffer(buf[buf != 0])]
+            )
+            return type(s)(pd.array(arr, dtype=dtype), index=s.index, name=s.name)
+    return _bungkus(buf.view(f"S{buf.shape[1]}").ravel().astype(f"U{buf.shape[1]}"), asal)
+
+
+def format_kolom(nilai, gaya: str = "rupiah"):
+    """Format seluruh kolom dengan *gaya* ``"rupiah"`` / ``"rp"`` / ``"us"`` (lihat :data:`GAYA`)."""
+    prefiks, pemisah, _ = GAYA[gaya]
+    a = np.asarray(nilai.to_numpy() if _series(nilai) is not None else nilai).ravel()
+    v = _ke_int64(a, gaya)
+    if v is None:
+        return _bungkus(np.array([_SKALAR[gaya](x) for x in a.tolist()], dtype=object), nilai)
+
+    neg = v < 0
+    mag = np.abs(v).astype(np.uint64)    # abs(int64 min) tetap benar lewat wraparound uint64
+    pjg = np.ones(v.size, dtype=np.int64)       # jumlah digit
+    for e in range(1, _MAKS_DIGIT):
+        pjg += mag >= np.uint64(10 ** e)
+    panjang = len(prefiks) + neg + pjg + (pjg - 1) // 3
+
+    # Baris dengan jumlah digit & tanda sama punya tata letak sama → operasi kolom padat
+    lebar = len(prefiks) + 1 + _MAKS_DIGIT + (_MAKS_DIGIT - 1) // 3
+    buf   = np.zeros((v.size, lebar), dtype=np.uint8)
+    kunci = pjg * 2 + neg
+    for k in np.flatnonzero(np.bincount(kunci)):
+        d, ng = divmod(int(k), 2)
+        baris = np.flatnonzero(kunci == k)
+        sisa  = mag[baris]
+        sub   = np.zeros((baris.size, lebar), dtype=np.uint8)
+        sub[:, :len(prefiks)] = np.frombuffer(prefiks.encode(), dtype=np.uint8)
+        if ng:
+            sub[:, len(prefiks)] = ord("-")
+        akhir = len(prefiks) + ng + d + (d - 1) // 3      # satu lewat karakter terakhir
+        while d > 0:
+            n3 = min(d, 3)
+            sub[:, akhir - n3:akhir] = _TIGA[(sisa % np.uint64(1000)).astype(np.intp), 3 - n3:]
+            sisa //= np.uint64(1000)
+            d    -= n3
+            akhir -= n3
+            if d:
+                akhir -= 1
+                sub[:, akhir] = ord(pemisah)
+        buf[baris] = sub
+    return _teks(buf, panjang, nilai)
+
+
+def format_rupiah_kolom(nilai):
+    """Kolom → ``'Rp 1.000.000'`` (padanan :func:`~gestun.rupiah.format_rupiah`)."""
+    return format_kolom(nilai, "rupiah")
+
+def fmt_rp_kolom(nilai):
+    """Kolom → ``'Rp. 1.000.000'`` (padanan :func:`~gestun.rupiah.fmt_rp`)."""
+    return format_kolom(nilai, "rp")
+
+def format_rupiah_rp_kolom(nilai):
+    """Kolom → ``'Rp1,000,000'`` (padanan :func:`~gestun.rupiah.format_rupiah_rp`)."""
+    return format_kolom(nilai, "us")
+
+
+# ─── Parse ────────────────────────────────────────────────────────────────────
+
+def _parse_blok(c: np.ndarray, pjg: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Matriks kode ASCII ``(m, lebar)`` uint8 (0 di luar string) + panjang → (nilai, valid)."""
+    lebar = c.shape[1]
+    spasi = c == _SPASI
+    # Prefiks "Rp" setelah spasi awal (opsional) diperlakukan sebagai spasi
+    r     = np.arange(c.shape[0])
+    depan = np.argmax(~spasi, axis=1)
+    dua   = np.minimum(depan + 1, lebar - 1)
+    rp    = (c[r, depan] == ord("R")) & (c[r, dua] == ord("p")) & (dua > depan)
+    spasi[r[rp], depan[rp]] = True
+    spasi[r[rp], dua[rp]]   = True
+
+    digit = (c - np.uint8(_NOL)) < 10
+    inti  = digit | (c == ord(".")) | (c == ord(","))
+    # Semua karakter inti/spasi (NUL di dalam string → skalar), inti satu blok (seperti str.strip)
+    ok  = (inti | spasi).sum(axis=1) == pjg
+    ok &= (inti[:, 1:] & ~inti[:, :-1]).sum(axis=1) + inti[:, 0] == 1
+    # Nilai = Σ digit × 10^(jumlah digit di kanannya)
+    kanan = np.cumsum(digit[:, ::-1], axis=1, dtype=np.int8)[:, ::-1] - digit
+    jml   = kanan[:, 0] + digit[:, 0]
+    ok   &= (jml > 0) & (jml < _MAKS_DIGIT)
+    nilai = (np.where(digit, c - np.uint8(_NOL), 0) * _PANGKAT[np.minimum(kanan, _MAKS_DIGIT - 1)]).sum(axis=1)
+    return nilai, ok
+
+
+def _arrow(s):
+    """(data uint8, offset int64, valid) dari Series ``str`` berbasis Arrow, atau None."""
+    pd = sys.modules["pandas"]
+    if not (isinstance(s.dtype, pd.StringDtype) and s.dtype.storage == "pyarrow"):
+        return None
+    import pyarrow as pa
+
+    arr = pa.array(s)
+    arr = (arr.combine_chunks() if isinstance(arr, pa.ChunkedArray) else arr).cast(pa.large_string())
+    _, b_off, b_data = arr.buffers()
+    offset = np.frombuffer(b_off, dtype=np.int64)[arr.offset:arr.offset + len(arr) + 1]
+    data   = np.frombuffer(b_data, dtype=np.uint8) if b_data is not None else np.zeros(1, np.uint8)
+    return data, offset, arr.is_valid().to_numpy(zero_copy_only=False)
+
+
+def parse_rupiah_kolom(nilai):
+    """Kolom string Rupiah → int64 (0 jika gagal), padanan :func:`~gestun.rupiah.parse_rupiah`.
+
+    Hasil ber-dtype object hanya jika ada nilai di luar rentang int64.
+    """
+    s  = _series(nilai)
+    ar = _arrow(s) if s is not None else None
+    if ar is not None:
+        data, offset, valid = ar
+        pjg = np.diff(offset)                       # byte; non-ASCII gagal di jalur cepat
+        obj = None
+    else:
+        obj = np.asarray(s.to_numpy(dtype=object) if s is not None else nilai, dtype=object).ravel()
+        if set(map(type, obj.tolist())) <= {str}:
+            valid = np.ones(obj.size, dtype=bool)
+            pjg   = np.fromiter(map(len, obj), dtype=np.int64, count=obj.size)
+        else:
+            valid = np.fromiter((type(x) is str for x in obj), dtype=bool, count=obj.size)
+            pjg   = np.fromiter((len(x) if t else -1 for x, t in zip(obj, valid)), dtype=np.int64, count=obj.size)
+
+    n     = pjg.size
+    hasil = np.zeros(n, dtype=np.int64)
+    cepat = valid & (pjg > 0) & (pjg <= _LEBAR_PARSE)
+    posisi = np.flatnonzero(cepat)
+    for i in range(0, posisi.size, _BLOK):
+        p = posisi[i:i + _BLOK]
+        lebar = int(pjg[p].max())
+        if obj is None:
+            idx = np.minimum(offset[p, None] + np.arange(lebar), data.size - 1)
+            c   = np.where(np.arange(lebar) < pjg[p, None], data[idx], np.uint8(0))
+        else:
+            c = np.asarray(obj[p].tolist(), dtype=f"U{lebar}").view(np.uint32).reshape(p.size, lebar)
+            c = np.where(c < 128, c, 1).astype(np.uint8)       # non-ASCII → karakter tidak sah
+        v, ok = _parse_blok(c, pjg[p])
+        hasil[p[ok]]  = v[ok]
+        cepat[p[~ok]] = False
+
+    lambat = np.flatnonzero(~cepat)
+    if lambat.size and obj is None:
+        obj = np.empty(n, dtype=object)
+        obj[lambat] = s.iloc[lambat].to_numpy(dtype=object)
+    for i in lambat:
+        x = parse_rupiah(obj[i])
+        if hasil.dtype != object and not -2**63 <= x < 2**63:
+            hasil = hasil.astype(object)        # di luar int64: simpan int Python apa adanya
+        hasil[i] = x
+    return _bungkus(hasil, nilai)
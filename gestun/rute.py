@@ -0,0 +1,75 @@
+"""Optimasi rute media pencairan (EDC, QRIS, invoice) untuk mode Normal.
+
+Nominal gesek dan transfer nasabah dihitung sekali lewat aturan ``"Normal"``
+(:mod:`gestun.aturan`) — rate jual nasabah tidak bergantung media. Yang
+berbeda per media hanya MDR dan kapabilitasnya, sehingga semua media dinilai
+dalam satu operasi NumPy:
+
+- ``untung_rp = fee − nominal_gesek × MDR``, ``fee`` = pendapatan rate jual,
+- ``rate_untung = untung_rp / nominal_gesek × 100`` (poin persen),
+- media layak jika ``aktif``, MDR-nya sudah diisi (tidak None) dan
+  ``nominal_gesek ≤ maks`` (``maks`` None = tanpa batas).
+
+Media layak diurutkan dari untung terbesar; seri dipecah sesuai urutan tabel.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .aturan import engine
+from .konstanta import MEDIA_PENCAIRAN
+
+
+def rank_media(
+    nominal: float,
+    total_biaya: float,
+    kotor: bool = True,
+    rate_decimal: float = 0.0,
+    rt_nom: float = 0.0,
+    persen: bool = True,
+    media: Optional[Sequence[Dict]] = None,
+) -> Dict:
+    """Peringkat semua media untuk satu transaksi Normal.
+
+    *media* = daftar ``{"media", "jenis", "mdr", "maks", "aktif"}`` (default
+    :data:`MEDIA_PENCAIRAN`). Kembalikan ``{"jt_final", "trf_final",
+    "terbaik", "peringkat"}``; ``peringkat`` berisi semua media (layak dulu,
+    urut untung turun) dengan kolom ``untung_rp``, ``rate_untung``, ``layak``.
+    ``terbaik`` None jika tidak ada media layak.
+    """
+    if media is None:
+        media = MEDIA_PENCAIRAN
+
+    jt, trf, fee, _, _ = engine("Normal").evaluator(kotor, persen)(
+        nominal, total_biaya, rate_decimal if persen else rt_nom
+    )
+
+    mdr   = np.fromiter(
+        (np.nan if m.get("mdr") is None else m["mdr"] for m in media),
+        dtype=np.float64, count=len(media),
+    )
+    maks  = np.fromiter(
+        (np.inf if m.get("maks") is None else m["maks"] for m in media),
+        dtype=np.float64, count=len(media),
+    )
+    aktif = np.fromiter((bool(m.get("aktif", True)) for m in media), dtype=bool, count=len(media))
+
+    untung = fee - jt * (mdr / 100.0)
+    rate   = untung / jt * 100.0 if jt else np.zeros_like(untung)
+    layak  = aktif & ~np.isnan(mdr) & (jt <= maks)
+    # Layak dulu, lalu untung terbesar; lexsort stabil → seri ikut urutan tabel
+    urut   = np.lexsort((-untung, ~layak))
+
+    peringkat: List[Dict] = [
+        {
+            **media[i],
+            "untung_rp":   float(untung[i]),
+            "rate_untung": float(rate[i]),
+            "layak":       bool(layak[i]),
+        }
+        for i in urut
+    ]
+    terbaik = peringkat[0] if peringkat and peringkat[0]["layak"] else None
+    return {"jt_final": jt, "trf_final": trf, "terbaik": terbaik, "peringkat": peringkat}
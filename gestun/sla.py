@@ -0,0 +1,142 @@
+"""Papan SLA transaksi yang belum selesai (dana belum masuk ke nasabah).
+
+Setiap transaksi punya ``jatuh_tempo`` = waktu generate + SLA mode
+(:data:`~gestun.konstanta.SLA_MENIT`). :class:`SlaBoard` menyimpan min-heap
+``(jatuh_tempo, id)`` sehingga:
+
+- **tambah** — ``heappush`` O(log n);
+- **selesai** — hapus malas (lazy): item ditandai, dibuang dari heap saat naik
+  ke puncak, O(log n) teramortisasi;
+- **berikutnya** — item terdekat ke jatuh tempo di puncak heap, O(log n);
+- **mendesak** — semua item yang jatuh tempo sebelum ``batas`` dengan menelusuri
+  heap sebagai pohon dan memangkas cabang yang lebih besar dari ``batas``,
+  O(k) untuk k item mendesak (tidak memindai seluruh papan).
+
+Status per item: ``terlambat`` (lewat jatuh tempo), ``hampir`` (kurang dari
+``ambang`` menit lagi), ``aman``. Papan dipakai bersama semua sesi dalam satu
+proses (:func:`get_board`) dan hanya disimpan di memori.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .konstanta import SLA_AMBANG_MENIT, SLA_MENIT
+from .waktu import sekarang
+
+STATUS_SLA = ("terlambat", "hampir", "aman")
+
+
+class SlaBoard:
+    """Penjadwal jatuh tempo berbasis heap; aman dipakai lintas thread/sesi."""
+
+    def __init__(self, ambang_menit: float = SLA_AMBANG_MENIT) -> None:
+        self.ambang  = timedelta(minutes=ambang_menit)
+        self._heap:  List[Tuple[datetime, int]] = []
+        self._item:  Dict[int, Dict] = {}
+        self._urut   = itertools.count(1)
+        self._lock   = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._item)
+
+    # ── Tulis ─────────────────────────────────────────────────────────────────
+    def tambah(
+        self,
+        ref: str,
+        mode: str,
+        mulai: Optional[datetime] = None,
+        jatuh_tempo: Optional[datetime] = None,
+        nama: str = "",
+        nominal: float = 0.0,
+    ) -> int:
+        """Daftarkan transaksi tertunda; kembalikan id papan.
+
+        *jatuh_tempo* default = *mulai* (default sekarang) + ``SLA_MENIT[mode]``.
+        """
+        mulai = mulai or sekarang()
+        if jatuh_tempo is None:
+            jatuh_tempo = mulai + timedelta(minutes=SLA_MENIT[mode])
+        with self._lock:
+            iid = next(self._urut)
+            self._item[iid] = {
+                "id": iid, "ref": ref, "mode": mode, "nama": nama, "nominal": nominal,
+                "mulai": mulai, "jatuh_tempo": jatuh_tempo,
+            }
+            heapq.heappush(self._heap, (jatuh_tempo, iid))
+        return iid
+
+    def selesai(self, iid: int) -> bool:
+        """Tandai selesai (dana masuk). False jika id tidak ada di papan."""
+        with self._lock:
+            if self._item.pop(iid, None) is None:
+                return False
+            self._buang_puncak()
+            # Heap terlalu banyak sampah (item selesai di tengah) → bangun ulang
+            if len(self._heap) > 2 * len(self._item) + 64:
+                self._heap = [h for h in self._heap if h[1] in self._item]
+                heapq.heapify(self._heap)
+        return True
+
+    def _buang_puncak(self) -> None:
+        while self._heap and self._heap[0][1] not in self._item:
+            heapq.heappop(self._heap)
+
+    # ── Baca ──────────────────────────────────────────────────────────────────
+    def berikutnya(self) -> Optional[Dict]:
+        """Item dengan jatuh tempo paling dekat (None jika papan kosong)."""
+        with self._lock:
+            self._buang_puncak()
+            return dict(self._item[self._heap[0][1]]) if self._heap else None
+
+    def mendesak(self, batas: datetime) -> List[Dict]:
+        """Semua item dengan ``jatuh_tempo ≤ batas``, urut jatuh tempo."""
+        hasil: List[Tuple[datetime, int]] = []
+        with self._lock:
+            heap  = self._heap
+            stack = [0] if heap else []
+            while stack:
+                i = stack.pop()
+                if heap[i][0] > batas:          # anak-anaknya pasti lebih besar
+                    continue
+                if heap[i][1] in self._item:
+                    hasil.append(heap[i])
+                stack.extend(j for j in (2 * i + 1, 2 * i + 2) if j < len(heap))
+            hasil.sort()
+            return [dict(self._item[h[1]]) for h in hasil]
+
+    def papan(self, waktu: Optional[datetime] = None, limit: Optional[int] = None) -> List[Dict]:
+        """Baris papan urut jatuh tempo, plus ``sisa_menit`` dan ``status``."""
+        waktu = waktu or sekarang()
+        with self._lock:
+            antre = [h for h in self._heap if h[1] in self._item]
+            antre = heapq.nsmallest(limit, antre) if limit else sorted(antre)
+            baris = [dict(self._item[h[1]]) for h in antre]
+        for b in baris:
+            sisa = b["jatuh_tempo"] - waktu
+            b["sisa_menit"] = sisa.total_seconds() / 60.0
+            b["status"]     = _status(sisa, self.ambang)
+        return baris
+
+    def ringkas(self, waktu: Optional[datetime] = None) -> Dict[str, int]:
+        """Jumlah item per status; hanya menelusuri bagian heap yang mendesak."""
+        waktu   = waktu or sekarang()
+        desak   = self.mendesak(waktu + self.ambang)
+        telat   = sum(1 for d in desak if d["jatuh_tempo"] <= waktu)
+        return {"terlambat": telat, "hampir": len(desak) - telat, "aman": len(self) - len(desak)}
+
+
+def _status(sisa: timedelta, ambang: timedelta) -> str:
+    if sisa <= timedelta(0):
+        return "terlambat"
+    return "hampir" if sisa <= ambang else "aman"
+
+
+@lru_cache(maxsize=None)
+def get_board() -> SlaBoard:
+    """Papan SLA bersama (satu per proses, semua sesi Streamlit)."""
+    return SlaBoard()
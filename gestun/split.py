@@ -0,0 +1,238 @@
+"""Mesin pembagian transaksi besar ke beberapa mesin EDC (round-robin, non-bulat)."""
+from __future__ import annotations
+
+import random
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .metrik import KAPASITAS_DITOLAK, SPLIT_DETIK
+from .profil import diukur
+from .rupiah import format_rupiah_rp
+
+# ─── Konstanta ────────────────────────────────────────────────────────────────
+RNG        = random.SystemRandom()
+SAFETY_GAP = 1_000
+PLAN_CACHE_SIZE = 1_024
+
+# ─── Fungsi Pembantu EDC Split ────────────────────────────────────────────────
+
+def _is_non_round(val: int) -> bool:
+    return val % 1_000 != 0
+
+def _rand_adjust(
+    val: int, low: int = 237, high: int = 937, rng: Optional[random.Random] = None
+) -> int:
+    if _is_non_round(val):
+        return 0
+    high = min(high, max(low + 1, val - 1))
+    return (rng or RNG).randrange(low, high)
+
+def _water_fill(total: int, swipe_slots: List[Tuple[str, int]]) -> List[int]:
+    """Distribusikan *total* secara proporsional (water-filling).
+    Slot bertarget awal = total/N. Jika ada slot dengan cap < target,
+    isi slot tersebut ke capnya lalu sebarkan sisa ke slot yang tersisa.
+    Menggunakan aritmetika integer agar tidak ada presisi floating-point.
+
+    Slot diperiksa dari cap terkecil (O(N log N)): begitu satu slot tidak
+    terkendala kapasitas, slot dengan cap lebih besar juga tidak.
+    """
+    caps      = [cap for _, cap in swipe_slots]
+    n         = len(caps)
+    targets   = [0] * n
+    capped    = [False] * n
+    remaining = total
+    k         = n
+
+    for i in sorted(range(n), key=caps.__getitem__):
+        # caps[i] * k <= remaining  ⟺  caps[i] <= remaining/k  (integer-safe)
+        if caps[i] * k > remaining:
+            break
+        targets[i] = caps[i]
+        capped[i]  = True
+        remaining -= caps[i]
+        k         -= 1
+
+    if k:
+        # Sisa slot tidak terkendala kapasitas — bagi rata (urutan slot asli)
+        base  = remaining // k
+        extra = remaining - base * k
+        rank  = 0
+        for i in range(n):
+            if not capped[i]:
+                targets[i] = base + (1 if rank < extra else 0)
+                rank      += 1
+
+    return targets
+
+
+@SPLIT_DETIK.diamati()
+@diukur("split_transaction_exact")
+def split_transaction_exact(
+    total: int,
+    machines: List[Tuple[str, int]],
+    max_swipes: int = 2,
+    seed: Optional[int] = None,
+    rng: Optional[random.Random] = None,
+    stats: Optional[Dict[str, int]] = None,
+) -> List[Dict]:
+    """Bagi *total* ke mesin-mesin dengan:
+    - Urutan round-robin: A → B → C → A → B → C → …  (beda bank bergantian)
+    - Nominal per gesek PROPORSIONAL — bukan selalu memaksimalkan limit
+    - Variasi ±5% per gesek agar pola tidak kentara
+    - NOMINAL per gesek < limit − SAFETY_GAP
+    - Maks *max_swipes* gesek per mesin
+    - Total tepat = *total*
+    Kompleksitas O(S log S) untuk S = jumlah slot gesek.
+
+    Default memakai ``RNG`` (SystemRandom, hasil beda tiap panggilan). Beri
+    *seed* atau *rng* sendiri agar rencana bisa direproduksi / diaudit.
+    *stats* (opsional) menghitung jalur koreksi selisih yang terpakai:
+    ``koreksi_langsung``, ``koreksi_bertahap``, ``koreksi_paksa`` (fallback
+    ke gesek terakhir).
+    """
+    if rng is None:
+        rng = RNG if seed is None else random.Random(seed)
+
+    machines  = sorted(machines, key=lambda x: -x[1])
+    round_cap = sum(limit - SAFETY_GAP for _, limit in machines)
+
+    # ── Pre-check kapasitas ───────────────────────────────────────────────────
+    total_capacity = round_cap * max_swipes
+    if total > total_capacity:
+        detail_lines = "\n".join(
+            f"  • {name}: {max_swipes} × {format_rupiah_rp(limit - SAFETY_GAP)}"
+            f" = {format_rupiah_rp((limit - SAFETY_GAP) * max_swipes)}"
+            for name, limit in machines
+        )
+        KAPASITAS_DITOLAK.inc("split")
+        raise RuntimeError(
+            f"Total transaksi {format_rupiah_rp(total)} melebihi kapasitas semua mesin.\n\n"
+            f"Kapasitas per mesin ({max_swipes} swipe maks):\n{detail_lines}\n\n"
+            f"Total kapasitas tersedia: {format_rupiah_rp(int(total_capacity))}\n\n"
+            f"Solusi: tambah jumlah mesin, naikkan batas per swipe, atau naikkan max swipe."
+        )
+
+    # ── Pilih jumlah round minimum yang cukup ────────────────────────────────
+    # Putaran round-robin terkecil yang total kapasitasnya ≥ total, yaitu
+    # ceil(total / kapasitas per putaran) — gesek sesedikit mungkin.
+    rounds = max_swipes
+    if total <= round_cap:
+        rounds = 1
+    elif round_cap > 0:
+        rounds = min(max_swipes, -(-total // round_cap))
+
+    # ── Slot round-robin: [A,B,C, A,B,C, …] ──────────────────────────────────
+    swipe_slots: List[Tuple[str, int]] = [
+        (name, limit - SAFETY_GAP)
+        for _ in range(rounds)
+        for name, limit in machines
+    ]
+
+    # ── Target proporsional via water-filling ────────────────────────────────
+    # Alih-alih memaksimalkan setiap gesek, bagi total secara merata.
+    # Contoh 200 jt / 6 gesek ≈ 33 jt/gesek  vs  lama: 40jt,40jt,40jt,40jt,35jt,5jt
+    base_targets = _water_fill(total, swipe_slots)
+
+    # ── Alokasi dengan variasi ±5% + lookahead ───────────────────────────────
+    remaining  = total
+    future_cap = round_cap * rounds     # kapasitas slot ke-i dan sesudahnya
+    randint    = rng.randint
+    parts: List[Dict] = []
+
+    for i, (name, cap) in enumerate(swipe_slots):
+        if remaining <= 0:
+            break
+
+        # Batas minimum/maksimum berdasarkan lookahead
+        future_cap -= cap
+        must_cover  = max(1, remaining - future_cap)
+        can_cover   = min(cap, remaining)
+
+        # Terapkan variasi ±5% dari target (minimal ±Rp 100.000)
+        base    = base_targets[i]
+        var_rng = max(100_000, int(base * 0.05))
+        delta   = randint(-var_rng, var_rng)
+        amt     = max(1, base + delta)
+
+        # Jadikan non-bulat: bulatkan ke ribuan lalu tambahkan komponen acak
+        amt = (amt // 1_000) * 1_000 + randint(237, 937)
+
+        # Clamp ke rentang valid — jaminan tidak stuck
+        amt = max(must_cover, min(can_cover, amt))
+
+        parts.append({"machine": name, "amount": amt})
+        remaining -= amt
+
+    # ── Koreksi selisih ───────────────────────────────────────────────────────
+    # Setelah loop, selisih terhadap total tepat = remaining (tanpa sum ulang).
+    diff = remaining
+    if diff != 0:
+        machine_cap_map = {name: limit - SAFETY_GAP for name, limit in machines}
+
+        jalur = "koreksi_langsung"
+        for p in parts:
+            cap      = machine_cap_map[p["machine"]]
+            headroom = cap - p["amount"]
+            if 0 < diff <= headroom and _is_non_round(p["amount"] + diff):
+                p["amount"] += diff
+                diff = 0
+                break
+            elif diff < 0 and abs(diff) < p["amount"] - 1 and _is_non_round(p["amount"] + diff):
+                p["amount"] += diff
+                diff = 0
+                break
+
+        if diff != 0:
+            jalur = "koreksi_bertahap"
+            for p in parts:
+                if diff == 0:
+                    break
+                cap      = machine_cap_map[p["machine"]]
+                headroom = cap - p["amount"]
+                step     = diff if abs(diff) <= headroom else headroom
+                if step != 0 and _is_non_round(p["amount"] + step):
+                    p["amount"] += step
+                    diff        -= step
+
+        if diff != 0:
+            jalur = "koreksi_paksa"
+            parts[-1]["amount"] += diff
+
+        if stats is not None:
+            stats[jalur] = stats.get(jalur, 0) + 1
+
+    assert sum(p["amount"] for p in parts) == total, "Total mismatch setelah penyesuaian!"
+    return parts
+
+
+# ─── Cache Rencana (LRU, seluruh proses) ──────────────────────────────────────
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _cached_plan(
+    total: int,
+    machines: Tuple[Tuple[str, int], ...],
+    max_swipes: int,
+    seed: int,
+) -> Tuple[Tuple[str, int], ...]:
+    plan = split_transaction_exact(total, list(machines), max_swipes, seed=seed)
+    return tuple((p["machine"], p["amount"]) for p in plan)
+
+
+def split_transaction_cached(
+    total: int,
+    machines: Sequence[Tuple[str, int]],
+    max_swipes: int = 2,
+    seed: int = 0,
+) -> List[Dict]:
+    """Seperti :func:`split_transaction_exact` dengan *seed* wajib, di-cache LRU.
+    Cache dipakai bersama oleh semua sesi dalam satu proses; input yang sama
+    mengembalikan rencana yang sama tanpa dihitung ulang. RuntimeError
+    (kapasitas kurang) tidak di-cache.
+    """
+    key_machines = tuple((str(name), int(limit)) for name, limit in machines)
+    plan = _cached_plan(int(total), key_machines, int(max_swipes), int(seed))
+    return [{"machine": name, "amount": amount} for name, amount in plan]
+
+
+plan_cache_info  = _cached_plan.cache_info
+plan_cache_clear = _cached_plan.cache_clear
@@ -0,0 +1,20 @@
+"""Utilitas waktu (zona WIB)."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+WIB = ZoneInfo("Asia/Jakarta")
+
+
+def sekarang() -> datetime:
+    """Waktu saat ini di zona Asia/Jakarta."""
+    return datetime.now(WIB)
+
+def hari_ini() -> str:
+    """Tanggal hari ini (WIB) format ISO ``YYYY-MM-DD``."""
+    return sekarang().date().isoformat()
+
+def estimasi_selesai(waktu_mulai: datetime, durasi: timedelta) -> str:
+    """Kembalikan string HH:MM dari waktu_mulai + durasi."""
+    return (waktu_mulai + durasi).strftime("%H:%M")
@@ -0,0 +1,152 @@
+// Kuotasi Konven langsung di browser (komponen Streamlit v2).
+//
+// Nominal diformat ("1.000.000") dan kartu Gesek Kotor / Gesek Bersih
+// dihitung di browser pada setiap ketikan; server hanya menerima nilai akhir
+// (setStateValue "nominal") setelah ketikan berhenti `tunda_ms`, saat Enter
+// atau saat input kehilangan fokus.
+//
+// Rumus = gestun.aturan._kompilasi (satu komponen rate) dengan aturan
+// ATURAN_BIAYA["Konven"] yang dikirim server; format = gestun.rupiah.
+// Paritas dicek tools/parity_konven_js.py terhadap gestun.biaya.hitung_konven.
+
+/** round() Python: half-to-even. */
+export function bulatGenap(x) {
+  const f = Math.floor(x);
+  const d = x - f;
+  if (d > 0.5) return f + 1;
+  if (d < 0.5) return f;
+  return f % 2 === 0 ? f : f + 1;
+}
+
+/** format_ribuan: ambil digit lalu beri pemisah titik ("" jika kosong). */
+export function formatRibuan(teks) {
+  const digit = String(teks).replace(/[^0-9]/g, "");
+  if (!digit) return "";
+  return BigInt(digit).toString().replace(/\B(?=(\d{3})+(?!\d))/g, ".");
+}
+
+/** format_rupiah: "Rp 1.000.000". */
+export function formatRupiah(angka) {
+  return "Rp " + String(bulatGenap(angka)).replace(/\B(?=(\d{3})+(?!\d))/g, ".");
+}
+
+/** hitung_konven: k_fee, k_terima, b_transaksi, total_potongan_kotor, total_biaya_bersih. */
+export function hitungKonven(n, { persen, rate, flat, biaya, aturan }) {
+  const bulat  = aturan.pembulatan_fee === "round";
+  const naik   = aturan.gross_up === "ceil" ? Math.ceil : Math.trunc;
+  const gabung = aturan.potong === "gabung";
+  const ekstra = aturan.ekstra_bersih[persen ? "persen" : "flat"];
+
+  let fee, gesek;
+  if (persen) {
+    fee   = bulat ? bulatGenap(n * rate) : n * rate;
+    gesek = naik((n + biaya) / (1.0 - rate)) + ekstra;
+  } else {
+    fee   = flat;
+    gesek = n + biaya + flat + ekstra;
+  }
+  return {
+    k_fee:                fee,
+    k_terima:             gabung ? n - (fee + biaya) : n - fee - biaya,
+    b_transaksi:          gesek,
+    total_potongan_kotor: fee + biaya,
+    total_biaya_bersih:   gesek - n,
+  };
+}
+
+// ─── Komponen ────────────────────────────────────────────────────────────────
+
+const KARTU = `
+  <div class="kartu-baris" hidden>
+    <div class="kartu kotor">
+      <p>METODE GESEK KOTOR</p>
+      <h2 data-nilai="kotor"></h2>
+      <small>Dana Bersih yang Kakak/Bapak/Ibu Terima</small>
+    </div>
+    <div class="kartu bersih">
+      <p>METODE GESEK BERSIH</p>
+      <h2 data-nilai="bersih"></h2>
+      <small>Nominal yang Harus Digesek</small>
+    </div>
+  </div>`;
+
+function bangun(induk) {
+  const akar = document.createElement("div");
+  akar.className = "konven-live";
+  akar.innerHTML = `
+    <label><span></span>
+      <input type="text" inputmode="numeric" autocomplete="off" spellcheck="false">
+    </label>${KARTU}`;
+  induk.appendChild(akar);
+
+  const input = akar.querySelector("input");
+  input.addEventListener("input", () => {
+    formatInput(input, akar._data.maks_digit);
+    tampilkan(akar);
+    jadwalkan(akar);
+  });
+  input.addEventListener("blur", () => sinkron(akar));
+  input.addEventListener("keydown", (e) => {
+    if (e.key === "Enter") sinkron(akar);
+  });
+  return akar;
+}
+
+/** Format ulang isi input sambil menjaga posisi kursor (dihitung per digit). */
+function formatInput(input, maksDigit) {
+  const lama  = input.value;
+  const pos   = input.selectionStart ?? lama.length;
+  const baru  = formatRibuan(lama.replace(/[^0-9]/g, "").slice(0, maksDigit));
+  if (baru === lama) return;
+  let sisa = lama.slice(0, pos).replace(/[^0-9]/g, "").length;
+  let kursor = 0;
+  while (kursor < baru.length && sisa > 0) {
+    if (baru[kursor] !== ".") sisa -= 1;
+    kursor += 1;
+  }
+  input.value = baru;
+  input.setSelectionRange(kursor, kursor);
+}
+
+function tampilkan(akar) {
+  const n     = Number(akar.querySelector("input").value.replace(/\./g, ""));
+  const baris = akar.querySelector(".kartu-baris");
+  baris.hidden = !(n > 0);
+  if (baris.hidden) return;
+  const hasil = hitungKonven(n, akar._data);
+  akar.querySelector('[data-nilai="kotor"]').textContent  = formatRupiah(Math.max(0, hasil.k_terima));
+  akar.querySelector('[data-nilai="bersih"]').textContent = formatRupiah(hasil.b_transaksi);
+}
+
+function jadwalkan(akar) {
+  clearTimeout(akar._timer);
+  akar._timer = setTimeout(() => sinkron(akar), akar._data.tunda_ms);
+}
+
+function sinkron(akar) {
+  clearTimeout(akar._timer);
+  akar._timer = null;
+  const nilai = akar.querySelector("input").value;
+  if (nilai !== akar._terkirim) {
+    akar._terkirim = nilai;
+    akar._kirim("nominal", nilai);
+  }
+}
+
+export default function ({ data, parentElement, setStateValue }) {
+  // Dipanggil ulang setiap rerun (data baru): DOM & isi input dipertahankan
+  const akar  = parentElement.querySelector(".konven-live") || bangun(parentElement);
+  const input = akar.querySelector("input");
+  akar._data     = data;
+  akar._kirim    = setStateValue;
+  akar._terkirim = data.nominal;
+
+  akar.querySelector("label > span").textContent = data.label;
+  input.placeholder = data.placeholder;
+  const fokus = (parentElement.activeElement ?? document.activeElement) === input;
+  if (!fokus) input.value = data.nominal;
+  tampilkan(akar);
+  if (input.value !== data.nominal) jadwalkan(akar);     // ketikan belum terkirim
+
+  return () => clearTimeout(akar._timer);
+}
@@ -0,0 +1,12 @@
+"""Konfigurasi pytest: ``gestun`` diimpor dari akar repo; data ke direktori sementara."""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Sebelum gestun diimpor: gestun.db membaca GESTUN_DATA_DIR saat import
+os.environ.setdefault("GESTUN_DATA_DIR", tempfile.mkdtemp(prefix="gestun_test_"))
+os.environ.setdefault("GESTUN_METRICS_PORT", "0")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,122 @@
+"""Mesin aturan biaya: hasil identik dengan rumus lama tiap menu (sebelum
+:mod:`gestun.aturan`), jalur batch NumPy identik dengan jalur skalar."""
+from __future__ import annotations
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from gestun import biaya
+from gestun.aturan import ATURAN_BIAYA, compile_rules, engine
+
+# ─── Rumus lama (gestun/biaya.py sebelum mesin aturan) ────────────────────────
+
+def _konven_lama(nominal, biaya_total, rate_decimal=None, nominal_rate=0):
+    if rate_decimal is not None:
+        k_fee       = int(round(nominal * rate_decimal))
+        k_terima    = nominal - k_fee - biaya_total
+        b_transaksi = int((nominal + biaya_total) / (1 - rate_decimal)) + 1
+    else:
+        k_fee       = nominal_rate
+        k_terima    = nominal - nominal_rate - biaya_total
+        b_transaksi = nominal + biaya_total + nominal_rate + 1
+    return {
+        "k_fee":                k_fee,
+        "k_terima":             k_terima,
+        "b_transaksi":          b_transaksi,
+        "total_potongan_kotor": k_fee + biaya_total,
+        "total_biaya_bersih":   b_transaksi - nominal,
+    }
+
+def _input_lama(input_nominal, total_biaya, kotor, rate, flat, persen, ekstra_flat):
+    if kotor:
+        jt_final  = input_nominal
+        fee_jasa  = round(jt_final * rate) if persen else flat
+        trf_final = jt_final - fee_jasa - total_biaya
+    else:
+        if persen:
+            jt_final = math.ceil((input_nominal + total_biaya) / (1.0 - rate))
+        else:
+            jt_final = input_nominal + total_biaya + flat + ekstra_flat
+        trf_final = input_nominal
+    return {"jt_final": jt_final, "trf_final": trf_final}
+
+def _marketplace_lama(nominal_checkout, fee_merchant, fee_gestun, total_biaya_tambahan=0):
+    fee_merchant_rp = 0 if fee_merchant is None else nominal_checkout * (fee_merchant / 100)
+    fee_gestun_rp   = 0 if fee_gestun is None else nominal_checkout * (fee_gestun / 100)
+    total_biaya     = fee_merchant_rp + fee_gestun_rp + total_biaya_tambahan
+    return {
+        "fee_merchant_rp":  fee_merchant_rp,
+        "fee_gestun_rp":    fee_gestun_rp,
+        "total_biaya":      total_biaya,
+        "nominal_diterima": nominal_checkout - total_biaya,
+    }
+
+
+def _kasus(n: int = 2_000, seed: int = 11):
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield (
+            rng.randrange(10_000, 500_000_000),
+            rng.choice([0, 6_500, rng.randrange(0, 200_000)]),
+            rng.randrange(0, 1_500) / 100 / 100,         # 0–14,99 % sebagai desimal
+            rng.randrange(0, 300_000),
+        )
+
+
+def _sama(a, b):
+    assert a == b and [type(v) for v in a.values()] == [type(v) for v in b.values()]
+
+# ─── Paritas dengan rumus lama ────────────────────────────────────────────────
+
+def test_konven_sama_dengan_rumus_lama():
+    for nominal, b, rate, flat in _kasus():
+        _sama(biaya.hitung_konven(nominal, b, rate), _konven_lama(nominal, b, rate))
+        _sama(biaya.hitung_konven(nominal, b, None, flat), _konven_lama(nominal, b, None, flat))
+
+
+@pytest.mark.parametrize("kotor", [True, False])
+def test_express_normal_sama_dengan_rumus_lama(kotor):
+    for nominal, b, rate, flat in _kasus():
+        for persen in (True, False):
+            _sama(
+                biaya.hitung_express(nominal, b, kotor, rate, flat, persen),
+                _input_lama(nominal, b, kotor, rate, flat, persen, ekstra_flat=0),
+            )
+            _sama(
+                biaya.hitung_normal(nominal, b, kotor, rate, flat, persen),
+                _input_lama(nominal, b, kotor, rate, flat, persen, ekstra_flat=1),
+            )
+
+
+def test_marketplace_sama_dengan_rumus_lama():
+    rng = random.Random(5)
+    for nominal, b, _, _ in _kasus(500):
+        fm = rng.choice([None, rng.randrange(0, 1_000) / 100])
+        fg = rng.choice([None, rng.randrange(0, 1_000) / 100])
+        _sama(biaya.hitung_marketplace(nominal, fm, fg, b), _marketplace_lama(nominal, fm, fg, b))
+
+# ─── Batch NumPy = skalar ─────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("nama", sorted(ATURAN_BIAYA))
+@pytest.mark.parametrize("kotor", [True, False])
+@pytest.mark.parametrize("persen", [True, False])
+def test_quote_batch_sama_dengan_skalar(nama, kotor, persen):
+    kasus   = list(_kasus(500, seed=len(nama)))
+    nominal = np.array([k[0] for k in kasus])
+    b       = np.array([k[1] for k in kasus])
+    rate    = np.array([k[2] for k in kasus])
+    flat    = np.array([k[3] for k in kasus])
+    eng     = engine(nama)
+    batch   = eng.quote_batch(nominal, kotor, persen, rates=(rate,), flat=flat, biaya=b)
+    for i, (n, bi, r, f) in enumerate(kasus):
+        q = eng.quote(n, kotor, persen, rates=(r,), flat=f, biaya=bi)
+        for kolom in ("gesek", "terima", "fee", "potongan"):
+            assert batch[kolom][i] == q[kolom], (kolom, n, bi, r, f)
+
+
+def test_aturan_tidak_dikenal_ditolak():
+    with pytest.raises(ValueError, match="gross_up"):
+        compile_rules("X", {**ATURAN_BIAYA["Konven"], "gross_up": "floor"})
@@ -0,0 +1,42 @@
+"""Antrean kirim WhatsApp: riwayat tidak membuang pesan belum selesai,
+antrean penuh ditolak seketika dengan ``tunggu=0``."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+import gestun.kirim as kirim
+
+
+class _Cepat(kirim.Sender):
+    async def send_batch(self, batch):
+        await asyncio.sleep(0.001)
+        return [None] * len(batch)
+
+
+class _Macet(kirim.Sender):
+    async def send_batch(self, batch):
+        await asyncio.sleep(60)
+        return [None] * len(batch)
+
+
+def test_riwayat_hanya_memangkas_pesan_selesai(monkeypatch):
+    monkeypatch.setattr(kirim, "RIWAYAT_MAKS", 20)
+    q = kirim.DispatchQueue(_Cepat(), seed=1)
+    for i in range(100):
+        q.submit(f"pesan {i}")
+    assert q.tunggu(20)
+    assert q.ringkas() == {"terkirim": 20}
+
+
+def test_antrean_penuh_ditolak_tanpa_menunggu(monkeypatch):
+    monkeypatch.setattr(kirim, "ANTRIAN_MAKS", 5)
+    q = kirim.DispatchQueue(_Macet(), konkurensi=1, batch=1)
+    ids = [q.submit("x", tunggu=0) for _ in range(5)]
+    t0 = time.perf_counter()
+    with pytest.raises(RuntimeError, match="penuh"):
+        q.submit("x", tunggu=0)
+    assert time.perf_counter() - t0 < 0.1
+    assert all(q.status(i) is not None for i in ids)   # tidak ada yang dibuang
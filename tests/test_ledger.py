@@ -0,0 +1,91 @@
+"""Ledger transaksi: nomor berurutan per tanggal tanpa duplikat walau ditulis
+bersamaan dari banyak thread dan proses, append-only, dan rekap inkremental
+sama dengan agregasi ulang dari transaksi."""
+from __future__ import annotations
+
+import multiprocessing
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from gestun.ledger import _REBUILD_REKAP, BELUM_DIISI, DIMENSI_REKAP, Ledger
+
+TANGGAL = "2026-01-02"
+
+
+def _record(i: int = 0, **kw):
+    return {"mode": "Express", "jt_final": 1_000_000 + i, "trf_final": 950_000, "total_biaya": 6_500, **kw}
+
+
+def _tulis(path: str, putaran: int, per_batch: int):
+    """Pekerja proses: koneksi sendiri, tulis *putaran* batch."""
+    ledger = Ledger(path)
+    return [no for i in range(putaran) for no in ledger.append_many([_record(i)] * per_batch, TANGGAL)]
+
+
+def _nomor(ledger: Ledger, tanggal: str = TANGGAL):
+    return sorted(r["no"] for r in ledger.cari(tanggal, limit=100_000))
+
+
+def test_nomor_berurutan_per_tanggal(tmp_path):
+    ledger = Ledger(tmp_path / "l.db")
+    assert ledger.berikutnya(TANGGAL) == 1
+    assert ledger.append_many([_record(), _record()], TANGGAL) == [1, 2]
+    assert ledger.append(_record(), TANGGAL) == 3
+    assert ledger.append(_record(), "2026-01-03") == 1          # reset per tanggal
+    assert ledger.berikutnya(TANGGAL) == 4
+    assert ledger.append_many([], TANGGAL) == []
+
+
+def test_nomor_unik_dari_banyak_thread(tmp_path):
+    ledger = Ledger(tmp_path / "l.db")
+    with ThreadPoolExecutor(8) as ex:
+        hasil = [no for nos in ex.map(lambda i: ledger.append_many([_record(i)] * 3, TANGGAL), range(200))
+                 for no in nos]
+    assert sorted(hasil) == list(range(1, 601)) == _nomor(ledger)
+
+
+def test_nomor_unik_dari_banyak_proses(tmp_path):
+    path = str(tmp_path / "l.db")
+    Ledger(path)                                    # skema dibuat sekali sebelum pekerja
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(4, mp_context=ctx) as ex:
+        hasil = [no for nos in ex.map(_tulis, [path] * 4, [25] * 4, [2] * 4) for no in nos]
+    assert sorted(hasil) == list(range(1, 201)) == _nomor(Ledger(path))
+
+
+def test_append_only(tmp_path):
+    ledger = Ledger(tmp_path / "l.db")
+    ledger.append(_record(), TANGGAL)
+    with pytest.raises(sqlite3.DatabaseError, match="append-only"):
+        ledger._conn.execute("UPDATE transaksi SET jt_final = 0")
+    with pytest.raises(sqlite3.DatabaseError, match="append-only"):
+        ledger._conn.execute("DELETE FROM transaksi")
+
+
+def test_rekap_inkremental_sama_dengan_pindai_ulang(tmp_path):
+    ledger = Ledger(tmp_path / "l.db")
+    for i in range(30):
+        ledger.append_many(
+            [_record(i, petugas=["Ani", "Budi", ""][i % 3], shift=["Pagi", "Malam"][i % 2],
+                     media="EDC", mdr=[None, 1.5][i % 2])] * (i % 4 + 1),
+            TANGGAL,
+        )
+    kolom = ("jumlah", "total_gesek", "total_transfer", "total_fee", "total_untung")
+    inkremental = ledger.rekap(TANGGAL)
+    ledger._conn.execute("DELETE FROM rekap_harian")
+    ledger._conn.execute(_REBUILD_REKAP)
+    ulang = ledger.rekap(TANGGAL)
+    assert len(inkremental) == len(ulang) == 3 * 2
+    for a, b in zip(inkremental, ulang):
+        assert [a[k] for k in DIMENSI_REKAP] == [b[k] for k in DIMENSI_REKAP]
+        assert [a[k] for k in kolom] == pytest.approx([b[k] for k in kolom])
+    assert sum(r["jumlah"] for r in ledger.rekap(TANGGAL, per=())) == len(_nomor(ledger))
+
+
+def test_rekap_dimensi_kosong_jadi_grup_sendiri(tmp_path):
+    ledger = Ledger(tmp_path / "l.db")
+    ledger.append_many([_record(petugas="Ani"), _record(), _record(petugas="Ani")], TANGGAL)
+    rekap = ledger.rekap(TANGGAL, per=("petugas",))
+    assert [(r["petugas"], r["jumlah"]) for r in rekap] == [("Ani", 2), (BELUM_DIISI, 1)]
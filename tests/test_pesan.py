@@ -0,0 +1,56 @@
+"""Validasi baris massal (``parse_row``) dan ketahanan ``iter_messages``."""
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from gestun.pesan import iter_messages, parse_row, read_rows
+
+
+def _baris(**kolom) -> dict:
+    return {"mode": "Express", "nominal": "1000000", **kolom}
+
+
+def test_rate_persen_dan_flat():
+    assert parse_row(_baris(rate="3.5%"))["rate_jual"] == "3.50%"
+    assert parse_row(_baris(rate="Rp 50.000"))["rate_jual"] == "Rp 50.000"
+    assert parse_row(_baris(rate="50000", metode="Bersih"))["jt_final"] > 1_000_000
+
+
+@pytest.mark.parametrize("rate", ["100%", "150%"])
+@pytest.mark.parametrize("metode", ["Kotor", "Bersih"])
+def test_rate_persen_minimal_100_ditolak(rate, metode):
+    with pytest.raises(ValueError, match="di bawah 100%"):
+        parse_row(_baris(rate=rate, metode=metode))
+
+
+@pytest.mark.parametrize("rate", ["3.5", "3,5", "2.25", "35", "999"])
+def test_rate_tanpa_persen_yang_ambigu_ditolak(rate):
+    with pytest.raises(ValueError, match="rate tidak valid"):
+        parse_row(_baris(rate=rate))
+
+
+def test_biaya_melebihi_nominal_ditolak():
+    with pytest.raises(ValueError, match="biaya melebihi nominal"):
+        parse_row(_baris(nominal="10000", rate="50000"))
+
+
+def test_kolom_lebih_ditolak():
+    csv = b"mode,nominal\nExpress,1000000,lebih\n"
+    (row,) = read_rows(io.BytesIO(csv), "x.csv")
+    with pytest.raises(ValueError, match="melebihi header"):
+        parse_row(row)
+
+
+def test_baris_buruk_tidak_menghentikan_massal():
+    csv = (
+        b"mode,nominal,nama,rate,metode\n"
+        b"Express,1000000,Ani,100%,Bersih\n"
+        b"Express,1000000,Budi,3.5,Kotor\n"
+        b"Normal,2000000,Cici,3%,Bersih\n"
+    )
+    hasil = list(iter_messages(read_rows(io.BytesIO(csv), "x.csv")))
+    assert [h["nama"] for h in hasil] == ["Ani", "Budi", "Cici"]
+    assert [bool(h["error"]) for h in hasil] == [True, True, False]
+    assert hasil[2]["no"] == 1 and "Cici" in hasil[2]["teks"]
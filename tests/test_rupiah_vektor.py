@@ -0,0 +1,60 @@
+"""Format & parse Rupiah per kolom identik per elemen dengan fungsi skalar
+:mod:`gestun.rupiah`, baik untuk array NumPy maupun Series pandas."""
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gestun.rupiah import fmt_rp, format_rupiah, format_rupiah_rp, parse_rupiah
+from gestun.rupiah_vektor import (
+    fmt_rp_kolom, format_rupiah_kolom, format_rupiah_rp_kolom, parse_rupiah_kolom,
+)
+
+_rng = random.Random(23)
+
+INT = [0, 1, -1, 999, 1_000, -1_000, 999_999, 1_000_000, 2**63 - 1, -2**63,
+       *(_rng.randrange(-10**15, 10**15) for _ in range(2_000))]
+FLOAT = [0.5, 1.5, 2.5, -0.5, 999.5, 1_234_567.49, 1_234_567.5, -1e12 - 0.5,
+         *(_rng.uniform(-1e13, 1e13) for _ in range(2_000))]
+TEKS = [
+    "", " ", "Rp", "Rp 0", "Rp 1.000", "Rp1,000,000", "Rp. 1.000", " Rp 12.345 ", "1.000,50",
+    "12 345", "-1.000", "Rp -5", "abc", "Rp 1.000 x", "١٢٣", "Rp ১০০", "9" * 19, "9" * 25,
+    "1" * 40, "\x00 1", "R p 1", None, float("nan"), 12_345,
+    *(format_rupiah(_rng.randrange(0, 10**12)) for _ in range(1_000)),
+    *(format_rupiah_rp(_rng.randrange(0, 10**12)) for _ in range(1_000)),
+]
+
+KOLOM = [
+    (format_rupiah_kolom, format_rupiah),
+    (fmt_rp_kolom, fmt_rp),
+    (format_rupiah_rp_kolom, format_rupiah_rp),
+]
+
+
+@pytest.mark.parametrize("kolom, skalar", KOLOM)
+@pytest.mark.parametrize("nilai", [INT, FLOAT], ids=["int", "float"])
+def test_format_sama_dengan_skalar(kolom, skalar, nilai):
+    dtype = np.int64 if nilai is INT else np.float64
+    harap = [skalar(x) for x in nilai]
+    assert list(kolom(np.array(nilai, dtype=dtype))) == harap
+    s = pd.Series(nilai, dtype=dtype, index=range(10, 10 + len(nilai)), name="nominal")
+    hasil = kolom(s)
+    assert list(hasil) == harap
+    assert hasil.index.equals(s.index) and hasil.name == "nominal"
+
+
+@pytest.mark.parametrize("dtype", [object, "string[python]", "string[pyarrow]"])
+def test_parse_sama_dengan_skalar(dtype):
+    teks = TEKS if dtype is object else [x for x in TEKS if isinstance(x, str)]
+    harap = [parse_rupiah(x) for x in teks]
+    assert list(parse_rupiah_kolom(pd.Series(teks, dtype=dtype))) == harap
+    if dtype is object:
+        assert list(parse_rupiah_kolom(teks)) == harap
+
+
+def test_parse_di_luar_int64_tetap_int_python():
+    hasil = parse_rupiah_kolom(["Rp 1.000", "9" * 25])
+    assert hasil.dtype == object and list(hasil) == [1_000, int("9" * 25)]
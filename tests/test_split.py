@@ -0,0 +1,78 @@
+"""Split EDC: water-filling O(N log N) sama dengan versi iteratif lama,
+rencana selalu tepat total dan menghormati limit / maks gesek per mesin."""
+from __future__ import annotations
+
+import random
+from collections import Counter
+
+import pytest
+
+from gestun.split import (
+    SAFETY_GAP, _water_fill, split_transaction_cached, split_transaction_exact,
+)
+
+
+def _water_fill_lama(total, swipe_slots):
+    caps      = [cap for _, cap in swipe_slots]
+    targets   = [0] * len(swipe_slots)
+    remaining = total
+    pending   = list(range(len(swipe_slots)))
+    while pending:
+        k = len(pending)
+        newly_capped = [i for i in pending if caps[i] * k <= remaining]
+        if newly_capped:
+            for i in newly_capped:
+                targets[i]  = caps[i]
+                remaining  -= caps[i]
+            pending = [i for i in pending if i not in set(newly_capped)]
+        else:
+            base  = remaining // k
+            extra = remaining - base * k
+            for rank, i in enumerate(pending):
+                targets[i] = base + (1 if rank < extra else 0)
+            break
+    return targets
+
+
+def _mesin(rng: random.Random, n: int):
+    return [(f"M{i}", rng.randrange(5, 100) * 1_000_000) for i in range(n)]
+
+
+def test_water_fill_sama_dengan_versi_lama():
+    rng = random.Random(2)
+    for _ in range(500):
+        slots = [(f"S{i}", rng.choice([0, rng.randrange(1, 50_000_000)])) for i in range(rng.randrange(1, 40))]
+        kap   = sum(c for _, c in slots)
+        total = rng.randrange(0, kap + 1) if kap else 0
+        assert _water_fill(total, slots) == _water_fill_lama(total, slots)
+
+
+@pytest.mark.parametrize("n_mesin", [1, 3, 12, 200])
+def test_rencana_tepat_total_dan_dalam_limit(n_mesin):
+    rng = random.Random(n_mesin)
+    for _ in range(50):
+        mesin      = _mesin(rng, n_mesin)
+        max_swipes = rng.randrange(1, 4)
+        kapasitas  = sum(lim - SAFETY_GAP for _, lim in mesin) * max_swipes
+        total      = rng.randrange(1_000_000, kapasitas + 1)
+        plan       = split_transaction_exact(total, mesin, max_swipes, seed=rng.randrange(2**32))
+
+        limit = dict(mesin)
+        assert sum(p["amount"] for p in plan) == total
+        assert all(0 < p["amount"] <= limit[p["machine"]] - SAFETY_GAP for p in plan)
+        assert max(Counter(p["machine"] for p in plan).values()) <= max_swipes
+
+
+def test_kapasitas_kurang_ditolak():
+    mesin = [("A", 10_000_000), ("B", 5_000_000)]
+    kap   = (10_000_000 + 5_000_000 - 2 * SAFETY_GAP) * 2
+    assert sum(p["amount"] for p in split_transaction_exact(kap, mesin, 2, seed=1)) == kap
+    with pytest.raises(RuntimeError, match="melebihi kapasitas"):
+        split_transaction_exact(kap + 1, mesin, 2, seed=1)
+
+
+def test_seed_dapat_direproduksi_dan_cache_sama():
+    mesin = _mesin(random.Random(9), 8)
+    a = split_transaction_exact(250_000_000, mesin, 2, seed=42)
+    assert a == split_transaction_exact(250_000_000, mesin, 2, seed=42)
+    assert a == split_transaction_cached(250_000_000, mesin, 2, seed=42)
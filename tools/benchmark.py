@@ -0,0 +1,231 @@
+"""Benchmark mesin split EDC dan kalkulator biaya, dengan pengecekan regresi.
+
+Menyapu ukuran total, jumlah mesin, heterogenitas limit dan max_swipes untuk
+``split_transaction_exact`` / ``_water_fill``, plus formatter Rupiah dan rumus
+Konven, Marketplace, Express. Semua input di-seed sehingga hasil bisa diulang.
+
+    python tools/benchmark.py                    # jalankan & bandingkan baseline
+    python tools/benchmark.py --quick            # subset cepat
+    python tools/benchmark.py --save-baseline    # tulis ulang baseline
+    python tools/benchmark.py --filter split --tolerance 2.0
+
+Keluar dengan kode 1 jika median (p50) sebuah kasus lebih lambat dari
+baseline × toleransi.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from gestun import (  # noqa: E402
+    SAFETY_GAP,
+    format_rupiah,
+    format_rupiah_rp,
+    hitung_express,
+    hitung_konven,
+    hitung_marketplace,
+    parse_rupiah,
+    sekarang,
+    split_transaction_exact,
+)
+from gestun.sla import SlaBoard  # noqa: E402
+from gestun.split import _water_fill  # noqa: E402
+
+BASELINE_PATH     = Path(__file__).with_name("benchmark_baseline.json")
+DEFAULT_TOLERANCE = 1.5
+SEED              = 20_240_601
+
+# ─── Sapuan parameter ────────────────────────────────────────────────────────
+MACHINE_COUNTS = (3, 20, 100, 500)
+MAX_SWIPES     = (2, 5, 20)
+HETEROGENITAS  = ("seragam", "campur")
+FILL_RATIOS    = (0.1, 0.5, 0.95)
+
+QUICK_MACHINES = (3, 100)
+QUICK_SWIPES   = (2, 20)
+QUICK_FILLS    = (0.5,)
+
+Case = Tuple[str, Callable[[], object]]
+
+
+def _machines(n: int, heterogenitas: str, rng: random.Random) -> List[Tuple[str, int]]:
+    if heterogenitas == "seragam":
+        return [(f"EDC {i + 1}", 50_000_000) for i in range(n)]
+    return [(f"EDC {i + 1}", rng.randrange(10, 101) * 1_000_000) for i in range(n)]
+
+
+def split_cases(quick: bool) -> Iterator[Case]:
+    rng = random.Random(SEED)
+    for n in (QUICK_MACHINES if quick else MACHINE_COUNTS):
+        for swipes in (QUICK_SWIPES if quick else MAX_SWIPES):
+            for het in HETEROGENITAS:
+                machines = _machines(n, het, rng)
+                capacity = sum(limit - SAFETY_GAP for _, limit in machines) * swipes
+                for fill in (QUICK_FILLS if quick else FILL_RATIOS):
+                    total = int(capacity * fill)
+                    slots = [
+                        (name, limit - SAFETY_GAP) for _ in range(swipes) for name, limit in machines
+                    ]
+                    tag = f"m{n}-s{swipes}-{het}-f{fill}"
+                    yield (
+                        f"split/{tag}",
+                        lambda t=total, m=machines, s=swipes: split_transaction_exact(t, m, s, seed=SEED),
+                    )
+                    yield f"water_fill/{tag}", lambda t=total, sl=slots: _water_fill(t, sl)
+
+
+def scalar_cases() -> Iterator[Case]:
+    rng     = random.Random(SEED)
+    values  = [rng.randrange(10_000, 2_000_000_000) for _ in range(1_000)]
+    strings = [format_rupiah(v) for v in values]
+
+    yield "rupiah/format_rupiah-x1000",    lambda: [format_rupiah(v) for v in values]
+    yield "rupiah/format_rupiah_rp-x1000", lambda: [format_rupiah_rp(v) for v in values]
+    yield "rupiah/parse_rupiah-x1000",     lambda: [parse_rupiah(s) for s in strings]
+    yield "biaya/konven-persen-x1000",     lambda: [hitung_konven(v, 20_000, rate_decimal=0.025) for v in values]
+    yield "biaya/konven-nominal-x1000",    lambda: [hitung_konven(v, 20_000, nominal_rate=50_000) for v in values]
+    yield "biaya/express-bersih-x1000",    lambda: [
+        hitung_express(v, 25_000, kotor=False, fee_decimal=0.03) for v in values
+    ]
+    yield "biaya/marketplace-x1000",       lambda: [hitung_marketplace(v, 8, 10, 20_000) for v in values]
+
+    # Papan SLA: 500 transaksi tertunda tersebar 0–200 menit ke belakang
+    board = SlaBoard()
+    mulai = sekarang()
+    for i in range(500):
+        board.tambah(f"R{i}", rng.choice(("Express", "Normal")), mulai=mulai - timedelta(minutes=rng.uniform(0, 200)))
+    yield "sla/ringkas-500", lambda: board.ringkas(mulai)
+    yield "sla/papan-500",   lambda: board.papan(mulai)
+
+    try:
+        import numpy as np
+
+        from gestun.konstanta import MEDIA_PENCAIRAN
+        from gestun.marketplace import solve_checkout
+        from gestun.matriks import konven_matrix
+        from gestun.rupiah_vektor import format_rupiah_kolom, format_rupiah_rp_kolom, parse_rupiah_kolom
+        from gestun.rute import rank_media
+    except ImportError:      # NumPy tidak terpasang — lewati kasus vektor
+        return
+    # Padanan kolom dari tiga kasus rupiah skalar di atas, plus 100k baris
+    arr       = np.asarray(values, dtype=np.int64)
+    besar     = np.asarray([rng.randrange(10_000, 2_000_000_000) for _ in range(100_000)], dtype=np.int64)
+    teks_besar = format_rupiah_kolom(besar)
+    yield "rupiah/format_rupiah_kolom-x1000",      lambda: format_rupiah_kolom(arr)
+    yield "rupiah/format_rupiah_rp_kolom-x1000",   lambda: format_rupiah_rp_kolom(arr)
+    yield "rupiah/parse_rupiah_kolom-x1000",       lambda: parse_rupiah_kolom(strings)
+    yield "rupiah/format_rupiah_kolom-x100000",    lambda: format_rupiah_kolom(besar)
+    yield "rupiah/parse_rupiah_kolom-x100000",     lambda: parse_rupiah_kolom(teks_besar)
+
+    yield "biaya/konven_matrix-1000x13x3", lambda: konven_matrix(values, biaya_tambahan=12_000)
+    yield "biaya/solve_checkout-1000x2x17x10", lambda: solve_checkout(
+        values, {"Tokopedia": 20_000, "Shopee": 10_000}
+    )
+
+    media = [
+        dict(m, media=f"{m['media']} #{i}", mdr=rng.randrange(50, 300) / 100)
+        for i in range(20) for m in MEDIA_PENCAIRAN
+    ]
+    yield f"rute/rank_media-{len(media)}", lambda: rank_media(15_000_000, 12_000, rate_decimal=0.035, media=media)
+
+
+# ─── Pengukuran ──────────────────────────────────────────────────────────────
+
+def _calibrate(fn: Callable[[], object], target_s: float) -> int:
+    """Jumlah panggilan per sampel agar satu sampel ≈ *target_s* detik."""
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        dt = time.perf_counter() - t0
+        if dt >= target_s or number >= 1_000_000:
+            return number
+        number = max(number * 2, int(number * target_s / max(dt, 1e-9)))
+
+
+def measure(fn: Callable[[], object], samples: int, target_s: float) -> Dict[str, float]:
+    number = _calibrate(fn, target_s)
+    per_call_us: List[float] = []
+    for _ in range(samples):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call_us.append((time.perf_counter() - t0) / number * 1e6)
+    per_call_us.sort()
+    q = statistics.quantiles(per_call_us, n=100, method="inclusive") if samples > 1 else per_call_us * 99
+    p50 = statistics.median(per_call_us)
+    return {
+        "p50_us":  round(p50, 3),
+        "p90_us":  round(q[89], 3),
+        "p99_us":  round(q[98], 3),
+        "ops_s":   round(1e6 / p50, 1) if p50 else float("inf"),
+        "number":  number,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="subset kecil untuk cek cepat")
+    parser.add_argument("--filter", default="", help="hanya kasus yang namanya memuat teks ini")
+    parser.add_argument("--samples", type=int, default=15)
+    parser.add_argument("--target-ms", type=float, default=20.0, help="durasi per sampel")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--json", type=Path, help="simpan hasil lengkap ke file JSON")
+    args = parser.parse_args(argv)
+
+    baseline: Dict[str, float] = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+
+    cases = [c for c in (*split_cases(args.quick), *scalar_cases()) if args.filter in c[0]]
+    results: Dict[str, Dict[str, float]] = {}
+    regresi: List[str] = []
+
+    print(f"{'kasus':<44} {'p50 µs':>11} {'p90 µs':>11} {'p99 µs':>11} {'ops/s':>11}  vs baseline")
+    for name, fn in cases:
+        r = measure(fn, args.samples, args.target_ms / 1_000)
+        results[name] = r
+        base = baseline.get(name)
+        banding = ""
+        if base:
+            rasio   = r["p50_us"] / base
+            banding = f"{rasio:5.2f}×"
+            if rasio > args.tolerance:
+                banding += "  REGRESI"
+                regresi.append(name)
+        print(
+            f"{name:<44} {r['p50_us']:>11.1f} {r['p90_us']:>11.1f} "
+            f"{r['p99_us']:>11.1f} {r['ops_s']:>11.1f}  {banding}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        baseline.update({name: r["p50_us"] for name, r in results.items()})
+        args.baseline.write_text(json.dumps(dict(sorted(baseline.items())), indent=2) + "\n")
+        print(f"Baseline disimpan ke {args.baseline}")
+        return 0
+    if regresi:
+        print(f"\nGAGAL: {len(regresi)} kasus melewati baseline × {args.tolerance}:")
+        for name in regresi:
+            print(f"  • {name}")
+        return 1
+    print("\nOK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""Bangun font UI lokal: Noto Sans JP 600 & 700, di-subset ke glyph yang dipakai.
+
+UI tidak lagi meng-import Google Fonts di setiap rerun; font dilayani dari
+``static/fonts/`` (``server.enableStaticServing``) dan didaftarkan sekali per
+sesi lewat ``theme.fontFaces`` di ``.streamlit/config.toml``. Skrip ini
+membuat file .woff2 tersebut:
+
+1. sumber, salah satu dari:
+
+   - ``--sumber`` variable font ``NotoSansJP[wght].ttf`` (google/fonts; tanpa
+     argumen diunduh dari GitHub), atau
+   - ``--master BOBOT=FILE`` dua kali atau lebih: instance statis Noto Sans CJK
+     JP (mis. Regular 400 & Bold 700 dari paket PyPI ``notojp-matplotlib`` /
+     ``noto-cjk-sans-jp-bold``). Master di-subset lalu digabung menjadi
+     variable font sementara (``fontTools.varLib``), sehingga bobot di antara
+     master (600) diinterpolasi dari outline resmi;
+
+2. subset ke ASCII + Latin-1 + semua karakter di literal string UI
+   (``transaksi-gestun.py`` dan ``gestun/``);
+3. instance per bobot (``wght`` 600 / 700), simpan sebagai WOFF2 (CFF).
+
+Butuh ``fonttools`` dan ``brotli`` (hanya untuk pengembang, bukan runtime)::
+
+    pip install fonttools brotli
+    python tools/build_fonts.py
+    python tools/build_fonts.py --sumber ~/Unduhan/NotoSansJP[wght].ttf
+    python tools/build_fonts.py --master 400=NotoSansCJKjp-Regular.otf --master 700=NotoSansCJKjp-Bold.otf
+
+Font berlisensi SIL OFL 1.1 (``static/fonts/OFL.txt``); commit ulang hasilnya
+setiap teks UI menambah aksara baru.
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import sys
+import tempfile
+import urllib.request
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+ROOT      = Path(__file__).resolve().parent.parent
+OUT_DIR   = ROOT / "static" / "fonts"
+SUMBER_URL = "https://github.com/google/fonts/raw/main/ofl/notosansjp/NotoSansJP%5Bwght%5D.ttf"
+BOBOT     = (600, 700)
+NAMA_FILE = "noto-sans-jp-{bobot}.woff2"
+
+
+def _literal(path: Path) -> Iterable[str]:
+    for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            yield node.value
+
+
+def karakter_ui(berkas: Optional[List[Path]] = None) -> str:
+    """ASCII tercetak + Latin-1 + karakter di literal string sumber UI."""
+    berkas = berkas or [ROOT / "transaksi-gestun.py", *sorted((ROOT / "gestun").glob("*.py"))]
+    kar: Set[str] = {chr(c) for c in range(0x20, 0x7F)} | {chr(c) for c in range(0xA0, 0x100)}
+    for p in berkas:
+        for s in _literal(p):
+            kar.update(c for c in s if c.isprintable())
+    return "".join(sorted(kar))
+
+
+def _subset(font, teks: str, woff2: bool = False) -> None:
+    from fontTools import subset
+
+    opsi = subset.Options()
+    opsi.layout_features = ["kern", "liga", "calt"]
+    opsi.name_IDs        = [0, 1, 2]       # hak cipta (syarat OFL) + family/subfamily
+    opsi.hinting         = False
+    opsi.desubroutinize  = True            # master CFF: charstring sebanding untuk varLib
+    if woff2:
+        opsi.flavor = "woff2"
+    sub = subset.Subsetter(opsi)
+    sub.populate(text=teks)
+    sub.subset(font)
+
+
+def gabung_master(master: Dict[int, Path], teks: str):
+    """Master statis ``{bobot: file}`` → variable font (sumbu ``wght``), di-subset dulu."""
+    from fontTools import varLib
+    from fontTools.designspaceLib import AxisDescriptor, DesignSpaceDocument, SourceDescriptor
+    from fontTools.ttLib import TTFont
+
+    if len(master) < 2:
+        raise SystemExit("--master butuh minimal dua bobot, mis. 400=Regular.otf 700=Bold.otf")
+    ds   = DesignSpaceDocument()
+    axis = AxisDescriptor()
+    axis.tag, axis.name = "wght", "Weight"
+    axis.minimum, axis.default, axis.maximum = min(master), min(master), max(master)
+    ds.addAxis(axis)
+    with tempfile.TemporaryDirectory() as tmp:
+        for w, path in sorted(master.items()):
+            font = TTFont(path)
+            _subset(font, teks)
+            out = Path(tmp) / f"master-{w}{path.suffix}"
+            font.save(out)
+            src = SourceDescriptor()
+            src.path, src.location = str(out), {"Weight": w}
+            ds.addSource(src)
+        vf, _, _ = varLib.build(ds)      # galat jika outline master tidak sebanding
+    return vf
+
+
+def bangun(
+    sumber: Optional[Path] = None,
+    out_dir: Path = OUT_DIR,
+    bobot: Iterable[int] = BOBOT,
+    master: Optional[Dict[int, Path]] = None,
+) -> List[Path]:
+    try:
+        from fontTools.ttLib import TTFont
+        from fontTools.varLib.instancer import instantiateVariableFont
+    except ImportError as e:  # pragma: no cover - alat pengembang
+        raise SystemExit(f"Butuh fontTools + brotli: pip install fonttools brotli ({e})")
+
+    teks = karakter_ui()
+    vf   = gabung_master(master, teks) if master else None
+    out_dir.mkdir(parents=True, exist_ok=True)
+    hasil: List[Path] = []
+    for w in bobot:
+        font = vf if vf is not None else TTFont(sumber)
+        if "fvar" in font:
+            font = instantiateVariableFont(font, {"wght": w}, downgradeCFF2=True)
+        _subset(font, teks, woff2=True)
+        font.flavor = "woff2"
+        out = out_dir / NAMA_FILE.format(bobot=w)
+        font.save(out)
+        hasil.append(out)
+    return hasil
+
+
+def _master(arg: str) -> tuple:
+    w, sep, path = arg.partition("=")
+    if not sep or not w.isdigit():
+        raise argparse.ArgumentTypeError(f"format BOBOT=FILE, mis. 700=Bold.otf (bukan '{arg}')")
+    return int(w), Path(path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sumber", type=Path, help="TTF sumber (default: unduh Noto Sans JP variable)")
+    parser.add_argument("--master", type=_master, action="append", default=[],
+                        help="master statis BOBOT=FILE (≥ 2 kali), menggantikan --sumber")
+    parser.add_argument("--out", type=Path, default=OUT_DIR)
+    args = parser.parse_args(argv)
+
+    sumber = args.sumber
+    if sumber is None and not args.master:
+        sumber = Path(tempfile.gettempdir()) / "NotoSansJP-wght.ttf"
+        if not sumber.exists():
+            print(f"Mengunduh {SUMBER_URL} …")
+            urllib.request.urlretrieve(SUMBER_URL, sumber)
+
+    for out in bangun(sumber, args.out, master=dict(args.master) or None):
+        print(f"{out.relative_to(ROOT) if out.is_relative_to(ROOT) else out}: {out.stat().st_size / 1024:.1f} KB")
+    print(f"{len(karakter_ui())} karakter di-subset.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
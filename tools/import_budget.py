@@ -0,0 +1,77 @@
+"""Ukur waktu import paket inti ``gestun`` dan gagal jika melebihi anggaran.
+
+Setiap percobaan memakai interpreter baru (``python -X importtime``) agar
+tidak ada modul yang sudah ter-cache. Juga memastikan Streamlit / pandas /
+NumPy tidak ikut ter-import oleh inti.
+
+    python tools/import_budget.py                 # anggaran default 25 ms
+    python tools/import_budget.py --budget-ms 20 --runs 10
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+ROOT          = Path(__file__).resolve().parent.parent
+PACKAGE       = "gestun"
+DEFAULT_MS    = 25.0
+MODUL_BERAT   = ("streamlit", "pandas", "numpy")
+
+_PROBE = (
+    f"import sys; import {PACKAGE}; "
+    f"berat = [m for m in {MODUL_BERAT!r} if m in sys.modules]; "
+    "print(','.join(berat))"
+)
+
+
+def ukur_sekali() -> tuple[float, List[str]]:
+    """Satu import dingin: (cumulative ms untuk paket, daftar modul berat yang ikut ter-import)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative_us = None
+    for line in proc.stderr.splitlines():
+        # format: "import time: <self us> | <cumulative us> | <nama modul>"
+        if not line.startswith("import time:"):
+            continue
+        cols = [c.strip() for c in line[len("import time:"):].split("|")]
+        if len(cols) == 3 and cols[2] == PACKAGE:
+            cumulative_us = int(cols[1])
+    if cumulative_us is None:
+        raise RuntimeError(f"Baris importtime untuk '{PACKAGE}' tidak ditemukan.")
+    berat = [m for m in proc.stdout.strip().split(",") if m]
+    return cumulative_us / 1_000, berat
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    hasil = [ukur_sekali() for _ in range(args.runs)]
+    waktu = [ms for ms, _ in hasil]
+    berat = sorted({m for _, mods in hasil for m in mods})
+    median = statistics.median(waktu)
+
+    print(
+        f"import {PACKAGE}: median {median:.2f} ms, min {min(waktu):.2f} ms, "
+        f"max {max(waktu):.2f} ms ({args.runs} run, anggaran {args.budget_ms:.0f} ms)"
+    )
+    if berat:
+        print(f"GAGAL: inti ikut meng-import {', '.join(berat)}")
+        return 1
+    if median > args.budget_ms:
+        print("GAGAL: melebihi anggaran waktu import")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
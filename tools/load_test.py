@@ -0,0 +1,534 @@
+"""Uji beban: berapa kasir (sesi) yang sanggup dilayani satu proses Streamlit.
+
+Menjalankan ``streamlit run transaksi-gestun.py`` di port bebas (atau memakai
+server yang sudah jalan lewat ``--url``), lalu membuka N sesi headless
+bersamaan lewat websocket ``/_stcore/stream`` — protokol yang sama dengan
+browser. Tiap sesi menjalani alur kasir bergiliran di kelima menu (pilih
+menu → isi widget → klik tombol) dengan jeda berpikir acak di antara
+interaksi; widget di dalam fragment memicu rerun fragment, papan SLA
+Countdown ikut tersegarkan otomatis seperti di browser. Jumlah sesi dinaikkan
+bertahap (sesi lama tetap hidup) dan untuk tiap tingkat dilaporkan:
+
+- persentil latensi rerun (kirim interaksi → ``script_finished``), p50/p95/p99;
+- throughput rerun/detik dan jumlah galat (exception, timeout, koneksi);
+- RSS proses server dan pertambahannya per sesi (Linux, ``/proc``);
+- titik jenuh: tingkat pertama dengan p95 di atas ``--slo-ms`` atau
+  throughput yang tak lagi naik walau sesi bertambah.
+
+Latensi dan throughput berasal dari sesi & server di mesin yang sama; jika
+CPU klien mendekati 100 % satu core, angka terakhir ikut dibatasi klien.
+Data ledger/pemakaian ditulis ke direktori sementara.
+
+    python tools/load_test.py                           # 1,2,4,8,16,32 sesi × 15 s
+    python tools/load_test.py --sesi 4,8,16 --durasi 30 --slo-ms 300 --kasir 40
+    python tools/load_test.py --url ws://127.0.0.1:8501 --pid 1234   # server sendiri
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+ROOT   = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / "transaksi-gestun.py"
+
+MENU = ("Input Data", "Konven", "Marketplace", "Countdown", "Proporsional")
+
+SELESAI_OK = (
+    "FINISHED_SUCCESSFULLY",
+    "FINISHED_FRAGMENT_RUN_SUCCESSFULLY",
+)
+
+# (menu, jenis rerun, latensi ms, galat atau "")
+Sampel = Tuple[str, str, float, str]
+
+
+# ─── Pencatat ────────────────────────────────────────────────────────────────
+
+class Pencatat:
+    """Kumpulan sampel latensi; hanya dicatat selama jendela ukur aktif."""
+
+    def __init__(self) -> None:
+        self.sampel: List[Sampel] = []
+        self.aktif     = False
+        self.terhubung = 0                      # sesi yang sudah selesai render awal
+
+    def catat(self, menu: str, jenis: str, ms: float, galat: str = "") -> None:
+        if self.aktif:
+            self.sampel.append((menu, jenis, ms, galat))
+
+    def mulai(self) -> None:
+        self.sampel = []
+        self.aktif  = True
+
+    def ambil(self) -> List[Sampel]:
+        self.aktif = False
+        return self.sampel
+
+
+def _persentil(data: List[float], p: int) -> float:
+    if not data:
+        return float("nan")
+    if len(data) == 1:
+        return data[0]
+    return statistics.quantiles(data, n=100, method="inclusive")[p - 1]
+
+
+def ringkas(sampel: List[Sampel], detik: float) -> Dict[str, float]:
+    ms = sorted(s[2] for s in sampel if not s[3])
+    return {
+        "rerun":  len(sampel),
+        "rps":    len(sampel) / detik if detik else 0.0,
+        "p50":    _persentil(ms, 50),
+        "p95":    _persentil(ms, 95),
+        "p99":    _persentil(ms, 99),
+        "maks":   ms[-1] if ms else float("nan"),
+        "galat":  sum(1 for s in sampel if s[3]),
+    }
+
+
+# ─── Klien headless ──────────────────────────────────────────────────────────
+
+class Sesi:
+    """Satu tab browser: websocket, state widget yang dikirim ulang setiap
+    rerun (seperti frontend), dan pohon elemen hasil render terakhir."""
+
+    def __init__(self, url: str, pencatat: Pencatat, rng: random.Random,
+                 jeda: float, berhenti: asyncio.Event, timeout: float) -> None:
+        self.url      = url.rstrip("/") + "/_stcore/stream"
+        self.pencatat = pencatat
+        self.rng      = rng
+        self.jeda     = jeda
+        self.berhenti = berhenti
+        self.timeout  = timeout
+        self.menu     = ""
+        self.ws       = None
+        self.state: Dict[str, object]   = {}    # widget id → WidgetState
+        self.fragmen: Dict[str, str]    = {}    # widget id → fragment id
+        self.auto: Dict[str, Tuple[float, float]] = {}   # fragment id → (run_every s, jatuh tempo)
+        self._pesan: Dict[tuple, object] = {}   # delta_path → ForwardMsg elemen/blok
+        self.pohon    = None
+
+    async def buka(self) -> None:
+        from websockets.asyncio.client import connect
+
+        self.ws = await connect(self.url, subprotocols=["streamlit"], max_size=None)
+        self.state, self.fragmen, self.auto, self._pesan = {}, {}, {}, {}
+        self.menu = MENU[0]
+        await self.rerun("awal")
+
+    async def tutup(self) -> None:
+        if self.ws is not None:
+            await self.ws.close()
+            self.ws = None
+
+    async def rerun(self, jenis: str, fragment_id: str = "", auto: bool = False) -> None:
+        """Kirim ``rerun_script`` dan tunggu ``script_finished``; catat latensinya."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        cs  = msg.rerun_script
+        cs.widget_states.widgets.extend(self.state.values())
+        cs.fragment_id   = fragment_id
+        cs.is_auto_rerun = auto
+
+        t0 = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        delta: List[ForwardMsg] = []
+        while True:
+            fm = ForwardMsg()
+            fm.ParseFromString(await asyncio.wait_for(self.ws.recv(), self.timeout))
+            tipe = fm.WhichOneof("type")
+            if tipe == "delta":
+                delta.append(fm)
+            elif tipe == "auto_rerun":
+                fid, interval = fm.auto_rerun.fragment_id, fm.auto_rerun.interval
+                if self.auto.get(fid, (None,))[0] != interval:
+                    self.auto[fid] = (interval, time.monotonic() + interval)
+            elif tipe == "script_finished":
+                status = ForwardMsg.ScriptFinishedStatus.Name(fm.script_finished)
+                if status == "FINISHED_EARLY_FOR_RERUN":
+                    continue
+                break
+        ms = (time.perf_counter() - t0) * 1_000
+
+        # Trigger (tombol) hanya berlaku satu rerun, seperti di browser
+        for wid in [w for w, s in self.state.items() if "trigger" in (s.WhichOneof("value") or "")]:
+            del self.state[wid]
+        self._perbarui(delta, fragment_id)
+        galat = "" if status in SELESAI_OK else status
+        if not galat and self.pohon.exception:
+            galat = self.pohon.exception[0].message.splitlines()[0][:120]
+        self.pencatat.catat(self.menu, jenis, ms, galat)
+
+    def _perbarui(self, delta: list, fragment_id: str) -> None:
+        from streamlit.testing.v1.element_tree import Widget, parse_tree_from_messages
+
+        # Rerun fragment hanya mengirim delta bagian fragment → timpa per path
+        if not fragment_id:
+            self._pesan = {}
+        for m in delta:
+            tipe = m.delta.WhichOneof("type")
+            if tipe not in ("new_element", "add_block"):
+                continue
+            path = tuple(m.metadata.delta_path)
+            if fragment_id:                      # isi lama di bawah path ini basi
+                for k in [k for k in self._pesan if k[:len(path)] == path]:
+                    del self._pesan[k]
+            self._pesan[path] = m
+            if tipe == "new_element":
+                elemen = m.delta.new_element
+                wid    = getattr(getattr(elemen, elemen.WhichOneof("type")), "id", "")
+                if wid:
+                    self.fragmen[wid] = m.delta.fragment_id
+        self.pohon = parse_tree_from_messages([self._pesan[k] for k in sorted(self._pesan)])
+        # Fragment bersarang mendapat id baru tiap induknya dijalankan ulang
+        aktif     = {m.delta.fragment_id for m in self._pesan.values()}
+        self.auto = {f: a for f, a in self.auto.items() if f in aktif}
+        ada = {n.id for n in self.pohon if isinstance(n, Widget)}
+        self.state = {w: s for w, s in self.state.items() if w in ada}
+
+    async def ubah(self, jenis: str, cari: Callable, nilai: object = None) -> None:
+        """Ubah satu widget (dicari di pohon terakhir) lalu rerun seperti browser.
+
+        *nilai* boleh callable ``f(widget)``; tombol cukup tanpa nilai.
+        """
+        node = cari(self.pohon)
+        self.state[node.id] = _state_widget(node, nilai(node) if callable(nilai) else nilai)
+        await self.rerun(jenis, self.fragmen.get(node.id, ""))
+
+    async def pilih_menu(self, menu: str) -> None:
+        self.menu = menu
+        await self.ubah("menu", lambda t: t.sidebar.selectbox[0], menu)
+
+    async def tunggu(self, kali: float = 1.0) -> None:
+        """Jeda berpikir kasir; fragment ``run_every`` tetap disegarkan."""
+        akhir = time.monotonic() + (self.rng.expovariate(1 / (self.jeda * kali)) if self.jeda > 0 else 0.0)
+        while not self.berhenti.is_set():
+            fid, (interval, tempo) = min(self.auto.items(), key=lambda kv: kv[1][1], default=("", (0.0, math.inf)))
+            bangun = min(akhir, tempo)
+            try:
+                await asyncio.wait_for(self.berhenti.wait(), max(0.0, bangun - time.monotonic()))
+                return
+            except asyncio.TimeoutError:
+                pass
+            if bangun == akhir:
+                return
+            self.auto[fid] = (interval, tempo + interval)
+            await self.rerun("auto", fid, auto=True)
+
+
+def _state_widget(node, nilai: object):
+    """``WidgetState`` seperti yang dikirim frontend untuk interaksi *nilai*."""
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    ws   = WidgetState(id=node.id)
+    tipe = type(node).__name__
+    if tipe == "Button":
+        ws.trigger_value = True
+    elif tipe in ("Checkbox", "Toggle"):
+        ws.bool_value = bool(nilai)
+    elif tipe == "NumberInput":
+        ws.double_value = float(nilai)
+    elif tipe in ("TextInput", "Selectbox"):
+        ws.string_value = str(nilai)
+    else:
+        raise TypeError(f"Widget {tipe} belum didukung uji beban.")
+    return ws
+
+
+# ─── Alur kasir per menu ─────────────────────────────────────────────────────
+
+def _label(elemen, label: str):
+    for w in elemen:
+        if w.label == label:
+            return w
+    raise LookupError(f"Widget '{label}' tidak ditemukan.")
+
+
+def _nominal(rng: random.Random, kecil: int, besar: int, kelipatan: int) -> int:
+    return rng.randrange(kecil // kelipatan, besar // kelipatan + 1) * kelipatan
+
+
+async def alur_input_data(s: Sesi) -> None:
+    await s.ubah("fragment", lambda t: t.text_input(key="n_norm"), f"Nasabah {s.rng.randrange(1_000)}")
+    await s.tunggu()
+    await s.ubah("fragment", lambda t: _label(t.number_input, "Jumlah Transaksi (Rp)"),
+                 _nominal(s.rng, 1_000_000, 50_000_000, 50_000))
+    await s.tunggu()
+    await s.ubah("fragment", lambda t: _label(t.button, "Generate WhatsApp Normal"))
+
+
+async def alur_konven(s: Sesi) -> None:
+    # Kuotasi di browser tidak bisa diketik klien headless → jalur server
+    # (satu rerun per nominal, sama seperti sinkron komponen saat berhenti)
+    if not any(w.key == "nominal_input" for w in s.pohon.text_input):
+        await s.ubah("fragment", lambda t: t.toggle(key="konven_live_aktif"), False)
+    await s.ubah("fragment", lambda t: t.selectbox(key="menu1_preset"),
+                 lambda w: s.rng.choice(w.options[1:]))
+    for _ in range(s.rng.randint(1, 3)):
+        await s.tunggu()
+        await s.ubah("fragment", lambda t: t.text_input(key="nominal_input"),
+                     f"{_nominal(s.rng, 500_000, 20_000_000, 50_000):,}".replace(",", "."))
+
+
+async def alur_marketplace(s: Sesi) -> None:
+    await s.ubah("fragment", lambda t: t.text_input(key="nominal_marketplace"),
+                 str(_nominal(s.rng, 100_000, 10_000_000, 1_000)))
+    await s.tunggu()
+    await s.ubah("fragment", lambda t: _label(t.checkbox, "Biaya Administrasi Nasabah Baru (Rp 10.000)"),
+                 s.rng.random() < 0.5)
+    await s.tunggu()
+    await s.ubah("fragment", lambda t: _label(t.button, "Hitung Estimasi"))
+
+
+async def alur_countdown(s: Sesi) -> None:
+    await s.ubah("fragment", lambda t: _label(t.button, "Hitung Selisih"))
+    await s.tunggu(kali=5)                      # memantau papan SLA (segar otomatis)
+
+
+async def alur_proporsional(s: Sesi) -> None:
+    await s.ubah("fragment", lambda t: t.number_input[0], _nominal(s.rng, 50_000_000, 300_000_000, 10_000_000))
+    await s.tunggu()
+    await s.ubah("fragment", lambda t: _label(t.button, "Hitung Pembagian"))
+
+
+ALUR: Dict[str, Callable[[Sesi], Awaitable[None]]] = {
+    "Input Data":   alur_input_data,
+    "Konven":       alur_konven,
+    "Marketplace":  alur_marketplace,
+    "Countdown":    alur_countdown,
+    "Proporsional": alur_proporsional,
+}
+
+
+async def jalankan_sesi(i: int, url: str, pencatat: Pencatat, berhenti: asyncio.Event,
+                        jeda: float, seed: int, timeout: float) -> None:
+    """Satu kasir: menu bergiliran mulai dari menu ke-i, sampai ``berhenti``."""
+    s = Sesi(url, pencatat, random.Random(seed + i), jeda, berhenti, timeout)
+    k = i
+    while not berhenti.is_set():
+        try:
+            if s.ws is None:
+                baru = s.pohon is None
+                await s.buka()
+                pencatat.terhubung += baru
+            menu = MENU[k % len(MENU)]
+            k   += 1
+            await s.pilih_menu(menu)
+            await s.tunggu()
+            await ALUR[menu](s)
+            await s.tunggu()
+        except Exception as e:               # timeout / koneksi putus / widget hilang
+            pencatat.catat(s.menu, "galat", 0.0, f"{type(e).__name__}: {e}"[:120])
+            await s.tutup()
+            await asyncio.sleep(1)
+    await s.tutup()
+
+
+# ─── Server & memori ─────────────────────────────────────────────────────────
+
+def rss_mb(pid: Optional[int]) -> Optional[float]:
+    """RSS proses (MB) dari ``/proc``; None jika tidak tersedia."""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for baris in f:
+                if baris.startswith("VmRSS:"):
+                    return int(baris.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def _port_bebas() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def mulai_server(port: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.setdefault("GESTUN_DATA_DIR", tempfile.mkdtemp(prefix="gestun_beban_"))
+    env["GESTUN_METRICS_PORT"] = "0"            # jangan bentrok dengan instance lain
+    proses = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(SCRIPT),
+         "--server.headless", "true", "--server.port", str(port),
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false",
+         "--logger.level", "error"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    batas = time.monotonic() + 60
+    while time.monotonic() < batas:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return proses
+        except OSError:
+            if proses.poll() is not None:
+                break
+            time.sleep(0.2)
+    proses.kill()
+    raise RuntimeError("Server Streamlit gagal dijalankan.")
+
+
+# ─── Orkestrasi ──────────────────────────────────────────────────────────────
+
+async def uji(
+    url: str, pid: Optional[int], tingkat: List[int], args: argparse.Namespace,
+) -> Tuple[List[Dict], List[Sampel], Optional[float]]:
+    """Naikkan jumlah sesi bertahap; (ringkasan per tingkat, sampel tingkat
+    terakhir, RSS server setelah pemanasan)."""
+    pencatat = Pencatat()
+    berhenti = asyncio.Event()
+
+    # Pemanasan: satu sesi menjalani kelima menu (import, cache) lalu ditutup
+    hangat = Sesi(url, pencatat, random.Random(args.seed), 0.0, berhenti, args.timeout)
+    await hangat.buka()
+    for menu in MENU:
+        await hangat.pilih_menu(menu)
+        await ALUR[menu](hangat)
+    await hangat.tutup()
+    rss_awal = rss_mb(pid)
+
+    tugas: List[asyncio.Task] = []
+    hasil: List[Dict] = []
+    sampel: List[Sampel] = []
+    for n in tingkat:
+        while len(tugas) < n:
+            tugas.append(asyncio.create_task(jalankan_sesi(
+                len(tugas), url, pencatat, berhenti, args.jeda, args.seed, args.timeout)))
+        batas = time.monotonic() + args.timeout
+        while pencatat.terhubung < n and time.monotonic() < batas:
+            await asyncio.sleep(0.1)
+        await asyncio.sleep(args.pemanasan)
+        pencatat.mulai()
+        cpu0, t0 = time.process_time(), time.perf_counter()
+        await asyncio.sleep(args.durasi)
+        sampel = pencatat.ambil()
+        detik  = time.perf_counter() - t0
+        r      = ringkas(sampel, detik)
+        rss    = rss_mb(pid)
+        r.update(
+            sesi=n,
+            cpu_klien=(time.process_time() - cpu0) / detik * 100,
+            rss=rss,
+            mb_sesi=(rss - rss_awal) / n if rss is not None and rss_awal is not None else None,
+        )
+        hasil.append(r)
+        cetak_tingkat(r)
+
+    berhenti.set()
+    await asyncio.gather(*tugas, return_exceptions=True)
+    return hasil, sampel, rss_awal
+
+
+def titik_jenuh(hasil: List[Dict], slo_ms: float) -> Tuple[Optional[int], Optional[str]]:
+    """(sesi maksimum yang masih sehat, alasan jenuh pada tingkat berikutnya);
+    alasan None jika tingkat tertinggi pun belum jenuh."""
+    sehat: Optional[int] = None
+    for i, r in enumerate(hasil):
+        if r["p95"] > slo_ms:
+            return sehat, f"p95 {r['p95']:.0f} ms > SLO {slo_ms:.0f} ms pada {r['sesi']} sesi"
+        if r["galat"]:
+            return sehat, f"{r['galat']} galat pada {r['sesi']} sesi"
+        if i and r["rps"] < hasil[i - 1]["rps"] * 1.1 and r["sesi"] > hasil[i - 1]["sesi"]:
+            return sehat, f"throughput berhenti naik pada {r['sesi']} sesi ({r['rps']:.1f} rerun/s)"
+        sehat = r["sesi"]
+    return sehat, None
+
+
+def _f(x: Optional[float], lebar: int, desimal: int = 0) -> str:
+    return f"{'-':>{lebar}}" if x is None or x != x else f"{x:>{lebar}.{desimal}f}"
+
+
+def cetak_tingkat(r: Dict) -> None:
+    print(
+        f"{r['sesi']:>5}{r['rerun']:>8}{_f(r['rps'], 9, 1)}{_f(r['p50'], 8)}{_f(r['p95'], 8)}"
+        f"{_f(r['p99'], 8)}{_f(r['maks'], 8)}{r['galat']:>7}{_f(r['rss'], 9)}{_f(r['mb_sesi'], 9, 1)}"
+        f"{_f(r['cpu_klien'], 8)}",
+        flush=True,
+    )
+
+
+def cetak_per_menu(sampel: List[Sampel], sesi: int) -> None:
+    print(f"\nPer menu pada {sesi} sesi:")
+    print(f"{'menu':<14}{'jenis':<10}{'rerun':>7}{'p50':>8}{'p95':>8}{'p99':>8}{'galat':>7}")
+    urutan = {m: i for i, m in enumerate(MENU)}
+    kelompok: Dict[Tuple[str, str], List[Sampel]] = {}
+    for s in sampel:
+        kelompok.setdefault((s[0], s[1]), []).append(s)
+    for (menu, jenis), isi in sorted(kelompok.items(), key=lambda kv: (urutan.get(kv[0][0], len(MENU)), kv[0][1])):
+        r = ringkas(isi, 0)
+        print(f"{menu:<14}{jenis:<10}{r['rerun']:>7}{_f(r['p50'], 8)}{_f(r['p95'], 8)}{_f(r['p99'], 8)}{r['galat']:>7}")
+    galat = sorted({s[3] for s in sampel if s[3]})
+    for g in galat[:5]:
+        print(f"  galat: {g}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sesi", default="1,2,4,8,16,32", help="tingkat jumlah sesi, dipisah koma")
+    parser.add_argument("--durasi", type=float, default=15.0, help="detik pengukuran per tingkat")
+    parser.add_argument("--pemanasan", type=float, default=3.0, help="detik setelah semua sesi terhubung, tidak diukur")
+    parser.add_argument("--jeda", type=float, default=1.0, help="rata-rata jeda berpikir antar interaksi (s)")
+    parser.add_argument("--slo-ms", type=float, default=500.0, help="batas p95 latensi rerun")
+    parser.add_argument("--kasir", type=int, help="jumlah kasir puncak untuk saran jumlah worker")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--url", help="server yang sudah jalan, mis. ws://127.0.0.1:8501")
+    parser.add_argument("--pid", type=int, help="PID server --url untuk mengukur RSS")
+    args = parser.parse_args(argv)
+    tingkat = sorted({int(x) for x in args.sesi.split(",") if x.strip()})
+
+    proses = None
+    if args.url:
+        url, pid = args.url, args.pid
+    else:
+        port   = _port_bebas()
+        proses = mulai_server(port)
+        url, pid = f"ws://127.0.0.1:{port}", proses.pid
+    print(f"server {url}  jeda {args.jeda:g} s  {args.durasi:g} s/tingkat  SLO p95 {args.slo_ms:g} ms")
+    print(f"{'sesi':>5}{'rerun':>8}{'rerun/s':>9}{'p50':>8}{'p95':>8}{'p99':>8}{'maks':>8}"
+          f"{'galat':>7}{'RSS MB':>9}{'MB/sesi':>9}{'CPU% kl':>8}")
+    try:
+        hasil, sampel, rss_awal = asyncio.run(uji(url, pid, tingkat, args))
+    finally:
+        if proses is not None:
+            proses.terminate()
+            proses.wait(10)
+
+    cetak_per_menu(sampel, tingkat[-1])
+    sehat, alasan = titik_jenuh(hasil, args.slo_ms)
+    print(f"\nRSS server setelah pemanasan: {_f(rss_awal, 0)} MB")
+    print(f"Titik jenuh: {alasan or 'belum jenuh pada tingkat tertinggi'}.")
+    if sehat is None:
+        print("Satu proses tidak memenuhi SLO bahkan pada tingkat terendah.")
+        return 1
+    worker = math.ceil(args.kasir / sehat) if args.kasir else 0
+    if alasan is None:
+        # Kapasitas sebenarnya belum diketahui: angka hanya batas bawah / atas
+        print(f"Satu proses melayani ≥ {sehat} sesi (belum jenuh); uji tingkat lebih tinggi.")
+        if args.kasir:
+            print(f"{args.kasir} kasir → paling banyak {worker} worker.")
+    else:
+        print(f"Satu proses melayani ±{sehat} sesi dalam SLO.")
+        if args.kasir:
+            print(f"{args.kasir} kasir → minimal {worker} worker.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Cek paritas kuotasi Konven di browser (``gestun/web/konven_live.js``) dengan Python.
+
+Menjalankan fungsi JS yang sama persis dengan yang dimuat komponen
+(``hitungKonven``, ``formatRupiah``, ``formatRibuan``) di Node.js terhadap
+kasus acak + kasus tepi, lalu membandingkannya dengan
+:func:`~gestun.biaya.hitung_konven`, :func:`~gestun.rupiah.format_rupiah`
+dan :func:`~gestun.rupiah.format_ribuan`:
+
+- semua preset rate, rate custom 0,01–99 %, dan rate nominal (Rp);
+- semua layanan transfer × kombinasi biaya tambahan;
+- nominal 1 Rp hingga ``MAKS_DIGIT`` digit, termasuk nominal yang fee-nya tepat ,5 (half-to-even);
+- teks ketikan acak (titik, huruf, nol di depan) untuk format input.
+
+    python tools/parity_konven_js.py              # 20.000 kasus
+    python tools/parity_konven_js.py --kasus 200000 --seed 3
+
+Gagal (exit 1) jika ada satu saja perbedaan; dilewati jika ``node`` tidak ada.
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from gestun.biaya import hitung_konven  # noqa: E402
+from gestun.konstanta import BIAYA_TAMBAHAN_LIST, PRESET_RATE_KONVEN, SVCS_KONVEN  # noqa: E402
+from gestun.konven_live import MAKS_DIGIT, WEB, param_konven  # noqa: E402
+from gestun.rupiah import format_ribuan, format_rupiah  # noqa: E402
+
+KOLOM = ("k_fee", "k_terima", "b_transaksi", "total_potongan_kotor", "total_biaya_bersih")
+
+RUNNER = """
+import { readFileSync } from "node:fs";
+const m = await import(process.argv[2]);
+const { kuotasi, teks } = JSON.parse(readFileSync(process.argv[3], "utf8"));
+const hasil = kuotasi.map(([n, p]) => {
+  const h = m.hitungKonven(n, p);
+  return { ...h, kartu: [m.formatRupiah(Math.max(0, h.k_terima)), m.formatRupiah(h.b_transaksi)] };
+});
+process.stdout.write(JSON.stringify({ hasil, ribuan: teks.map(m.formatRibuan) }));
+"""
+
+
+def _nominal(rng: random.Random) -> int:
+    if rng.random() < 0.3:
+        return rng.randrange(1, 5_000)                         # banyak fee tepat ,5
+    return int(10 ** rng.uniform(3, MAKS_DIGIT)) // 1 or 1
+
+
+def buat_kasus(jumlah: int, seed: int) -> Dict[str, List]:
+    rng    = random.Random(seed)
+    biaya  = sorted({
+        s["cost"] + sum(BIAYA_TAMBAHAN_LIST[b] for b in kombinasi)
+        for s in SVCS_KONVEN
+        for r in range(len(BIAYA_TAMBAHAN_LIST) + 1)
+        for kombinasi in itertools.combinations(BIAYA_TAMBAHAN_LIST, r)
+    })
+    rates  = [p / 100.0 for p in PRESET_RATE_KONVEN]
+    kuotasi = []
+    for i in range(jumlah):
+        b = rng.choice(biaya)
+        if i % 3 == 2:                                          # rate nominal (Rp)
+            p = param_konven("", b, nominal_rate=rng.choice((0, 5_000, rng.randrange(0, 500_000))))
+        else:
+            pct = rng.choice(rates) if i % 3 == 0 else round(rng.uniform(0.01, 99.0), 2) / 100.0
+            p = param_konven("", b, rate_decimal=pct)
+        kuotasi.append([_nominal(rng), p])
+
+    alfabet = "0123456789..,  Rpabc"
+    teks = [
+        "".join(rng.choice(alfabet) for _ in range(rng.randrange(0, 25)))
+        for _ in range(max(1, jumlah // 10))
+    ] + ["", "000", "0001.000", "1.2.3.4", "Rp 1.000.000", "9" * MAKS_DIGIT]
+    return {"kuotasi": kuotasi, "teks": teks}
+
+
+def jalankan_node(kasus: Dict[str, List]) -> Dict[str, List]:
+    with tempfile.TemporaryDirectory() as tmp:
+        modul = Path(tmp) / "konven_live.mjs"                   # .mjs: dimuat sebagai ES module
+        modul.write_text((WEB / "konven_live.js").read_text(encoding="utf-8"), encoding="utf-8")
+        data = Path(tmp) / "kasus.json"
+        data.write_text(json.dumps(kasus), encoding="utf-8")
+        keluar = subprocess.run(
+            ["node", "--input-type=module", "-", modul.as_uri(), str(data)],
+            input=RUNNER, capture_output=True, text=True, check=True,
+        )
+    return json.loads(keluar.stdout)
+
+
+def bandingkan(kasus: Dict[str, List], js: Dict[str, List]) -> List[str]:
+    beda: List[str] = []
+    for (n, p), h in zip(kasus["kuotasi"], js["hasil"]):
+        if p["persen"]:
+            py = hitung_konven(n, p["biaya"], rate_decimal=p["rate"])
+        else:
+            py = hitung_konven(n, p["biaya"], nominal_rate=p["flat"])
+        kartu = [format_rupiah(max(0, py["k_terima"])), format_rupiah(py["b_transaksi"])]
+        if [py[k] for k in KOLOM] != [h[k] for k in KOLOM] or kartu != h["kartu"]:
+            arg = f"rate={p['rate']!r}" if p["persen"] else f"flat={p['flat']}"
+            beda.append(f"n={n} biaya={p['biaya']} {arg}: py={py} kartu={kartu} js={h}")
+    for t, h in zip(kasus["teks"], js["ribuan"]):
+        if format_ribuan(t) != h:
+            beda.append(f"format_ribuan({t!r}): py={format_ribuan(t)!r} js={h!r}")
+    return beda
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kasus", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    if shutil.which("node") is None:
+        print("node tidak ditemukan — cek paritas JS dilewati.")
+        return 0
+    kasus = buat_kasus(args.kasus, args.seed)
+    beda  = bandingkan(kasus, jalankan_node(kasus))
+    for b in beda[:20]:
+        print(b)
+    total = len(kasus["kuotasi"]) + len(kasus["teks"])
+    print(f"{total - len(beda)}/{total} kasus sama ({len(kasus['kuotasi'])} kuotasi, {len(kasus['teks'])} teks).")
+    return 1 if beda else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Ukur latensi rerun UI per menu saat satu widget berubah.
+
+Memakai ``streamlit.testing`` (AppTest) tanpa server. Untuk tiap skenario
+(menu + satu interaksi widget) dilaporkan:
+
+- **rerun penuh** — waktu dinding satu rerun seluruh skrip (page config,
+  sidebar, menu) = biaya per interaksi jika menu bukan fragment;
+- **fragment** — durasi eksekusi fragment menu yang dicatat skrip di
+  ``st.session_state["durasi_fragmen"]`` = biaya per interaksi di server
+  sungguhan, karena widget di dalam fragment hanya menjalankan ulang
+  fragment itu.
+
+AppTest selalu menjalankan ulang seluruh skrip, jadi kolom fragment diambil
+dari catatan skrip, bukan dari waktu dinding. Data ledger/pemakaian ditulis ke
+direktori sementara.
+
+    python tools/rerun_latency.py              # 20 ulangan per skenario
+    python tools/rerun_latency.py --runs 50 --menu Konven 2>/dev/null   # tanpa log Streamlit
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+ROOT   = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / "transaksi-gestun.py"
+
+
+def _widget(elemen, label: str):
+    for w in elemen:
+        if w.label == label:
+            return w
+    raise LookupError(f"Widget '{label}' tidak ditemukan.")
+
+
+def _ketik_nominal(at, i: int) -> None:
+    # Mode kuotasi di browser: ketikan tidak memicu rerun sama sekali (hanya
+    # satu sinkron saat berhenti) dan AppTest tak bisa mengetik di komponen →
+    # ukur jalur server (toggle mati) sebagai kasus terburuk
+    if at.toggle(key="konven_live_aktif").value:
+        at.toggle(key="konven_live_aktif").set_value(False).run()
+    at.text_input(key="nominal_input").input(str(10_000_000 + i * 1_000))
+
+
+def _centang_marketplace(at, i: int) -> None:
+    _widget(at.checkbox, "Biaya Administrasi Nasabah Baru (Rp 10.000)").set_value(i % 2 == 0)
+
+
+def _ketik_nama_normal(at, i: int) -> None:
+    at.text_input(key="n_norm").input(f"Nasabah {i}")
+
+
+def _hitung_selisih(at, i: int) -> None:
+    _widget(at.button, "Hitung Selisih").click()
+
+
+def _ubah_total_edc(at, i: int) -> None:
+    at.number_input[0].set_value(50_000_000 + i * 10_000_000)
+
+
+# (menu, deskripsi interaksi, aksi)
+SKENARIO: List[Tuple[str, str, Callable]] = [
+    ("Konven",       "ketik nominal",          _ketik_nominal),
+    ("Marketplace",  "centang biaya tambahan", _centang_marketplace),
+    ("Input Data",   "ketik nama (Normal)",    _ketik_nama_normal),
+    ("Countdown",    "klik Hitung Selisih",    _hitung_selisih),
+    ("Proporsional", "ubah total transaksi",   _ubah_total_edc),
+]
+
+
+def ukur(menu: str, aksi: Callable, runs: int) -> Tuple[List[float], List[float]]:
+    """(waktu rerun penuh ms, durasi fragment ms) untuk *runs* interaksi."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(SCRIPT), default_timeout=60).run()
+    at.sidebar.selectbox[0].select(menu).run()
+    aksi(at, 0)
+    at.run()                                    # pemanasan (cache, import)
+    penuh: List[float] = []
+    fragmen: List[float] = []
+    for i in range(1, runs + 1):
+        aksi(at, i)
+        t0 = time.perf_counter()
+        at.run()
+        penuh.append((time.perf_counter() - t0) * 1_000)
+        if at.exception:
+            raise RuntimeError(f"{menu}: {at.exception[0].message}")
+        durasi = at.session_state["durasi_fragmen"] if "durasi_fragmen" in at.session_state else {}
+        if menu in durasi:
+            fragmen.append(durasi[menu])
+    return penuh, fragmen
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--menu", action="append", help="batasi ke menu tertentu (boleh berulang)")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("GESTUN_DATA_DIR", tempfile.mkdtemp(prefix="gestun_rerun_"))
+    sys.path.insert(0, str(ROOT))
+
+    print(f"{'menu':<14}{'interaksi':<26}{'rerun penuh p50 ms':>20}{'fragment p50 ms':>18}")
+    for menu, desk, aksi in SKENARIO:
+        if args.menu and menu not in args.menu:
+            continue
+        penuh, fragmen = ukur(menu, aksi, args.runs)
+        frag = f"{statistics.median(fragmen):.1f}" if fragmen else "-"
+        print(f"{menu:<14}{desk:<26}{statistics.median(penuh):>20.1f}{frag:>18}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
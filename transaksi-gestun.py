@@ -1,56 +1,87 @@
 from __future__ import annotations
 
 # ─── Imports ─────────────────────────────────────────────────────────────────
-import math
-import random
+import io
+import os
+import secrets
+import tempfile
+import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
-from zoneinfo import ZoneInfo
+from functools import wraps
+from typing import List, Tuple
 
 import pandas as pd
 import streamlit as st
 
-# ─── Page Config & CSS ───────────────────────────────────────────────────────
+from gestun import (
+    WIB,
+    estimasi_selesai,
+    format_ribuan,
+    format_rupiah,
+    format_rupiah_rp,
+    hari_ini,
+    hitung_express,
+    hitung_konven,
+    hitung_marketplace,
+    hitung_normal,
+    hitung_rate_untung,
+    parse_rupiah,
+    sekarang,
+    split_transaction_cached,
+)
+from gestun import metrik, profil
+from gestun.alokasi import allocate_customers
+from gestun.batch import iter_plan_csv, read_batch_csv, run_batch
+from gestun.kirim import get_dispatcher
+from gestun.konstanta import (
+    BIAYA_NASABAH_BARU,
+    BIAYA_TAMBAHAN_LIST,
+    LABEL_RATE_KONVEN,
+    MARKETPLACE,
+    NAMA_MEDIA,
+    OPSI_FEE_GESTUN,
+    OPSI_FEE_MERCHANT,
+    SLA_AMBANG_MENIT,
+    SLA_MENIT,
+    SVCS_KONVEN,
+    SVC_INPUT_BY_LABEL,
+    SVC_KONVEN_BY_LABEL,
+)
+from gestun.konven_live import aset_konven, param_konven
+from gestun.ledger import BELUM_DIISI, get_ledger
+from gestun.marketplace import iter_rows, read_target_csv, solve_checkout
+from gestun.matriks import konven_matrix
+from gestun.optimasi import optimize_split
+from gestun.pemakaian import get_store
+from gestun.pesan import (
+    DURASI,
+    iter_messages,
+    rate_untung_tampil,
+    read_rows,
+    teks_express,
+    teks_normal,
+    write_messages,
+)
+from gestun.rupiah_vektor import format_rupiah_kolom, format_rupiah_rp_kolom
+from gestun.rute import rank_media
+from gestun.sla import get_board
+
+# ─── Page Config ──────────────────────────────────────────────────────────────
+# Font & bobot huruf diatur tema di .streamlit/config.toml (aset lokal ./static)
 st.set_page_config(page_title="Input Data Transaksi", layout="centered")
-st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Noto+Sans+JP:wght@600;700&display=swap');
-    html, body,
-    p, label,
-    h1, h2, h3, h4, h5, h6,
-    strong, em,
-    li, a,
-    button,
-    input, textarea, select,
-    [class*="css"] {
-      font-family: 'Noto Sans JP', sans-serif !important;
-      font-weight: 600 !important;
-    }
-    h1, h2 { font-weight: 700 !important; }
-    .stTextInput>div>div>input,
-    .stNumberInput>div>div>input,
-    .stTextArea>div>textarea {
-      font-family: 'Noto Sans JP', sans-serif !important;
-      font-weight: 600 !important;
-    }
-    .stSelectbox>div>div>div>div,
-    .stRadio>label,
-    .stMultiSelect>div>div {
-      font-family: 'Noto Sans JP', sans-serif !important;
-      font-weight: 600 !important;
-    }
-    [data-testid="stMarkdownContainer"] h3 { color: var(--text-color); }
-    @media (prefers-color-scheme: dark)  { :root { --text-color: #f5f5f5; } }
-    @media (prefers-color-scheme: light) { :root { --text-color: #222222; } }
-    </style>
-""", unsafe_allow_html=True)
 
 # ─── Debug Shield ─────────────────────────────────────────────────────────────
-if "debug_help" not in st.session_state:
+# Mode debug: buka app dengan ?debug=1 (?debug=0 untuk mematikan)
+if "debug" in st.query_params:
+    st.session_state.debug_help = st.query_params["debug"] == "1"
+elif "debug_help" not in st.session_state:
     st.session_state.debug_help = False
 
-_ORIG_ST_WRITE = st.write
-_ORIG_ST_HELP  = st.help
+_ORIG_ST_WRITE       = st.write
+_ORIG_ST_HELP        = st.help
+_ORIG_ST_DATAFRAME   = st.dataframe
+_ORIG_ST_DATA_EDITOR = st.data_editor
 
 def _noop(*args, **kwargs):
     return
@@ -63,222 +94,163 @@ def _safe_write(*args, **kwargs):
             return
     return _ORIG_ST_WRITE(*args, **kwargs)
 
+def _diukur_st(fn, nama: str):
+    """Bungkus fungsi render Streamlit agar durasinya masuk profil rerun."""
+    @wraps(fn)
+    def jalan(*args, **kwargs):
+        with profil.ukur(nama):
+            return fn(*args, **kwargs)
+    return jalan
+
+_PROFIL_DATAFRAME   = _diukur_st(_ORIG_ST_DATAFRAME,   "render st.dataframe")
+_PROFIL_DATA_EDITOR = _diukur_st(_ORIG_ST_DATA_EDITOR, "render st.data_editor")
+
 def apply_dev_shield():
     if st.session_state.get("debug_help", False):
-        st.write = _ORIG_ST_WRITE
-        st.help  = _ORIG_ST_HELP
+        st.write       = _ORIG_ST_WRITE
+        st.help        = _ORIG_ST_HELP
+        st.dataframe   = _PROFIL_DATAFRAME
+        st.data_editor = _PROFIL_DATA_EDITOR
     else:
-        st.write = _safe_write
-        st.help  = _noop
+        st.write       = _safe_write
+        st.help        = _noop
+        st.dataframe   = _ORIG_ST_DATAFRAME
+        st.data_editor = _ORIG_ST_DATA_EDITOR
 
 apply_dev_shield()
 
-# ─── Utility Functions ────────────────────────────────────────────────────────
+# ─── Metrik & profil rerun ────────────────────────────────────────────────────
+# Endpoint Prometheus /metrics (sekali per proses, GESTUN_METRICS_PORT)
+metrik.get_server()
+
+# True selama eksekusi skrip penuh; False saat fragment menu dijalankan sendiri
+_RERUN_PENUH = True
 
-def format_rupiah(angka: float) -> str:
-    """'Rp 1.000.000' — pemisah titik, spasi setelah Rp."""
-    return f"Rp {int(round(angka)):,}".replace(",", ".")
+RIWAYAT_PROFIL = 50
 
-def fmt_rp(val: float) -> str:
-    """'Rp. 1.000.000' — titik setelah Rp (untuk label UI)."""
-    return f"Rp. {int(val):,}".replace(",", ".")
+def _simpan_profil(hasil) -> None:
+    if hasil is not None:
+        st.session_state.setdefault("profil_riwayat", deque(maxlen=RIWAYAT_PROFIL)).append(hasil)
 
-def format_rupiah_rp(val: int) -> str:
-    """'Rp1,000,000' — format koma US (khusus tabel EDC split)."""
-    return f"Rp{val:,}"
+if st.session_state.debug_help:
+    profil.mulai("rerun penuh", cprofile=st.session_state.get("profil_cprofile", False))
+
+# ─── Utility Functions ────────────────────────────────────────────────────────
 
 def format_rupiah_input(key: str) -> None:
     """Callback on_change: format field teks sebagai Rupiah (pemisah titik)."""
-    txt    = st.session_state.get(key, "")
-    digits = "".join(c for c in txt if c.isdigit())
-    st.session_state[key] = "{:,}".format(int(digits)).replace(",", ".") if digits else ""
-
-def estimasi_selesai(waktu_mulai: datetime, durasi: timedelta) -> str:
-    """Kembalikan string HH:MM dari waktu_mulai + durasi."""
-    return (waktu_mulai + durasi).strftime("%H:%M")
-
-def parse_rupiah(value: str) -> int:
-    """Ubah string Rupiah / angka mentah menjadi integer, atau 0 jika gagal."""
-    try:
-        return int(value.replace("Rp", "").replace(".", "").replace(",", "").strip())
-    except (ValueError, AttributeError):
-        return 0
-
-# ─── Konstanta ────────────────────────────────────────────────────────────────
-RNG        = random.SystemRandom()
-SAFETY_GAP = 1_000
-
-# ─── Fungsi Pembantu EDC Split ────────────────────────────────────────────────
-
-def _is_non_round(val: int) -> bool:
-    return val % 1_000 != 0
-
-def _rand_adjust(val: int, low: int = 237, high: int = 937) -> int:
-    if _is_non_round(val):
-        return 0
-    high = min(high, max(low + 1, val - 1))
-    return RNG.randrange(low, high)
-
-def _water_fill(total: int, swipe_slots: List[Tuple[str, int]]) -> List[int]:
-    """Distribusikan *total* secara proporsional (water-filling).
-    Slot bertarget awal = total/N. Jika ada slot dengan cap < target,
-    isi slot tersebut ke capnya lalu sebarkan sisa ke slot yang tersisa.
-    Menggunakan aritmetika integer agar tidak ada presisi floating-point.
+    st.session_state[key] = format_ribuan(st.session_state.get(key, ""))
+
+def _unduh_lalu_hapus(path: str) -> bytes:
+    """Data download_button (dipanggil saat diklik): isi file sementara, lalu hapus."""
+    with open(path, "rb") as f:
+        data = f.read()
+    os.unlink(path)
+    return data
+
+# Kuotasi Konven di browser: format & kartu dihitung per ketikan tanpa rerun,
+# nominal dikirim ke server sekali setelah ketikan berhenti (gestun.konven_live)
+KONVEN_LIVE = st.components.v2.component("konven_live", **aset_konven())
+
+def _nominal_live() -> None:
+    """Callback komponen: salin nominal yang sudah "diam" ke ``nominal_input``."""
+    st.session_state.nominal_input = format_ribuan(st.session_state.konven_live.nominal or "")
+
+def _fragmen(nama: str):
+    """Jadikan fungsi menu ``st.fragment``: perubahan widget di dalamnya hanya
+    menjalankan ulang menu itu (tanpa page config, CSS, sidebar). Durasi
+    eksekusi terakhir (ms) dicatat di ``st.session_state["durasi_fragmen"]``.
+    Di mode debug, profil ditutup dan panel profil digambar dari sini, agar
+    panel juga segar setelah rerun fragment saja.
     """
-    caps      = [cap for _, cap in swipe_slots]
-    targets   = [0] * len(swipe_slots)
-    remaining = total
-    pending   = list(range(len(swipe_slots)))
-
-    while pending:
-        k = len(pending)
-        # caps[i] * k <= remaining  ⟺  caps[i] <= remaining/k  (integer-safe)
-        newly_capped = [i for i in pending if caps[i] * k <= remaining]
-        if newly_capped:
-            for i in newly_capped:
-                targets[i]  = caps[i]
-                remaining  -= caps[i]
-            pending = [i for i in pending if i not in set(newly_capped)]
-        else:
-            # Tidak ada slot yang terkendala kapasitas — bagi rata
-            base  = remaining // k
-            extra = remaining - base * k
-            for rank, i in enumerate(pending):
-                targets[i] = base + (1 if rank < extra else 0)
-            break
-
-    return targets
-
-
-def split_transaction_exact(
-    total: int,
-    machines: List[Tuple[str, int]],
-    max_swipes: int = 2,
-) -> List[Dict]:
-    """Bagi *total* ke mesin-mesin dengan:
-    - Urutan round-robin: A → B → C → A → B → C → …  (beda bank bergantian)
-    - Nominal per gesek PROPORSIONAL — bukan selalu memaksimalkan limit
-    - Variasi ±5% per gesek agar pola tidak kentara
-    - NOMINAL per gesek < limit − SAFETY_GAP
-    - Maks *max_swipes* gesek per mesin
-    - Total tepat = *total*
+    def dekor(fn):
+        @wraps(fn)
+        def jalan() -> None:
+            # Rerun fragment saja (tanpa rerun penuh yang membuka profil) → profil sendiri
+            sendiri = st.session_state.debug_help and not _RERUN_PENUH
+            if sendiri:
+                profil.mulai(f"fragment {nama}", cprofile=st.session_state.get("profil_cprofile", False))
+            t0 = time.perf_counter()
+            try:
+                with profil.ukur(f"menu {nama}"):
+                    fn()
+            finally:
+                durasi = time.perf_counter() - t0
+                st.session_state.setdefault("durasi_fragmen", {})[nama] = durasi * 1_000
+                metrik.RERUN.inc(nama, "penuh" if _RERUN_PENUH else "fragment")
+                metrik.RERUN_DETIK.observe(durasi, nama)
+                if st.session_state.debug_help:
+                    _simpan_profil(profil.selesai())     # rerun penuh atau fragment ini
+                    isi_profil()
+        return st.fragment(jalan)
+    return dekor
+
+
+# Slot hasil profil di panel sidebar; diklaim saat rerun penuh (panel_profil)
+# supaya fragment menu boleh mengisinya ulang pada rerun fragment saja.
+_SLOT_PROFIL = None
+
+def panel_profil() -> None:
+    """Panel sidebar mode debug (rerun penuh): metrik, opsi cProfile, slot hasil.
+    Widget hanya di sini — fragment tidak boleh menulis widget ke luar dirinya.
     """
-    machines = sorted(machines, key=lambda x: -x[1])
-
-    # ── Slot round-robin penuh: [A,B,C, A,B,C, …] ────────────────────────────
-    all_rr_slots: List[Tuple[str, int]] = [
-        (name, limit - SAFETY_GAP)
-        for _ in range(max_swipes)
-        for name, limit in machines
-    ]
-
-    # ── Pre-check kapasitas ───────────────────────────────────────────────────
-    total_capacity = sum(cap for _, cap in all_rr_slots)
-    if total > total_capacity:
-        detail_lines = "\n".join(
-            f"  • {name}: {max_swipes} × {format_rupiah_rp(limit - SAFETY_GAP)}"
-            f" = {format_rupiah_rp((limit - SAFETY_GAP) * max_swipes)}"
-            for name, limit in machines
-        )
-        raise RuntimeError(
-            f"Total transaksi {format_rupiah_rp(total)} melebihi kapasitas semua mesin.\n\n"
-            f"Kapasitas per mesin ({max_swipes} swipe maks):\n{detail_lines}\n\n"
-            f"Total kapasitas tersedia: {format_rupiah_rp(int(total_capacity))}\n\n"
-            f"Solusi: tambah jumlah mesin, naikkan batas per swipe, atau naikkan max swipe."
+    global _SLOT_PROFIL
+    with st.sidebar.expander("🛠️ Profil Rerun (debug)", expanded=True):
+        server = metrik.get_server()
+        if server is not None:
+            host, port = server.server_address[:2]
+            st.caption(f"Metrik Prometheus: `http://{host}:{port}/metrics`")
+        st.checkbox("cProfile pada rerun berikutnya", key="profil_cprofile")
+        _SLOT_PROFIL = st.empty()
+
+def isi_profil() -> None:
+    """Tulis hasil profil (baca-saja) ke slot panel: rerun terakhir & riwayat."""
+    if _SLOT_PROFIL is None:
+        return
+    riwayat = st.session_state.get("profil_riwayat")
+    with _SLOT_PROFIL.container():
+        if not riwayat:
+            st.caption("Belum ada rerun yang diprofil.")
+            return
+        akhir = riwayat[-1]
+        st.metric(f"Terakhir — {akhir['label']}", f"{akhir['total_ms']:.1f} ms")
+        if akhir["bagian"]:
+            _ORIG_ST_DATAFRAME(
+                pd.DataFrame(akhir["bagian"]).round({"total_ms": 2, "maks_ms": 2}),
+                hide_index=True, use_container_width=True,
+            )
+        if akhir["cprofile"]:
+            st.caption("cProfile — top fungsi (waktu kumulatif)")
+            _ORIG_ST_DATAFRAME(
+                pd.DataFrame(akhir["cprofile"]).round({"tottime_ms": 2, "cumtime_ms": 2}),
+                hide_index=True, use_container_width=True,
+            )
+        st.caption(f"Riwayat {len(riwayat)} rerun terakhir (ms)")
+        _ORIG_ST_DATAFRAME(
+            pd.DataFrame({
+                "waktu": [r["mulai"].strftime("%H:%M:%S") for r in riwayat],
+                "jenis": [r["label"] for r in riwayat],
+                "total": [round(r["total_ms"], 1) for r in riwayat],
+                "terberat": [  # bagian terberat di luar blok menu yang membungkus semuanya
+                    next((b["bagian"] for b in r["bagian"] if not b["bagian"].startswith("menu ")), "")
+                    for r in riwayat
+                ],
+            }).iloc[::-1],
+            hide_index=True, use_container_width=True,
         )
 
-    # ── Pilih jumlah round minimum yang cukup ────────────────────────────────
-    # Cari berapa putaran round-robin terkecil yang total kapasitasnya ≥ total.
-    # Hasilnya: gesek sesedikit mungkin, nominal masing-masing lebih bervarisi.
-    swipe_slots: List[Tuple[str, int]] = all_rr_slots
-    for rounds in range(1, max_swipes + 1):
-        candidate = [
-            (name, limit - SAFETY_GAP)
-            for _ in range(rounds)
-            for name, limit in machines
-        ]
-        if sum(cap for _, cap in candidate) >= total:
-            swipe_slots = candidate
-            break
-
-    # ── Target proporsional via water-filling ────────────────────────────────
-    # Alih-alih memaksimalkan setiap gesek, bagi total secara merata.
-    # Contoh 200 jt / 6 gesek ≈ 33 jt/gesek  vs  lama: 40jt,40jt,40jt,40jt,35jt,5jt
-    base_targets = _water_fill(total, swipe_slots)
-
-    # ── Alokasi dengan variasi ±5% + lookahead ───────────────────────────────
-    remaining = total
-    parts: List[Dict] = []
-
-    for i, (name, cap) in enumerate(swipe_slots):
-        if remaining <= 0:
-            break
-
-        # Batas minimum/maksimum berdasarkan lookahead
-        future_cap = sum(c for _, c in swipe_slots[i + 1:])
-        must_cover = max(1, remaining - future_cap)
-        can_cover  = min(cap, remaining)
-
-        # Terapkan variasi ±5% dari target (minimal ±Rp 100.000)
-        base    = base_targets[i]
-        var_rng = max(100_000, int(base * 0.05))
-        delta   = RNG.randint(-var_rng, var_rng)
-        amt     = max(1, base + delta)
-
-        # Jadikan non-bulat: bulatkan ke ribuan lalu tambahkan komponen acak
-        amt = (amt // 1_000) * 1_000 + RNG.randint(237, 937)
-
-        # Clamp ke rentang valid — jaminan tidak stuck
-        amt = max(must_cover, min(can_cover, amt))
-
-        parts.append({"machine": name, "amount": amt})
-        remaining -= amt
-
-    # ── Koreksi selisih ───────────────────────────────────────────────────────
-    diff = total - sum(p["amount"] for p in parts)
-    if diff != 0:
-        machine_cap_map = {name: limit - SAFETY_GAP for name, limit in machines}
-
-        for p in parts:
-            if diff == 0:
-                break
-            cap      = machine_cap_map[p["machine"]]
-            headroom = cap - p["amount"]
-            if 0 < diff <= headroom and _is_non_round(p["amount"] + diff):
-                p["amount"] += diff
-                diff = 0
-            elif diff < 0 and abs(diff) < p["amount"] - 1 and _is_non_round(p["amount"] + diff):
-                p["amount"] += diff
-                diff = 0
-
-        if diff != 0:
-            for p in parts:
-                if diff == 0:
-                    break
-                cap      = machine_cap_map[p["machine"]]
-                headroom = cap - p["amount"]
-                step     = diff if abs(diff) <= headroom else headroom
-                if step != 0 and _is_non_round(p["amount"] + step):
-                    p["amount"] += step
-                    diff        -= step
-
-        if diff != 0:
-            parts[-1]["amount"] += diff
-
-    assert sum(p["amount"] for p in parts) == total, "Total mismatch setelah penyesuaian!"
-    return parts
-
 # ─── Menu: Pembagian EDC (Proporsional) ──────────────────────────────────────
 
+@_fragmen("Proporsional")
 def menu_pembagian_edc() -> None:
     st.header("🧮 Proporsional Transaksi Besar")
 
     total_transaksi = st.number_input(
         "Masukkan Total Transaksi (Rp)", min_value=50_000_000, step=10_000_000, format="%d"
     )
-    max_swipes   = st.number_input("Maksimum Gesek per Mesin", min_value=1, max_value=5, value=2)
+    max_swipes   = st.number_input("Maksimum Gesek per Mesin", min_value=1, max_value=50, value=2)
     jumlah_mesin = st.number_input(
-        "Masukkan Jumlah Mesin EDC", min_value=1, max_value=20, value=3, step=1
+        "Masukkan Jumlah Mesin EDC", min_value=1, max_value=1_000, value=3, step=1
     )
 
     st.subheader("Detail Setiap Mesin EDC")
@@ -293,16 +265,78 @@ def menu_pembagian_edc() -> None:
             )
         mesin_edc_input.append((nama, int(batas)))
 
-    if st.button("Hitung Pembagian") and total_transaksi > 0:
+    # ── Pemakaian harian bersama (lintas sesi & worker) ──────────────────────
+    store      = get_store()
+    pakai_sisa = st.checkbox(
+        "Batasi dengan sisa limit harian mesin (pemakaian bersama)", key="edc_pakai_sisa"
+    )
+    with st.expander("📊 Pemakaian Mesin Hari Ini", expanded=False):
+        df_limit = st.data_editor(
+            pd.DataFrame({
+                "machine":      [nama for nama, _ in mesin_edc_input],
+                "limit_harian": [store.limit_harian(nama) or 0 for nama, _ in mesin_edc_input],
+            }),
+            disabled=["machine"],
+            use_container_width=True,
+            key="edc_limit_harian",
+        )
+        if st.button("Simpan Limit Harian"):
+            store.set_limit_harian(
+                (r["machine"], int(r["limit_harian"]))
+                for r in df_limit.to_dict("records") if r["limit_harian"]
+            )
+            st.success("Limit harian tersimpan.")
+        df_pakai = pd.DataFrame([
+            {
+                "machine":  nama,
+                "terpakai": format_rupiah_rp(store.terpakai(nama)),
+                "sisa":     "-" if store.sisa(nama) is None else format_rupiah_rp(store.sisa(nama)),
+            }
+            for nama, _ in mesin_edc_input
+        ])
+        st.dataframe(df_pakai, use_container_width=True)
+
+    mesin_split = (
+        store.limit_efektif(mesin_edc_input, int(max_swipes)) if pakai_sisa else mesin_edc_input
+    )
+
+    # Seed sesi: rerun / klik ulang dengan input sama → rencana sama (dari cache)
+    if "edc_seed" not in st.session_state:
+        st.session_state.edc_seed = secrets.randbelow(2**31)
+    seed_txt = st.text_input(
+        "Seed (opsional)", key="edc_seed_input", placeholder=str(st.session_state.edc_seed),
+        help="Isi angka agar rencana bisa direproduksi. Kosongkan untuk memakai seed sesi.",
+    )
+    seed = int(seed_txt) if seed_txt.strip().isdigit() else st.session_state.edc_seed
+
+    col_hitung, col_acak = st.columns(2)
+    hitung = col_hitung.button("Hitung Pembagian")
+    if col_acak.button("🎲 Acak Ulang"):
+        st.session_state.edc_seed = seed = secrets.randbelow(2**31)
+        hitung = True
+
+    if hitung and total_transaksi > 0:
+        # Token per klik hitung: rencana identik yang dihitung ulang (gesek baru)
+        # boleh dicatat lagi; rerun biasa tidak menaikkan token
+        st.session_state.edc_hitung_ke = st.session_state.get("edc_hitung_ke", 0) + 1
+        st.session_state.edc_plan_key = (
+            int(total_transaksi), tuple(mesin_split), int(max_swipes), seed
+        )
+
+    plan_key = st.session_state.get("edc_plan_key")
+    if plan_key:
+        total_key, mesin_key, swipes_key, seed_key = plan_key
         try:
-            plan = split_transaction_exact(int(total_transaksi), mesin_edc_input, int(max_swipes))
+            with profil.ukur("split_transaction_cached"):
+                plan = split_transaction_cached(total_key, mesin_key, swipes_key, seed=seed_key)
         except RuntimeError as e:
             st.error(str(e))
         else:
             total_int    = sum(p["amount"] for p in plan)   # simpan sebelum konversi ke string
             df           = pd.DataFrame(plan)
-            df["amount"] = df["amount"].apply(format_rupiah_rp)
+            df["amount"] = format_rupiah_rp_kolom(df["amount"])
             st.success("### Rincian Pembagian")
+            st.caption(f"Seed: {seed_key}")
             st.dataframe(df, use_container_width=True)
             st.markdown(f"**TOTAL:** {format_rupiah_rp(total_int)}")
             st.download_button(
@@ -311,43 +345,203 @@ def menu_pembagian_edc() -> None:
                 "split_plan.csv",
                 "text/csv",
             )
+            tercatat = st.session_state.get("edc_plan_tercatat") == st.session_state.edc_hitung_ke
+            if st.button("✅ Catat Gesek ke Pemakaian Harian", disabled=tercatat):
+                try:
+                    store.record_swipes(plan, ref=f"seed {seed_key}")
+                except RuntimeError as e:
+                    st.error(str(e))
+                else:
+                    st.session_state.edc_plan_tercatat = st.session_state.edc_hitung_ke
+                    st.rerun()
+            if tercatat:
+                st.caption("Rencana ini sudah dicatat ke pemakaian harian.")
+
+    # ── Batch dari CSV ────────────────────────────────────────────────────────
+    with st.expander("📂 Batch dari CSV (banyak total sekaligus)", expanded=False):
+        st.caption(
+            "Kolom CSV: `total` (wajib), `ref`, `mesin` (mis. `EDC 1=50000000; EDC 2=30000000`), "
+            "`max_swipes`. Mesin, maks gesek dan seed di atas dipakai sebagai default."
+        )
+        upload = st.file_uploader("Upload CSV Total Transaksi", type=["csv"], key="edc_batch_csv")
+        if upload is not None and st.button("Proses Batch"):
+            jumlah = {"berhasil": 0, "gagal": 0}
+            gagal: List[dict] = []      # contoh baris gagal untuk tabel (dibatasi)
+
+            def _hitung(results):
+                for r in results:
+                    if r["error"]:
+                        jumlah["gagal"] += 1
+                        if len(gagal) < 200:
+                            gagal.append({"baris": r["baris"], "ref": r["ref"], "keterangan": r["error"]})
+                    else:
+                        jumlah["berhasil"] += 1
+                    yield r
+
+            # Hasil ditulis bertahap ke file sementara, tidak ditampung di memori
+            out = tempfile.NamedTemporaryFile(
+                "w", prefix="edc_batch_", suffix=".csv", delete=False, encoding="utf-8", newline="",
+            )
+            try:
+                with out:
+                    jobs = read_batch_csv(
+                        io.TextIOWrapper(upload, encoding="utf-8-sig", newline=""),
+                        mesin_edc_input, int(max_swipes),
+                    )
+                    # workers=1: tanpa pool proses di dalam server (lihat run_batch)
+                    for chunk in iter_plan_csv(_hitung(run_batch(jobs, workers=1, seed=seed))):
+                        out.write(chunk)
+            except ValueError as e:
+                os.unlink(out.name)
+                st.error(str(e))
+            except BaseException:
+                os.unlink(out.name)
+                raise
+            else:
+                lama = st.session_state.get("edc_batch")
+                if lama and os.path.exists(lama["path"]):
+                    os.unlink(lama["path"])
+                st.session_state["edc_batch"] = {"path": out.name, "jumlah": jumlah, "gagal": gagal}
+
+        hasil_batch = st.session_state.get("edc_batch")
+        if hasil_batch and not os.path.exists(hasil_batch["path"]):   # sudah diunduh
+            del st.session_state["edc_batch"]
+        elif hasil_batch:
+            jumlah = hasil_batch["jumlah"]
+            st.success(f"{jumlah['berhasil']} baris berhasil, {jumlah['gagal']} baris gagal.")
+            if hasil_batch["gagal"]:
+                st.dataframe(pd.DataFrame(hasil_batch["gagal"]), use_container_width=True)
+            st.download_button(
+                "📥 Download Rencana Batch (CSV)",
+                data=lambda p=hasil_batch["path"]: _unduh_lalu_hapus(p),
+                file_name="split_plan_batch.csv",
+                mime="text/csv",
+                key="edc_batch_unduh",
+            )
 
-
-# ════════════════════════════════════════════════════════════════════════════════
-# NAVIGASI SIDEBAR
-# ════════════════════════════════════════════════════════════════════════════════
-
-menu = st.sidebar.selectbox(
-    "Pilih Menu", ["Input Data", "Konven", "Marketplace", "Countdown", "Proporsional"]
-)
+    # ── Alokasi banyak nasabah (kapasitas harian bersama) ────────────────────
+    with st.expander("👥 Alokasi Banyak Nasabah (Limit Harian Bersama)", expanded=False):
+        st.caption(
+            "Semua nasabah dialokasikan sekaligus ke mesin di atas. Isi limit harian tiap mesin; "
+            "mesin dengan utilisasi terendah dipakai lebih dulu."
+        )
+        df_harian = st.data_editor(
+            pd.DataFrame({
+                "machine":      [nama for nama, _ in mesin_edc_input],
+                "limit_swipe":  [batas for _, batas in mesin_edc_input],
+                "limit_harian": [batas * 10 for _, batas in mesin_edc_input],
+            }),
+            disabled=["machine", "limit_swipe"],
+            use_container_width=True,
+            key="edc_alokasi_mesin",
+        )
+        antrian_txt = st.text_area(
+            "Antrian Nasabah (satu per baris: `ref, total`)",
+            placeholder="Budi, 150.000.000\nSiti, 75.000.000",
+            key="edc_alokasi_antrian",
+        )
+        if st.button("Alokasikan Antrian"):
+            antrian = []
+            for baris in antrian_txt.splitlines():
+                if baris.strip():
+                    ref, _, nominal = baris.rpartition(",")
+                    antrian.append((ref.strip() or f"Nasabah {len(antrian) + 1}", parse_rupiah(nominal)))
+            alokasi = allocate_customers(
+                antrian,
+                [
+                    (r["machine"], int(r["limit_swipe"]), int(r["limit_harian"]))
+                    for r in df_harian.to_dict("records")
+                ],
+                int(max_swipes),
+                used=store.snapshot() if pakai_sisa else None,
+                seed=seed,
+            )
+            rows_plan = [
+                {"ref": c["ref"], "gesek_ke": ke, "machine": p["machine"], "amount": p["amount"]}
+                for c in alokasi["customers"]
+                for ke, p in enumerate(c["plan"], start=1)
+            ]
+            ditolak = [c for c in alokasi["customers"] if c["error"]]
+            st.success(f"{len(alokasi['customers']) - len(ditolak)} nasabah teralokasi, {len(ditolak)} ditolak.")
+            for c in ditolak:
+                st.error(f"{c['ref']}: {c['error']}")
+            if rows_plan:
+                df_plan           = pd.DataFrame(rows_plan)
+                df_plan["amount"] = format_rupiah_rp_kolom(df_plan["amount"])
+                st.dataframe(df_plan, use_container_width=True)
+                st.download_button(
+                    "📥 Download Alokasi (CSV)", df_plan.to_csv(index=False).encode(),
+                    "alokasi_nasabah.csv", "text/csv",
+                )
+            df_util              = pd.DataFrame(alokasi["machines"])
+            df_util["utilisasi"] = (df_util["utilisasi"] * 100).round(1).astype(str) + "%"
+            for kolom in ("limit_harian", "terpakai", "sisa"):
+                df_util[kolom] = format_rupiah_rp_kolom(df_util[kolom])
+            st.markdown("**Utilisasi Mesin**")
+            st.dataframe(df_util, use_container_width=True)
+
+    # ── Optimasi biaya MDR ────────────────────────────────────────────────────
+    with st.expander("💸 Optimasi Biaya MDR (Gesek Paling Sedikit)", expanded=False):
+        st.caption(
+            "Atur maks gesek dan MDR tiap mesin. Rencana optimal: gesek paling sedikit, "
+            "lalu total MDR terendah — dibandingkan dengan round-robin biasa."
+        )
+        df_mdr = st.data_editor(
+            pd.DataFrame({
+                "machine":     [nama for nama, _ in mesin_split],
+                "limit_swipe": [batas for _, batas in mesin_split],
+                "maks_gesek":  [int(max_swipes)] * len(mesin_split),
+                "mdr_persen":  [0.0] * len(mesin_split),
+            }),
+            disabled=["machine", "limit_swipe"],
+            use_container_width=True,
+            key="edc_mdr",
+        )
+        if st.button("Optimasi Biaya") and total_transaksi > 0:
+            try:
+                opt = optimize_split(
+                    int(total_transaksi),
+                    [
+                        (r["machine"], int(r["limit_swipe"]), int(r["maks_gesek"]), float(r["mdr_persen"]))
+                        for r in df_mdr.to_dict("records")
+                    ],
+                    seed=seed,
+                )
+            except RuntimeError as e:
+                st.error(str(e))
+            else:
+                df_opt           = pd.DataFrame(opt["plan"])
+                df_opt["amount"] = format_rupiah_rp_kolom(df_opt["amount"])
+                st.dataframe(df_opt, use_container_width=True)
+                c1, c2 = st.columns(2)
+                c1.metric("Gesek (Optimal)", opt["jumlah_gesek"], -opt["selisih_gesek"], delta_color="inverse")
+                c2.metric(
+                    "Biaya MDR (Optimal)", format_rupiah(opt["biaya_mdr"]),
+                    format_rupiah(-opt["selisih_biaya"]), delta_color="inverse",
+                )
+                st.caption(
+                    f"Round-robin biasa: {opt['greedy']['jumlah_gesek']} gesek, "
+                    f"MDR {format_rupiah(opt['greedy']['biaya_mdr'])}."
+                )
 
 
 # ════════════════════════════════════════════════════════════════════════════════
 # MENU: KONVENSIONAL
 # ════════════════════════════════════════════════════════════════════════════════
 
-if menu == "Konven":
+@_fragmen("Konven")
+def menu_konven() -> None:
     st.header("💰 Perbandingan Gesek")
 
     if "nominal_input" not in st.session_state:
         st.session_state.nominal_input = ""
 
-    SVCS_KONVEN = [
-        {"label_ui": "Normal (3 Jam)",                          "cost": 0,      "normalized": "Normal"},
-        {"label_ui": f"Express Non Member — {fmt_rp(18_000)}", "cost": 18_000, "normalized": "Express Non Member"},
-        {"label_ui": f"Express Member — {fmt_rp(15_000)}",     "cost": 15_000, "normalized": "Express Member"},
-    ]
-
     row1_col1, row1_col2 = st.columns(2)
     with row1_col1:
         tipe_rate = st.selectbox("Tipe Rate Jual:", ["Persentase (%)", "Nominal (Rp)"], key="menu1_tipe_rate")
     with row1_col2:
         if tipe_rate == "Persentase (%)":
-            preset_opts = [
-                "Custom", "2.0%", "2.3%", "2.4%", "2.5%", "2.6%",
-                "3.3%", "3.5%", "4.0%", "4.7%", "5.0%", "7.0%", "8.0%", "14.0%",
-            ]
-            preset = st.selectbox("Pilih Persentase:", preset_opts, key="menu1_preset")
+            preset = st.selectbox("Pilih Persentase:", ["Custom", *LABEL_RATE_KONVEN], key="menu1_preset")
         else:
             st.write("")
 
@@ -366,82 +560,86 @@ if menu == "Konven":
             rt_str       = format_rupiah(nominal_rate)
 
     with row2_col2:
-        layanan_transfer_ui = st.selectbox("Layanan Transfer:", [s["label_ui"] for s in SVCS_KONVEN])
-        svc = next(s for s in SVCS_KONVEN if s["label_ui"] == layanan_transfer_ui)
+        layanan_transfer_ui = st.selectbox("Layanan Transfer:", list(SVC_KONVEN_BY_LABEL))
+        svc = SVC_KONVEN_BY_LABEL[layanan_transfer_ui]
 
     st.markdown("---")
 
-    BIAYA_TAMBAHAN_LIST = {
-        "Biaya Transaksi di Mesin EDC":                         2_000,
-        "Biaya QRIS By Whatsapp":                               3_000,
-        "Biaya Layanan Online Invoice CC Pusat (Non Blibli)":   3_000,
-        "Biaya Administrasi Nasabah Baru":                     10_000,
-        "Biaya Transfer Beda Bank":                            10_000,
-        "Biaya Layanan Link Toko Tokopedia Non Member":        15_000,
-        "Biaya Layanan Link Toko Tokopedia Member":            10_000,
-        "Biaya Layanan Link Toko Shopee Non Member":           10_000,
-        "Biaya Layanan Link Toko Shopee Member":               10_000,
-        "Biaya Layanan Express Online Invoice":                25_000,
-        "Biaya Layanan Express Tokopedia":                     30_000,
-        "Biaya Layanan Express Shopee":                        30_000,
-    }
     biaya_pilihan          = st.multiselect(
         "➕ Tambahkan Biaya Tambahan (Opsional):", list(BIAYA_TAMBAHAN_LIST.keys())
     )
     biaya_tambahan_nominal = sum(BIAYA_TAMBAHAN_LIST[b] for b in biaya_pilihan)
     biaya_total            = biaya_tambahan_nominal + svc["cost"]
 
-    st.text_input(
-        label="💵 Masukkan Nominal Transaksi (Rp):",
-        key="nominal_input",
-        on_change=format_rupiah_input,
-        args=("nominal_input",),
-        placeholder="Ketik angka...",
+    live = st.toggle(
+        "⚡ Kuotasi langsung di browser", value=False, key="konven_live_aktif",
+        help="Eksperimental: format & kartu dihitung di browser tanpa rerun. "
+             "Matikan jika browser memblokir komponen; kuotasi dihitung ulang di server.",
     )
+    if live:
+        KONVEN_LIVE(
+            key="konven_live",
+            data=param_konven(
+                st.session_state.nominal_input, biaya_total,
+                rate_decimal=rate_decimal,
+                nominal_rate=0 if rate_decimal is not None else nominal_rate,
+                label="💵 Masukkan Nominal Transaksi (Rp):",
+                placeholder="Ketik angka...",
+            ),
+            default={"nominal": st.session_state.nominal_input},
+            on_nominal_change=_nominal_live,
+        )
+    else:
+        st.text_input(
+            label="💵 Masukkan Nominal Transaksi (Rp):",
+            key="nominal_input",
+            on_change=format_rupiah_input,
+            args=("nominal_input",),
+            placeholder="Ketik angka...",
+        )
 
     raw_val     = st.session_state.nominal_input.replace(".", "")
     nominal_int = int(raw_val) if raw_val.isdigit() else 0
 
     if nominal_int > 0:
-        EXTRA_FEE_BERSIH = 1
-        waktu_sekarang   = datetime.now(ZoneInfo("Asia/Jakarta"))
+        waktu_sekarang   = sekarang()
         durasi           = timedelta(minutes=30) if "Express" in svc["normalized"] else timedelta(hours=3)
         est_selesai      = estimasi_selesai(waktu_sekarang, durasi)
 
-        if tipe_rate == "Persentase (%)":
-            k_fee       = int(round(nominal_int * rate_decimal))
-            k_terima    = nominal_int - k_fee - biaya_total
-            b_transaksi = int((nominal_int + biaya_total) / (1 - rate_decimal)) + EXTRA_FEE_BERSIH
-        else:
-            # FIX: k_fee sebelumnya tidak didefinisikan di branch ini,
-            #      menyebabkan NameError pada baris total_potongan_kotor di bawah.
-            k_fee       = nominal_rate
-            k_terima    = nominal_int - nominal_rate - biaya_total
-            b_transaksi = nominal_int + biaya_total + nominal_rate + EXTRA_FEE_BERSIH
-
-        total_potongan_kotor = k_fee + biaya_total
-        total_biaya_bersih   = b_transaksi - nominal_int
-
-        res_col1, res_col2 = st.columns(2)
-        with res_col1:
-            st.markdown(f"""
-            <div style="background:#fff4f4;border:1px solid #feb2b2;padding:20px;border-radius:15px;text-align:center;">
-                <p style="color:#c53030;margin:0;font-size:0.9rem;font-weight:bold;">METODE GESEK KOTOR</p>
-                <h2 style="margin:10px 0;color:#c53030;">{format_rupiah(max(0, k_terima))}</h2>
-                <small style="color:#718096;">Dana Bersih yang Kakak/Bapak/Ibu Terima</small>
-            </div>
-            """, unsafe_allow_html=True)
-        with res_col2:
-            # FIX: EXTRA_FEE_BERSIH sebelumnya ditambahkan dua kali (sekali di
-            #      kalkulasi b_transaksi, sekali lagi saat display). Sekarang
-            #      cukup tampilkan b_transaksi yang sudah mengandung nilai itu.
-            st.markdown(f"""
-            <div style="background:#f0fff4;border:1px solid #9ae6b4;padding:20px;border-radius:15px;text-align:center;">
-                <p style="color:#2f855a;margin:0;font-size:0.9rem;font-weight:bold;">METODE GESEK BERSIH</p>
-                <h2 style="margin:10px 0;color:#2f855a;">{format_rupiah(b_transaksi)}</h2>
-                <small style="color:#718096;">Nominal yang Harus Digesek</small>
-            </div>
-            """, unsafe_allow_html=True)
+        with metrik.QUOTE_DETIK.time("Konven"):
+            if tipe_rate == "Persentase (%)":
+                hasil = hitung_konven(nominal_int, biaya_total, rate_decimal=rate_decimal)
+            else:
+                hasil = hitung_konven(nominal_int, biaya_total, nominal_rate=nominal_rate)
+
+        k_fee                = hasil["k_fee"]
+        k_terima             = hasil["k_terima"]
+        b_transaksi          = hasil["b_transaksi"]
+        total_potongan_kotor = hasil["total_potongan_kotor"]
+        total_biaya_bersih   = hasil["total_biaya_bersih"]
+
+        # Mode live: kartu Kotor/Bersih sudah digambar komponen di browser
+        if not live:
+            res_col1, res_col2 = st.columns(2)
+            with res_col1:
+                st.markdown(f"""
+                <div style="background:#fff4f4;border:1px solid #feb2b2;padding:20px;border-radius:15px;text-align:center;">
+                    <p style="color:#c53030;margin:0;font-size:0.9rem;font-weight:bold;">METODE GESEK KOTOR</p>
+                    <h2 style="margin:10px 0;color:#c53030;">{format_rupiah(max(0, k_terima))}</h2>
+                    <small style="color:#718096;">Dana Bersih yang Kakak/Bapak/Ibu Terima</small>
+                </div>
+                """, unsafe_allow_html=True)
+            with res_col2:
+                # FIX: EXTRA_FEE_BERSIH sebelumnya ditambahkan dua kali (sekali di
+                #      kalkulasi b_transaksi, sekali lagi saat display). Sekarang
+                #      cukup tampilkan b_transaksi yang sudah mengandung nilai itu.
+                st.markdown(f"""
+                <div style="background:#f0fff4;border:1px solid #9ae6b4;padding:20px;border-radius:15px;text-align:center;">
+                    <p style="color:#2f855a;margin:0;font-size:0.9rem;font-weight:bold;">METODE GESEK BERSIH</p>
+                    <h2 style="margin:10px 0;color:#2f855a;">{format_rupiah(b_transaksi)}</h2>
+                    <small style="color:#718096;">Nominal yang Harus Digesek</small>
+                </div>
+                """, unsafe_allow_html=True)
 
         st.write("")
         with st.expander("🔎 Rincian Transparansi Biaya (Opsional)", expanded=False):
@@ -478,6 +676,40 @@ if menu == "Konven":
                 "di luar nominal penyesuaian di atas.*"
             )
 
+        with st.expander("📊 Bandingkan Semua Preset Rate & Layanan", expanded=False):
+            daftar_txt = st.text_area(
+                "Nominal lain untuk dibandingkan (opsional, satu per baris):", key="konven_matriks_nominal"
+            )
+            nominals = [nominal_int] + [
+                parse_rupiah(x) for x in daftar_txt.splitlines() if parse_rupiah(x) > 0
+            ]
+            mtx   = konven_matrix(nominals, biaya_tambahan=biaya_tambahan_nominal)
+            index = pd.MultiIndex.from_product(
+                [nominals, LABEL_RATE_KONVEN, [s["normalized"] for s in SVCS_KONVEN]],
+                names=["Nominal", "Rate", "Layanan"],
+            )
+            df_mtx = pd.DataFrame(
+                {
+                    "Kotor (Diterima)": mtx["k_terima"].ravel(),
+                    "Bersih (Digesek)": mtx["b_transaksi"].ravel(),
+                },
+                index=index,
+            )
+            df_mtx["Kotor (Diterima)"] = df_mtx["Kotor (Diterima)"].clip(lower=0)
+            if len(nominals) == 1:
+                st.dataframe(
+                    df_mtx.loc[nominal_int].unstack("Layanan", sort=False).style.format(format_rupiah),
+                    use_container_width=True,
+                )
+            else:
+                st.dataframe(df_mtx.reset_index(), use_container_width=True, hide_index=True)
+                st.download_button(
+                    "📥 Download Perbandingan (CSV)",
+                    df_mtx.reset_index().to_csv(index=False).encode(),
+                    "perbandingan_konven.csv",
+                    "text/csv",
+                )
+
         st.divider()
         c1, c2 = st.columns(2)
         with c1:
@@ -493,26 +725,51 @@ if menu == "Konven":
 # MENU: INPUT DATA TRANSAKSI
 # ════════════════════════════════════════════════════════════════════════════════
 
-elif menu == "Input Data":
+@_fragmen("Input Data")
+def menu_input_data() -> None:
     st.title("Form Input Data Transaksi")
 
-    SVCS_INPUT = [
-        {"label_ui": "Normal 3 Jam",                            "cost": 0.0},
-        {"label_ui": f"Express Member — {fmt_rp(15_000)}",     "cost": 15_000.0},
-        {"label_ui": f"Express Non Member — {fmt_rp(18_000)}", "cost": 18_000.0},
-    ]
-    SVC_BY_LABEL = {s["label_ui"]: s for s in SVCS_INPUT}
+    ledger     = get_ledger()
+    dispatcher = get_dispatcher()
+    board      = get_board()
+
+    kirim_wa = st.checkbox(
+        "📤 Kirim otomatis ke WhatsApp",
+        value=dispatcher is not None,
+        disabled=dispatcher is None,
+        key="wa_kirim_otomatis",
+        help="Pesan masuk antrean kirim di latar belakang; form tidak menunggu pengiriman.",
+    )
+    if dispatcher is None:
+        st.caption("Gateway belum diatur — set `GESTUN_WA_URL` (dan `GESTUN_WA_TUJUAN`) lalu muat ulang.")
+
+    antrean_penuh: List[str] = []
+
+    def _kirim(no: int, teks: str) -> None:
+        # tunggu=0: antrean penuh langsung ditolak, rerun tidak pernah menunggu ruang.
+        # Sisa pesan rerun ini tidak dikirim otomatis (tetap di ledger/unduhan).
+        if kirim_wa and dispatcher is not None and not antrean_penuh:
+            try:
+                dispatcher.submit(teks, ref=f"{hari_ini()}#{no}", tunggu=0)
+            except RuntimeError as e:
+                antrean_penuh.append(str(e))
+                st.warning(f"{e} Pesan mulai No. {no} tidak dikirim otomatis.")
 
     st.subheader("🧾 Data Transaksi Utama")
     col_h1, col_h2, col_h3 = st.columns(3)
     with col_h1:
-        transaksi_no = st.number_input("No. Transaksi", min_value=1, step=1, format="%d")
+        # Nomor final diberikan ledger saat Generate (berurutan per hari, tanpa bentrok antar sesi)
+        st.text_input("No. Transaksi (otomatis)", value=str(ledger.berikutnya()), disabled=True)
     with col_h2:
         metode_transaksi = st.selectbox("Metode Transaksi", ["Konven", "Online"])
     with col_h3:
-        lay = st.selectbox("Jenis Layanan", [s["label_ui"] for s in SVCS_INPUT])
+        lay = st.selectbox("Jenis Layanan", list(SVC_INPUT_BY_LABEL))
+    # Petugas & shift dicatat di ledger untuk setiap transaksi (Express & Normal)
+    p1, p2 = st.columns(2)
+    petugas_nama  = p1.selectbox("Nama Petugas", ["Rendy", "Thoriq"])
+    petugas_shift = p2.selectbox("Shift Kerja",  ["Shift Pagi", "Shift Siang", "Shift Malam", "1 Shift"])
 
-    svc = SVC_BY_LABEL[lay]
+    svc = SVC_INPUT_BY_LABEL[lay]
 
     # ── Mode Express ──────────────────────────────────────────────────────────
 
@@ -551,39 +808,51 @@ elif menu == "Input Data":
             submit_express = st.form_submit_button("Generate WhatsApp Express")
 
         if submit_express:
-            biaya_baru  = 10_000.0 if kategori == "Baru" else 0.0
+            biaya_baru  = BIAYA_NASABAH_BARU if kategori == "Baru" else 0.0
             total_biaya = b_trf + b_edc + b_qris + biaya_baru + svc["cost"]
 
-            if metode_gesek == "Gesek Kotor":
-                jt_final  = input_nominal
-                fee_jasa  = round(jt_final * fee_decimal) if fee_type == "Persentase (%)" else fee_flat
-                trf_final = jt_final - fee_jasa - total_biaya
-            else:  # Gesek Bersih
-                if fee_type == "Persentase (%)":
-                    jt_final = math.ceil((input_nominal + total_biaya) / (1.0 - fee_decimal))
-                else:
-                    jt_final = input_nominal + total_biaya + fee_flat
-                trf_final = input_nominal
+            with metrik.QUOTE_DETIK.time("Express"):
+                hasil = hitung_express(
+                    input_nominal, total_biaya,
+                    kotor=(metode_gesek == "Gesek Kotor"),
+                    fee_decimal=fee_decimal, fee_flat=fee_flat,
+                    persen=(fee_type == "Persentase (%)"),
+                )
+            jt_final  = hasil["jt_final"]
+            trf_final = hasil["trf_final"]
 
             waktu_selesai = (
-                datetime.now(ZoneInfo("Asia/Jakarta")) + timedelta(minutes=20)
+                sekarang() + DURASI["Express"]
             ).strftime("%H:%M WIB")
             rate_tampil = (
                 f"{fee_persen:.2f}%" if fee_type == "Persentase (%)" else format_rupiah(fee_flat)
             )
-
-            teks_express = (
-                f"*TRANSAKSI NO. {transaksi_no} ({metode_transaksi.upper()})*\n"
-                f"*EXPRESS*\n\n"
-                f"• Nama Nasabah: *{nama}*\n"
-                f"• Kategori Nasabah: *{kategori}*\n"
-                f"• Kelas Nasabah: *{kelas}*\n"
-                f"• Rate Jual: *{rate_tampil}*\n"
-                f"• Jumlah Transfer: *{format_rupiah(trf_final)}*\n"
-                f"_______________________________\n"
-                f"Estimasi Selesai: {waktu_selesai}"
-            )
-            st.code(teks_express, language="text")
+            rec_express = {
+                "mode":             "Express",
+                "metode_transaksi": metode_transaksi,
+                "layanan":          svc["label_ui"],
+                "metode_gesek":     "Kotor" if metode_gesek == "Gesek Kotor" else "Bersih",
+                "nama":             nama,
+                "kategori":         kategori,
+                "kelas":            kelas,
+                "rate_jual":        rate_tampil,
+                "jt_final":         jt_final,
+                "trf_final":        trf_final,
+                "total_biaya":      total_biaya,
+                "biaya_layanan":    svc["cost"],
+                "biaya_baru":       biaya_baru,
+                "biaya_transfer":   b_trf,
+                "biaya_edc":        b_edc,
+                "biaya_qris":       b_qris,
+                "petugas":          petugas_nama,
+                "shift":            petugas_shift,
+            }
+            transaksi_no = ledger.append(rec_express)
+            teks_wa      = teks_express(transaksi_no, rec_express, waktu_selesai)
+            st.code(teks_wa, language="text")
+            _kirim(transaksi_no, teks_wa)
+            metrik.WHATSAPP.inc("Express", "form")
+            board.tambah(f"{hari_ini()}#{transaksi_no}", "Express", nama=nama, nominal=trf_final)
 
     # ── Mode Normal 3 Jam ─────────────────────────────────────────────────────
 
@@ -603,33 +872,9 @@ elif menu == "Input Data":
             )
 
         with tab2:
-            media = st.selectbox("Jenis Media Pencairan", [
-                "Mesin EDC - BRI Real Estate Gemilang",
-                "Mesin EDC - BNI Blurry Fashion Store",
-                "Mesin EDC - BCA Cozy Fashion",
-                "QRIS Statis - BNI Indah Mebeul",
-                "QRIS Statis - BNI Bahagia Roastery",
-                "QRIS Statis - BNI Toko Jaya Grosir",
-                "QRIS Statis - BNI Sinar Elektronik Store",
-                "QRIS Statis - BNI Bajuri Bike Center",
-                "QRIS Statis - BNI Cel Fashion",
-                "QRIS Statis - BNI Nada Collection Clothing",
-                "QRIS Statis - BNI Nugraha Clothes",
-                "QRIS Statis - BNI Syifa Boutique",
-                "QRIS Statis - BNI Wild And Fashion",
-                "QRIS Statis - BNI Urban Outfit Fashion",
-                "QRIS Statis - BNI Onpoint Wear",
-                "QRIS Dinamis - Giga Cell",
-                "QRIS Dinamis - WR Sembako Annisa",
-                "QRIS Dinamis - RM Parfume Rahayu",
-                "Paper Id X Blibli - Kreasi Mode",
-                "Paper Id X Blibli - Happy Mode",
-                "Quickbill WL - Phone Foyer",
-                "Quickbill - Phone Foyer",
-                "Paper Id - Kreasi Mode",
-                "Paper Id - Happy Mode",
-                "Evermoss - Luxe Fashion",
-            ])
+            media = st.selectbox(
+                "Jenis Media Pencairan", NAMA_MEDIA, key="media_norm"
+            )
             produk = st.text_input("Produk", placeholder="Contoh: Kartu Kredit - BANK BNI")
 
             r1, r2, r3 = st.columns([2, 1, 1])
@@ -647,7 +892,9 @@ elif menu == "Input Data":
                 rt_str       = format_rupiah(rt_nom)
                 rt_val       = 0.0
 
-            mdr_percent = r3.number_input("Rate MDR (%)", min_value=0.0, step=0.1, format="%.2f", value=0.0)
+            mdr_percent = r3.number_input(
+                "Rate MDR (%)", min_value=0.0, step=0.1, format="%.2f", key="mdr_norm"
+            )
 
         with tab3:
             m_gestun = st.radio("Metode Gestun", ["Kotor", "Bersih"], horizontal=True)
@@ -656,65 +903,308 @@ elif menu == "Input Data":
             biaya_edc      = b2.number_input("Biaya Transaksi EDC",       min_value=0.0, step=2_000.0,  value=0.0)
             biaya_qris     = b3.number_input("Biaya QRIS By WA",          min_value=0.0, step=3_000.0,  value=0.0)
 
-            biaya_baru_n  = 10_000.0 if jenis_n == "Baru" else 0.0
+            biaya_baru_n  = BIAYA_NASABAH_BARU if jenis_n == "Baru" else 0.0
             total_biaya_n = biaya_transfer + biaya_edc + biaya_qris + biaya_baru_n
 
             if m_gestun == "Kotor":
-                input_jt    = st.number_input("Jumlah Transaksi (Rp)", min_value=0.0, step=100_000.0, value=0.0)
-                fee_jasa_n  = round(input_jt * rate_decimal) if rt_type == "Persentase (%)" else rt_nom
-                jt_final_n  = input_jt
-                trf_final_n = jt_final_n - fee_jasa_n - total_biaya_n
+                input_n = st.number_input("Jumlah Transaksi (Rp)", min_value=0.0, step=100_000.0, value=0.0)
             else:
-                input_trf = st.number_input("Jumlah Transfer (Rp)", min_value=0.0, step=100_000.0, value=0.0)
-                if rt_type == "Persentase (%)":
-                    jt_final_n = math.ceil((input_trf + total_biaya_n) / (1.0 - rate_decimal))
+                input_n = st.number_input("Jumlah Transfer (Rp)", min_value=0.0, step=100_000.0, value=0.0)
+
+            with metrik.QUOTE_DETIK.time("Normal"):
+                hasil_n = hitung_normal(
+                    input_n, total_biaya_n,
+                    kotor=(m_gestun == "Kotor"),
+                    rate_decimal=rate_decimal, rt_nom=rt_nom,
+                    persen=(rt_type == "Persentase (%)"),
+                )
+            jt_final_n  = hasil_n["jt_final"]
+            trf_final_n = hasil_n["trf_final"]
+
+            with st.expander("🧭 Rute Media Terbaik (MDR per Media)", expanded=False):
+                st.caption(
+                    "Isi MDR & batas nominal per transaksi tiap media sesuai kontrak merchant "
+                    "(kosong = belum diisi, media tidak dinilai; batas kosong = tanpa batas). "
+                    "Semua media dinilai sekaligus: untung = pendapatan rate jual − MDR."
+                )
+                store_media = get_store()
+                df_media = st.data_editor(
+                    pd.DataFrame(store_media.media()).astype({"mdr": float, "maks": float}),
+                    column_config={
+                        "media": st.column_config.TextColumn("Media", disabled=True),
+                        "jenis": st.column_config.TextColumn("Jenis", disabled=True),
+                        "mdr":   st.column_config.NumberColumn("MDR (%)", min_value=0.0, step=0.01, format="%.2f"),
+                        "maks":  st.column_config.NumberColumn("Maks / Transaksi (Rp)", min_value=0, step=1_000_000),
+                        "aktif": st.column_config.CheckboxColumn("Aktif"),
+                    },
+                    hide_index=True,
+                    key="media_mdr",
+                )
+                tabel_media = [
+                    {
+                        **r,
+                        "mdr":  None if pd.isna(r["mdr"]) else float(r["mdr"]),
+                        "maks": None if pd.isna(r["maks"]) else int(r["maks"]),
+                    }
+                    for r in df_media.to_dict("records")
+                ]
+                if st.button("Simpan MDR Media", key="simpan_media"):
+                    store_media.set_media(tabel_media)
+                    st.success("MDR media tersimpan.")
+                rute = rank_media(
+                    input_n, total_biaya_n,
+                    kotor=(m_gestun == "Kotor"),
+                    rate_decimal=rate_decimal, rt_nom=rt_nom,
+                    persen=(rt_type == "Persentase (%)"),
+                    media=tabel_media,
+                )
+                terbaik = rute["terbaik"]
+                if input_n <= 0:
+                    st.info("Isi nominal transaksi untuk menilai rute media.")
+                elif all(m["mdr"] is None for m in tabel_media):
+                    st.info("Isi MDR minimal satu media untuk menilai rute.")
+                elif terbaik is None:
+                    st.warning("Tidak ada media aktif yang mampu menampung nominal ini.")
                 else:
-                    jt_final_n = input_trf + total_biaya_n + rt_nom + 1
-                trf_final_n = input_trf
+                    st.success(
+                        f"Rute terbaik: **{terbaik['media']}** — MDR {terbaik['mdr']:.2f}%, "
+                        f"untung {format_rupiah(terbaik['untung_rp'])} ({terbaik['rate_untung']:.2f}%)."
+                    )
+
+                    def _pakai_rute(media_terbaik=terbaik) -> None:
+                        st.session_state["media_norm"] = media_terbaik["media"]
+                        st.session_state["mdr_norm"]   = float(media_terbaik["mdr"])
+
+                    st.button("Pakai Rute Terbaik", on_click=_pakai_rute, key="pakai_rute")
+
+                    # Media tanpa MDR tidak dinilai (untung NaN) → tidak ditampilkan
+                    df_rute = pd.DataFrame(rute["peringkat"])[["media", "mdr", "untung_rp", "rate_untung", "layak"]]
+                    df_rute = df_rute[df_rute["mdr"].notna()]
+                    df_rute["untung_rp"]   = format_rupiah_kolom(df_rute["untung_rp"])
+                    df_rute["rate_untung"] = df_rute["rate_untung"].map("{:.2f}%".format)
+                    st.dataframe(
+                        df_rute.rename(columns={
+                            "media": "Media", "mdr": "MDR (%)", "untung_rp": "Untung",
+                            "rate_untung": "Rate Untung", "layak": "Layak",
+                        }),
+                        hide_index=True,
+                        use_container_width=True,
+                    )
 
             st.divider()
-            p1, p2 = st.columns(2)
-            petugas_nama  = p1.selectbox("Nama Petugas", ["Rendy", "Thoriq"])
-            petugas_shift = p2.selectbox("Shift Kerja",  ["Shift Pagi", "Shift Siang", "Shift Malam", "1 Shift"])
-
             if st.button("Generate WhatsApp Normal"):
                 waktu_selesai_n = (
-                    datetime.now(ZoneInfo("Asia/Jakarta")) + timedelta(hours=3)
+                    sekarang() + DURASI["Normal"]
                 ).strftime("%H:%M WIB")
 
-                if rt_type == "Persentase (%)":
-                    ru_str = f"{(rt_val - mdr_percent):.2f}%"
-                else:
-                    mdr_rp = jt_final_n * (mdr_percent / 100.0)
-                    ru_str = format_rupiah(rt_nom - mdr_rp)
-
-                teks_normal = (
-                    f"*TRANSAKSI NO. {transaksi_no} ({metode_transaksi.upper()})*\n"
-                    f"_______________________________\n"
-                    f"• Nama Nasabah: {nama_n}\n"
-                    f"• Kategori Nasabah: {jenis_n} ({kelas_n})\n"
-                    f"• Jenis Media Pencairan: {media}\n"
-                    f"• Produk: {produk}\n"
-                    f"• Rate Jual: {rt_str}\n"
-                    f"• Rate Untung: {ru_str}\n"
-                    f"• Nominal Transaksi: *{format_rupiah(jt_final_n)}*\n"
-                    f"• Biaya Nasabah Baru: Rp. {int(biaya_baru_n):,}\n"
-                    f"• Biaya Transfer Selain BCA: Rp. {int(biaya_transfer):,}\n"
-                    f"• Biaya Transaksi di Mesin EDC: Rp. {int(biaya_edc):,}\n"
-                    f"• Biaya Layanan QRIS By WhatsApp: Rp. {int(biaya_qris):,}\n"
-                    f"_______________________________\n"
-                    f"Jumlah Transfer: *{format_rupiah(trf_final_n)}*\n"
-                    f"🕓 Estimasi Selesai: {waktu_selesai_n}\n\n"
-                    f"Petugas: {petugas_nama} ({petugas_shift})"
+                persen_n    = rt_type == "Persentase (%)"
+                rate_untung = hitung_rate_untung(
+                    jt_final_n, mdr_percent, rt_val=rt_val, rt_nom=rt_nom, persen=persen_n
+                )
+                ru_str = rate_untung_tampil(rate_untung, persen_n)
+
+                rec_normal = {
+                    "mode":             "Normal",
+                    "metode_transaksi": metode_transaksi,
+                    "layanan":          svc["label_ui"],
+                    "metode_gesek":     m_gestun,
+                    "nama":             nama_n,
+                    "kategori":         jenis_n,
+                    "kelas":            kelas_n,
+                    "media":            media,
+                    "produk":           produk,
+                    "rate_jual":        rt_str,
+                    "jt_final":         jt_final_n,
+                    "trf_final":        trf_final_n,
+                    "total_biaya":      total_biaya_n,
+                    "biaya_layanan":    svc["cost"],
+                    "biaya_baru":       biaya_baru_n,
+                    "biaya_transfer":   biaya_transfer,
+                    "biaya_edc":        biaya_edc,
+                    "biaya_qris":       biaya_qris,
+                    "mdr":              mdr_percent,
+                    "rate_untung":      rate_untung,
+                    "petugas":          petugas_nama,
+                    "shift":            petugas_shift,
+                }
+                transaksi_no = ledger.append(rec_normal)
+                teks_wa      = teks_normal(transaksi_no, rec_normal, waktu_selesai_n, ru_str)
+                st.code(teks_wa, language="text")
+                _kirim(transaksi_no, teks_wa)
+                metrik.WHATSAPP.inc("Normal", "form")
+                board.tambah(f"{hari_ini()}#{transaksi_no}", "Normal", nama=nama_n, nominal=trf_final_n)
+
+    # ── Generate WhatsApp massal dari CSV / XLSX ─────────────────────────────
+    with st.expander("📦 Generate WhatsApp Massal (CSV / XLSX)", expanded=False):
+        st.caption(
+            "Kolom wajib: mode (Express/Normal), nominal. Opsional: nama, kategori, kelas, "
+            "metode (Kotor/Bersih), rate (3.5% atau 50000), layanan (Member/Non Member), "
+            "biaya_transfer, biaya_edc, biaya_qris, media, produk, mdr, petugas, shift, metode_transaksi."
+        )
+        up_wa   = st.file_uploader("File transaksi", type=["csv", "xlsx"], key="wa_massal_file")
+        w1, w2  = st.columns(2)
+        fmt_wa  = w1.radio("Format unduhan", ["zip", "txt"], horizontal=True, key="wa_massal_fmt")
+        catat   = w2.checkbox("Catat ke ledger (nomor otomatis)", value=True, key="wa_massal_catat")
+        if st.button("Proses File", disabled=up_wa is None, key="wa_massal_proses"):
+            contoh: List[str] = []
+            waktu_wa = sekarang()   # satu acuan untuk "selesai pukul" dan jatuh tempo SLA
+
+            def _ambil_contoh(hasil):
+                for h in hasil:
+                    if h["teks"]:
+                        if len(contoh) < 3:
+                            contoh.append(h["teks"])
+                        if catat:   # tanpa nomor ledger, pesan tidak dikirim / dipantau
+                            _kirim(h["no"], h["teks"])
+                            board.tambah(
+                                f"{hari_ini()}#{h['no']}", h["mode"], mulai=waktu_wa,
+                                nama=h["nama"], nominal=h["nominal"],
+                            )
+                    yield h
+
+            # Ditulis bertahap ke file sementara; hanya satu chunk baris di memori
+            out = tempfile.NamedTemporaryFile(prefix="wa_massal_", suffix=f".{fmt_wa}", delete=False)
+            try:
+                with out:
+                    jumlah = write_messages(
+                        _ambil_contoh(iter_messages(
+                            read_rows(io.BytesIO(up_wa.getvalue()), up_wa.name),
+                            ledger if catat else None,
+                            waktu=waktu_wa,
+                        )),
+                        out, fmt_wa,
+                    )
+            except ValueError as e:
+                os.unlink(out.name)
+                st.error(str(e))
+            except BaseException:
+                os.unlink(out.name)     # galat tak terduga: jangan tinggalkan file sementara
+                raise
+            else:
+                lama = st.session_state.get("wa_massal")
+                if lama and os.path.exists(lama["path"]):
+                    os.unlink(lama["path"])
+                st.session_state["wa_massal"] = {
+                    "path": out.name, "fmt": fmt_wa, "jumlah": jumlah, "contoh": contoh,
+                }
+
+        hasil_wa = st.session_state.get("wa_massal")
+        if hasil_wa and not os.path.exists(hasil_wa["path"]):   # sudah diunduh
+            del st.session_state["wa_massal"]
+        elif hasil_wa:
+            st.success(
+                f"{hasil_wa['jumlah']['berhasil']} pesan dibuat, {hasil_wa['jumlah']['gagal']} baris gagal"
+                + (" (lihat GAGAL di file)." if hasil_wa["jumlah"]["gagal"] else ".")
+            )
+            for teks in hasil_wa["contoh"]:
+                st.code(teks, language="text")
+            st.download_button(
+                f"⬇️ Unduh Pesan (.{hasil_wa['fmt']})",
+                data=lambda p=hasil_wa["path"]: _unduh_lalu_hapus(p),
+                file_name=f"pesan_whatsapp.{hasil_wa['fmt']}",
+                mime="application/zip" if hasil_wa["fmt"] == "zip" else "text/plain",
+                key="wa_massal_unduh",
+            )
+
+    # ── Status antrean kirim WhatsApp ────────────────────────────────────────
+    if dispatcher is not None:
+        with st.expander("📤 Status Pengiriman WhatsApp", expanded=False):
+            ringkas = dispatcher.ringkas()
+            k1, k2, k3, k4 = st.columns(4)
+            k1.metric("Antri / Dikirim", ringkas.get("antri", 0) + ringkas.get("dikirim", 0))
+            k2.metric("Coba Ulang", ringkas.get("coba_ulang", 0))
+            k3.metric("Terkirim", ringkas.get("terkirim", 0))
+            k4.metric("Gagal", ringkas.get("gagal", 0))
+            daftar_wa = dispatcher.daftar(limit=100)
+            if daftar_wa:
+                st.dataframe(
+                    pd.DataFrame(daftar_wa).drop(columns=["diperbarui"]),
+                    use_container_width=True, hide_index=True,
+                )
+            st.button("🔄 Muat Ulang Status", key="wa_status_refresh")
+
+    # ── Riwayat transaksi (ledger) ────────────────────────────────────────────
+    with st.expander("📒 Riwayat Transaksi", expanded=False):
+        f1, f2, f3, f4 = st.columns(4)
+        rentang   = f1.date_input("Tanggal", value=(sekarang().date(), sekarang().date()), key="ledger_tgl")
+        f_petugas = f2.selectbox("Petugas", ["Semua", "Rendy", "Thoriq"], key="ledger_petugas")
+        f_shift   = f3.selectbox(
+            "Shift", ["Semua", "Shift Pagi", "Shift Siang", "Shift Malam", "1 Shift"], key="ledger_shift"
+        )
+        f_media   = f4.selectbox("Media", ["Semua", *NAMA_MEDIA], key="ledger_media")
+        dari, sampai = (rentang[0], rentang[-1]) if rentang else (sekarang().date(), sekarang().date())
+        riwayat = ledger.cari(
+            tanggal=dari.isoformat(), sampai=sampai.isoformat(),
+            petugas=None if f_petugas == "Semua" else f_petugas,
+            shift=None if f_shift == "Semua" else f_shift,
+            media=None if f_media == "Semua" else f_media,
+        )
+        if not riwayat:
+            st.info("Belum ada transaksi untuk filter ini.")
+        else:
+            df_riwayat = pd.DataFrame(riwayat)[
+                ["tanggal", "no", "dibuat", "mode", "nama", "media", "jt_final", "trf_final", "petugas", "shift"]
+            ]
+            c_tot1, c_tot2, c_tot3 = st.columns(3)
+            c_tot1.metric("Jumlah Transaksi", len(df_riwayat))
+            c_tot2.metric("Total Gesek",      format_rupiah(df_riwayat["jt_final"].sum()))
+            c_tot3.metric("Total Transfer",   format_rupiah(df_riwayat["trf_final"].sum()))
+            for kolom in ("jt_final", "trf_final"):
+                df_riwayat[kolom] = format_rupiah_kolom(df_riwayat[kolom])
+            st.dataframe(df_riwayat, hide_index=True, use_container_width=True)
+
+    # ── Rekap shift & harian (dari rollup ledger, O(grup)) ───────────────────
+    with st.expander("📈 Rekap Shift & Harian", expanded=False):
+        g1, g2 = st.columns([1, 2])
+        rentang_r = g1.date_input("Tanggal", value=(sekarang().date(), sekarang().date()), key="rekap_tgl")
+        per_label = {"petugas": "Petugas", "shift": "Shift", "media": "Media", "mode": "Mode"}
+        per = g2.multiselect(
+            "Kelompokkan per", list(per_label), default=["petugas", "shift"],
+            format_func=per_label.get, key="rekap_per",
+        )
+        dari_r, sampai_r = (
+            (rentang_r[0], rentang_r[-1]) if rentang_r else (sekarang().date(), sekarang().date())
+        )
+        rekap = ledger.rekap(dari_r.isoformat(), sampai_r.isoformat(), per=per)
+        if not rekap:
+            st.info("Belum ada transaksi pada rentang ini.")
+        else:
+            df_rekap = pd.DataFrame(rekap).rename(columns={
+                **per_label,
+                "jumlah": "Jumlah", "total_gesek": "Total Gesek", "total_transfer": "Total Transfer",
+                "total_fee": "Pendapatan Fee", "total_untung": "Untung (setelah MDR)",
+            })
+            for kolom in ("Total Gesek", "Total Transfer", "Pendapatan Fee", "Untung (setelah MDR)"):
+                df_rekap[kolom] = format_rupiah_kolom(df_rekap[kolom])
+            st.dataframe(df_rekap, hide_index=True, use_container_width=True)
+            if any(r.get(k) == BELUM_DIISI for r in rekap for k in ("petugas", "shift")):
+                st.caption(
+                    f"“{BELUM_DIISI}”: transaksi tanpa petugas/shift — Express yang dicatat sebelum "
+                    "petugas & shift wajib dipilih, atau baris massal tanpa kolom itu. "
+                    "Tidak dihitung ke kasir mana pun; periksa di Riwayat Transaksi."
                 )
-                st.code(teks_normal, language="text")
+
+            teks_rekap = "\n".join(
+                [f"*REKAP TRANSAKSI {dari_r:%d/%m/%Y}"
+                 + ("" if sampai_r == dari_r else f" – {sampai_r:%d/%m/%Y}") + "*",
+                 "_______________________________"]
+                + [
+                    f"• {' / '.join(str(r[k]) for k in per) or 'Semua'}: "
+                    f"{r['jumlah']} trx, gesek {format_rupiah(r['total_gesek'])}, "
+                    f"transfer {format_rupiah(r['total_transfer'])}, "
+                    f"fee {format_rupiah(r['total_fee'])}, untung {format_rupiah(r['total_untung'])}"
+                    for r in rekap
+                ]
+            )
+            st.code(teks_rekap, language="text")
 
 
 # ════════════════════════════════════════════════════════════════════════════════
 # MENU: MARKETPLACE
 # ════════════════════════════════════════════════════════════════════════════════
 
-elif menu == "Marketplace":
+@_fragmen("Marketplace")
+def menu_marketplace() -> None:
     st.title("🛒 Estimasi Pencairan Marketplace")
     st.markdown("""
     Masukkan data berikut untuk menghitung **estimasi pencairan setelah semua biaya** marketplace dan gestun.
@@ -733,10 +1223,9 @@ elif menu == "Marketplace":
     )
     nominal_checkout_int = parse_rupiah(nominal_checkout_str)
 
-    marketplace  = st.selectbox("Pilih Marketplace", ["Tokopedia", "Shopee"])
-    FEE_OPTS     = ["Tidak Ada", 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16]
-    fee_merchant = st.selectbox("Fee Merchant (%)", FEE_OPTS, index=0)
-    fee_gestun   = st.selectbox("Fee Gestun (%)", ["Tidak Ada", 8, 9, 10, 11, 12, 13, 14, 15, 16], index=0)
+    marketplace  = st.selectbox("Pilih Marketplace", MARKETPLACE)
+    fee_merchant = st.selectbox("Fee Merchant (%)", OPSI_FEE_MERCHANT, index=0)
+    fee_gestun   = st.selectbox("Fee Gestun (%)", OPSI_FEE_GESTUN, index=0)
 
     st.markdown("### ✅ Biaya Tambahan (Checklist sesuai kondisi aktual)")
     biaya_admin_baru         = st.checkbox("Biaya Administrasi Nasabah Baru (Rp 10.000)",    value=False)
@@ -765,18 +1254,19 @@ elif menu == "Marketplace":
         biaya_detail.append(("Biaya Super Kilat Shopee", 30_000))
 
     if st.button("Hitung Estimasi", disabled=(nominal_checkout_int <= 0)):
-        waktu_mulai = datetime.now(ZoneInfo("Asia/Jakarta"))
+        waktu_mulai = sekarang()
 
-        fee_merchant_rp = (
-            0 if fee_merchant == "Tidak Ada"
-            else nominal_checkout_int * (fee_merchant / 100)
-        )
         # FIX: baris asli tidak mengecek "Tidak Ada" untuk fee_gestun, sehingga
         #      menyebabkan TypeError (string tidak bisa dibagi 100).
-        fee_gestun_rp = (
-            0 if fee_gestun == "Tidak Ada"
-            else nominal_checkout_int * (fee_gestun / 100)
-        )
+        with metrik.QUOTE_DETIK.time("Marketplace"):
+            hasil = hitung_marketplace(
+                nominal_checkout_int,
+                None if fee_merchant == "Tidak Ada" else fee_merchant,
+                None if fee_gestun == "Tidak Ada" else fee_gestun,
+                total_biaya_tambahan,
+            )
+        fee_merchant_rp = hasil["fee_merchant_rp"]
+        fee_gestun_rp   = hasil["fee_gestun_rp"]
 
         label_merchant = (
             f"Fee Merchant ({fee_merchant}%)" if fee_merchant != "Tidak Ada"
@@ -785,8 +1275,7 @@ elif menu == "Marketplace":
         biaya_detail.insert(0, (label_merchant,               fee_merchant_rp))
         biaya_detail.insert(1, (f"Fee Gestun ({fee_gestun}%)", fee_gestun_rp))
 
-        total_biaya      = fee_merchant_rp + fee_gestun_rp + total_biaya_tambahan
-        nominal_diterima = nominal_checkout_int - total_biaya
+        nominal_diterima = hasil["nominal_diterima"]
 
         st.subheader("📊 Hasil Estimasi Pencairan")
         st.write(f"**Waktu Perhitungan:** {waktu_mulai.strftime('%d %B %Y, %H:%M:%S')} WIB")
@@ -795,38 +1284,98 @@ elif menu == "Marketplace":
 
         st.markdown("#### 🧾 Rincian Biaya")
         df_biaya = pd.DataFrame(biaya_detail, columns=["Jenis Biaya", "Nominal (Rp)"])
-        df_biaya["Nominal (Rp)"] = df_biaya["Nominal (Rp)"].apply(format_rupiah)
+        df_biaya["Nominal (Rp)"] = format_rupiah_kolom(df_biaya["Nominal (Rp)"])
         st.table(df_biaya)
 
         st.markdown("---")
         st.success(f"💸 **Estimasi Dana Diterima: {format_rupiah(nominal_diterima)}**")
 
+    # ── Hitung balik: target dana diterima → nominal checkout ────────────────
+    with st.expander("🔁 Hitung Balik: Target Dana Diterima → Checkout", expanded=False):
+        st.caption(
+            "Nominal checkout minimum agar dana diterima ≥ target, untuk Tokopedia & Shopee "
+            "di semua kombinasi fee merchant × fee gestun, memakai biaya tambahan yang dicentang di atas."
+        )
+        biaya_umum = 10_000 * biaya_admin_baru + 10_000 * biaya_transfer_non_bca
+        biaya_per_mp = {
+            "Tokopedia": biaya_umum + 10_000 * biaya_toko + 30_000 * biaya_super_kilat_toped,
+            "Shopee":    biaya_umum + 30_000 * biaya_super_kilat_shopee,
+        }
+        i_fm = OPSI_FEE_MERCHANT.index(fee_merchant)
+        i_fg = OPSI_FEE_GESTUN.index(fee_gestun)
+
+        target_str = st.text_input("Target Dana Diterima (Rp):", key="mp_target")
+        target_int = parse_rupiah(target_str)
+        if target_int > 0:
+            balik = solve_checkout([target_int], biaya_per_mp)
+            j_mp  = balik["marketplace"].index(marketplace)
+            st.success(
+                f"Checkout {marketplace} minimum: "
+                f"**{format_rupiah(int(balik['checkout'][0, j_mp, i_fm, i_fg]))}** "
+                f"(diterima {format_rupiah(float(balik['diterima'][0, j_mp, i_fm, i_fg]))})"
+            )
+            df_pivot = pd.DataFrame(
+                balik["checkout"][0, j_mp],
+                index=pd.Index(
+                    ["Tidak Ada" if f is None else f"{f}%" for f in balik["fee_merchant"]], name="Fee Merchant"
+                ),
+                columns=["Tidak Ada" if f is None else f"{f}%" for f in balik["fee_gestun"]],
+            )
+            st.markdown(f"**Checkout {marketplace}: fee merchant × fee gestun**")
+            st.dataframe(df_pivot.apply(format_rupiah_kolom), use_container_width=True)
 
-# ════════════════════════════════════════════════════════════════════════════════
-# MENU: PROPORSIONAL (PEMBAGIAN EDC)
-# ════════════════════════════════════════════════════════════════════════════════
-
-elif menu == "Proporsional":
-    menu_pembagian_edc()
+        up_target = st.file_uploader(
+            "Atau unggah CSV target (kolom: target, ref opsional)", type=["csv"], key="mp_target_csv"
+        )
+        if up_target is not None:
+            try:
+                rows = read_target_csv(io.StringIO(up_target.getvalue().decode("utf-8-sig")))
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                valid = [r for r in rows if not r["error"]]
+                for r in rows:
+                    if r["error"]:
+                        st.warning(f"Baris {r['baris']}: {r['error']}")
+                if valid:
+                    balik = solve_checkout([r["target"] for r in valid], biaya_per_mp)
+                    df_cmp = pd.DataFrame({
+                        "Ref":    [r["ref"] for r in valid],
+                        "Target": format_rupiah_kolom([r["target"] for r in valid]),
+                        **{
+                            f"Checkout {mp}": format_rupiah_kolom(balik["checkout"][:, j, i_fm, i_fg])
+                            for j, mp in enumerate(balik["marketplace"])
+                        },
+                    })
+                    st.markdown(f"**Perbandingan pada Fee Merchant {fee_merchant} · Fee Gestun {fee_gestun}**")
+                    st.dataframe(df_cmp, hide_index=True, use_container_width=True)
+                    df_semua = pd.DataFrame(iter_rows(balik, refs=[r["ref"] for r in valid]))
+                    st.download_button(
+                        "⬇️ Unduh Semua Kombinasi (CSV)",
+                        df_semua.to_csv(index=False).encode("utf-8"),
+                        file_name="checkout_marketplace.csv",
+                        mime="text/csv",
+                    )
 
 
 # ════════════════════════════════════════════════════════════════════════════════
 # MENU: COUNTDOWN
 # ════════════════════════════════════════════════════════════════════════════════
 
-elif menu == "Countdown":
+@_fragmen("Countdown")
+def menu_countdown() -> None:
     st.title("⏱️ Hitung Selisih Waktu Antar Jam")
 
     if "start_time" not in st.session_state:
-        st.session_state.start_time = datetime.now(ZoneInfo("Asia/Jakarta")).time()
+        st.session_state.start_time = sekarang().time()
     if "end_time" not in st.session_state:
-        st.session_state.end_time = datetime.now(ZoneInfo("Asia/Jakarta")).time()
+        st.session_state.end_time = sekarang().time()
 
     start_time = st.time_input("Waktu Mulai",   key="start_time")
     end_time   = st.time_input("Waktu Selesai", key="end_time")
 
     if st.button("Hitung Selisih"):
-        today = datetime.now(ZoneInfo("Asia/Jakarta")).date()
+        today = sekarang().date()
         t1    = datetime.combine(today, start_time)
         t2    = datetime.combine(today, end_time)
         if t2 < t1:
@@ -834,4 +1383,98 @@ elif menu == "Countdown":
         delta         = t2 - t1
         jam, sisa     = divmod(delta.seconds, 3600)
         menit, detik  = divmod(sisa, 60)
-        st.success(f"Waktu yang berlalu: {jam} jam {menit} menit {detik} detik")
\ No newline at end of file
+        st.success(f"Waktu yang berlalu: {jam} jam {menit} menit {detik} detik")
+
+    # ── Papan SLA transaksi tertunda ─────────────────────────────────────────
+    st.divider()
+    st.subheader("🚦 Papan SLA Dana Masuk")
+    board = get_board()
+
+    with st.expander("➕ Tambah Transaksi ke Papan", expanded=False):
+        with st.form("sla_tambah", clear_on_submit=True):
+            a1, a2, a3 = st.columns(3)
+            sla_ref   = a1.text_input("No. / Referensi")
+            sla_nama  = a2.text_input("Nama Nasabah")
+            sla_mode  = a3.selectbox("Mode", list(SLA_MENIT))
+            sla_mulai = st.time_input("Waktu Generate", value=sekarang().time().replace(second=0, microsecond=0))
+            if st.form_submit_button("Tambah"):
+                mulai = datetime.combine(sekarang().date(), sla_mulai, tzinfo=WIB)
+                if mulai > sekarang():      # jam lewat tengah malam → kemarin
+                    mulai -= timedelta(days=1)
+                board.tambah(sla_ref or "-", sla_mode, mulai=mulai, nama=sla_nama)
+
+    auto = st.toggle("Segarkan otomatis tiap 15 detik", value=True, key="sla_auto")
+
+    def _tandai_selesai() -> None:
+        for iid in st.session_state.get("sla_pilih", []):
+            board.selesai(iid)
+        st.session_state["sla_pilih"] = []
+
+    # Fragment: tiap tik / klik di papan hanya menjalankan ulang blok ini,
+    # bukan seluruh skrip (menu, CSS, form lain).
+    @st.fragment(run_every=15 if auto else None)
+    def _papan_sla() -> None:
+        waktu   = sekarang()
+        ringkas = board.ringkas(waktu)
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Tertunda", len(board))
+        m2.metric("🔴 Terlambat", ringkas["terlambat"])
+        m3.metric(f"🟠 ≤ {SLA_AMBANG_MENIT} menit", ringkas["hampir"])
+        m4.metric("🟢 Aman", ringkas["aman"])
+
+        berikut = board.berikutnya()
+        if berikut is not None:
+            sisa = (berikut["jatuh_tempo"] - waktu).total_seconds() / 60.0
+            st.caption(
+                f"Jatuh tempo berikutnya: {berikut['ref']} {berikut['nama']} — "
+                f"{berikut['jatuh_tempo']:%H:%M} WIB ({sisa:+.0f} menit)"
+            )
+
+        baris = board.papan(waktu)
+        if not baris:
+            st.info("Tidak ada transaksi tertunda.")
+            return
+        label = {"terlambat": "🔴 Terlambat", "hampir": "🟠 Hampir", "aman": "🟢 Aman"}
+        st.dataframe(
+            pd.DataFrame({
+                "Status":      [label[b["status"]] for b in baris],
+                "Ref":         [b["ref"] for b in baris],
+                "Nama":        [b["nama"] for b in baris],
+                "Mode":        [b["mode"] for b in baris],
+                "Transfer":    [format_rupiah(b["nominal"]) if b["nominal"] else "" for b in baris],
+                "Jatuh Tempo": [f"{b['jatuh_tempo']:%H:%M}" for b in baris],
+                "Sisa (menit)": [round(b["sisa_menit"]) for b in baris],
+            }),
+            use_container_width=True, hide_index=True, height=min(400, 38 + 35 * len(baris)),
+        )
+        pilihan = st.multiselect(
+            "Tandai dana sudah masuk",
+            [b["id"] for b in baris],
+            format_func=lambda i, ref={b["id"]: f"{b['ref']} {b['nama']}".strip() for b in baris}: ref[i],
+            key="sla_pilih",
+        )
+        st.button("✅ Selesai", disabled=not pilihan, key="sla_selesai", on_click=_tandai_selesai)
+
+    _papan_sla()
+
+
+# ════════════════════════════════════════════════════════════════════════════════
+# NAVIGASI SIDEBAR
+# ════════════════════════════════════════════════════════════════════════════════
+# Tiap menu adalah fragment: hanya ganti menu yang menjalankan ulang seluruh skrip.
+
+MENU = {
+    "Input Data":   menu_input_data,
+    "Konven":       menu_konven,
+    "Marketplace":  menu_marketplace,
+    "Countdown":    menu_countdown,
+    "Proporsional": menu_pembagian_edc,
+}
+menu = st.sidebar.selectbox("Pilih Menu", list(MENU))
+if st.session_state.debug_help:
+    panel_profil()                       # slot hasil diisi isi_profil() dari fragment menu
+try:
+    MENU[menu]()
+finally:
+    _simpan_profil(profil.selesai())     # sudah ditutup fragment; None di luar mode debug
+    _RERUN_PENUH = False